@@ -1,25 +1,57 @@
 from django.contrib import admin
-from .models import Job, Application
+from .models import Job, Application, ApplicationStatusEvent, Candidate, Location, LocationAlias
+
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+    extra = 0
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'region')
+    search_fields = ('name', 'region', 'aliases__key')
+    inlines = [LocationAliasInline]
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ('title', 'location', 'job_type', 'is_active', 'posted_at')
     list_filter = ('is_active', 'job_type', 'location')
-    search_fields = ('title', 'description', 'location')
+    search_fields = ('title', 'description', 'location__name')
+    autocomplete_fields = ('location',)
     readonly_fields = ('posted_at',)
 
+@admin.register(Candidate)
+class CandidateAdmin(admin.ModelAdmin):
+    list_display = ('full_name', 'email_key', 'phone_key', 'created_at')
+    search_fields = ('full_name', 'email_key', 'phone_key')
+    readonly_fields = ('created_at',)
+
+class ApplicationStatusEventInline(admin.TabularInline):
+    model = ApplicationStatusEvent
+    fields = ('from_status', 'to_status', 'changed_at', 'changed_by')
+    readonly_fields = fields
+    ordering = ('changed_at',)
+    extra = 0
+    can_delete = False
+
+    # The history is append-only
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'job', 'status', 'applied_at')
     list_filter = ('status', 'job', 'applied_at')
     search_fields = ('full_name', 'email', 'job__title')
     readonly_fields = ('applied_at',)
+    raw_id_fields = ('candidate',)
+    inlines = [ApplicationStatusEventInline]
     actions = ['mark_reviewed', 'mark_interview']
 
+    # Through bulk_review, so the status events record who made the change
     def mark_reviewed(self, request, queryset):
-        queryset.update(status='REVIEWED')
+        queryset.bulk_review(request.user, status='REVIEWED')
     mark_reviewed.short_description = "Mark selected applications as Reviewed"
 
     def mark_interview(self, request, queryset):
-        queryset.update(status='INTERVIEW')
+        queryset.bulk_review(request.user, status='INTERVIEW')
     mark_interview.short_description = "Mark selected applications for Interview"
@@ -0,0 +1,102 @@
+"""
+Versioned cache keys for careers data.
+
+Instead of hunting down and deleting every cached entry when a job
+changes, each namespace carries a version number that is bumped on change.
+Keys built from the old version are simply never read again and age out
+of the cache on their own.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+
+def _version_key(namespace):
+    return f'careers:version:{namespace}'
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version
+        version = int(time.time() * 1000)
+        cache.add(_version_key(namespace), version, timeout=None)
+        version = cache.get(_version_key(namespace), version)
+    return version
+
+
+def bump_version(namespace):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        get_version(namespace)
+
+
+def versioned_key(namespace, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    return f'careers:{namespace}:v{get_version(namespace)}:{suffix}'
+
+
+def get_versions(namespaces):
+    """Fetch several namespace versions with a single cache round trip."""
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+    for namespace in namespaces:
+        if namespace not in versions:
+            versions[namespace] = get_version(namespace)
+    return versions
+
+
+def listing_version():
+    """
+    The ``jobs`` version joined with the next deadline of an open job.
+
+    Listing and facet entries keyed on it are dropped when any job changes
+    and also the moment a deadline passes, so an expired job is never
+    served from them.
+    """
+    from .models import Job
+
+    version = get_version('jobs')
+    key = f'careers:jobs:v{version}:next_deadline'
+    now = timezone.now()
+    deadline = cache.get(key)
+    # 0: no open job has a deadline ahead, so only a version bump changes it
+    if deadline is None or 0 < deadline <= now.timestamp():
+        deadline = Job.objects.filter(is_active=True, deadline__gt=now).aggregate(next=Min('deadline'))['next']
+        deadline = deadline.timestamp() if deadline else 0
+        cache.set(key, deadline, max(1, int(deadline - now.timestamp())) if deadline else None)
+    return f'{version}.{deadline}'
+
+
+def job_namespace(job_id):
+    return f'job:{job_id}'
+
+
+JOB_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def attach_card_versions(jobs):
+    """Set ``job.card_version`` on each job, fetching all versions in one round trip."""
+    versions = get_versions([job_namespace(job.pk) for job in jobs])
+    for job in jobs:
+        job.card_version = versions[job_namespace(job.pk)]
+    return jobs
+
+
+def get_cached_job(job_id):
+    """Return the Job with ``job_id`` from cache (or the database), or None."""
+    from .models import Job
+
+    version = get_version(job_namespace(job_id))
+    key = f'careers:job:{job_id}:v{version}'
+    job = cache.get(key)
+    if job is None:
+        job = Job.objects.select_related('location').filter(pk=job_id).first()
+        if job is None:
+            return None
+        cache.set(key, job, JOB_CACHE_TIMEOUT)
+    job.card_version = version
+    return job
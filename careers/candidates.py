@@ -0,0 +1,36 @@
+"""
+Normalised identity keys for applicants.
+
+Applicants type their details freely, so the same person shows up as
+``Jane.Doe@Gmail.com`` on one application and ``janedoe+jobs@gmail.com``
+on the next, or with ``0772 123 456`` and ``+263 772 123 456``. These keys
+strip that noise so ``Candidate`` lookups are exact, indexed matches.
+"""
+import re
+
+GMAIL_DOMAINS = {'gmail.com', 'googlemail.com'}
+
+# The national significant number: enough to tell apart local and international
+# spellings of the same number without knowing every country code
+PHONE_KEY_DIGITS = 9
+
+
+def email_key(email):
+    """Lowercase, drop ``+tag`` sub-addresses and, for Gmail, the ignored dots."""
+    email = (email or '').strip().lower()
+    local, at, domain = email.rpartition('@')
+    if not at or not local:
+        return email
+    local = local.split('+', 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local = local.replace('.', '')
+        domain = 'gmail.com'
+    return f'{local}@{domain}'
+
+
+def phone_key(phone):
+    """The last ``PHONE_KEY_DIGITS`` digits, or '' if there are too few to be a phone number."""
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) < PHONE_KEY_DIGITS:
+        return ''
+    return digits[-PHONE_KEY_DIGITS:]
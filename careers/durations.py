@@ -0,0 +1,244 @@
+"""
+Time-to-hire and time-in-stage percentiles.
+
+Every status change feeds two durations into ``DurationSketch`` rows, one
+per (metric, stage, job, month):
+
+* ``STAGE``: how long the application sat in the status it is leaving,
+  measured from the status event that entered it (``careers.history``).
+* ``HIRE``: on a move to ``HIRED``, the time since the application was
+  submitted.
+
+A sketch is a log-bucketed histogram (the DDSketch scheme): any quantile
+read back is within ``RELATIVE_ACCURACY`` of the true value, and two
+sketches merge by adding their bucket counts. So p50/p90/p99 for one job,
+every job, or any run of months are a merge of a few small rows rather
+than a scan of the applications.
+
+The sketches are derived from the ``ApplicationStatusEvent`` log, which is
+the source of truth: ``rebuild`` replays all of it, and the
+``update_duration_sketches`` worker folds in the events after its
+watermark (``DurationWatermark``) the same way, a batch per transaction,
+so status changes never wait on a sketch row. Readers add the events not
+folded in yet, so the percentiles are current either way.
+"""
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+RELATIVE_ACCURACY = 0.01
+# Durations under a second count as zero
+MIN_SECONDS = 1.0
+
+QUANTILES = (0.5, 0.9, 0.99)
+# Status events folded into the sketches per transaction
+FOLD_BATCH_SIZE = 500
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch over positive values."""
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    log_gamma = math.log(gamma)
+
+    def __init__(self, bins=None, zero=0):
+        self.bins = defaultdict(int, bins or {})
+        self.zero = zero
+
+    @property
+    def count(self):
+        return self.zero + sum(self.bins.values())
+
+    def add(self, value, count=1):
+        if value < MIN_SECONDS:
+            self.zero += count
+        else:
+            self.bins[math.ceil(math.log(value) / self.log_gamma)] += count
+
+    def merge(self, other):
+        self.zero += other.zero
+        for index, count in other.bins.items():
+            self.bins[index] += count
+        return self
+
+    def quantile(self, q):
+        """The value at quantile ``q`` (0-1), or None for an empty sketch."""
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_json(self):
+        # JSON object keys are strings
+        return {'zero': self.zero, 'bins': {str(index): count for index, count in self.bins.items()}}
+
+    @classmethod
+    def from_json(cls, data):
+        data = data or {}
+        return cls({int(index): count for index, count in data.get('bins', {}).items()}, data.get('zero', 0))
+
+
+def month_of(moment):
+    """First day of ``moment``'s month in the site time zone, the sketches' time bucket."""
+    return timezone.localdate(moment).replace(day=1)
+
+
+def _seconds(start, end):
+    return max((end - start).total_seconds(), 0.0)
+
+
+def fold_events(events, sketches, only=None):
+    """
+    Add the durations the status ``events`` imply to ``sketches`` (a ``defaultdict(QuantileSketch)``).
+
+    ``events`` are ``(id, application_id, job_id, to_status, changed_at,
+    applied_at)`` rows ordered by application, time and id, so each event's
+    predecessor is the one before it. With ``only`` (a set of event ids),
+    just those events add durations; the rest only serve as predecessors.
+    """
+    previous = None
+    for event in events:
+        event_id, application_id, job_id, status, changed_at, applied_at = event
+        if only is None or event_id in only:
+            period = month_of(changed_at)
+            if previous is not None and previous[1] == application_id and previous[3] != status:
+                sketches[('STAGE', previous[3], job_id, period)].add(_seconds(previous[4], changed_at))
+            if status == 'HIRED':
+                sketches[('HIRE', '', job_id, period)].add(_seconds(applied_at, changed_at))
+        previous = event
+    return sketches
+
+
+def _event_rows(events):
+    return events.order_by('application_id', 'changed_at', 'id').values_list(
+        'id', 'application_id', 'job_id', 'to_status', 'changed_at', 'application__applied_at',
+    )
+
+
+def _fold_new(event_ids):
+    """The sketches of just the events ``event_ids``, each timed against the application's history."""
+    from .models import ApplicationStatusEvent
+
+    event_ids = set(event_ids)
+    if not event_ids:
+        return {}
+    applications = ApplicationStatusEvent.objects.filter(pk__in=event_ids).values('application_id')
+    history = _event_rows(ApplicationStatusEvent.objects.filter(application_id__in=applications))
+    return fold_events(history, defaultdict(QuantileSketch), only=event_ids)
+
+
+def folded_through():
+    """The id of the last status event in the sketches."""
+    from .models import DurationWatermark
+
+    return DurationWatermark.objects.values_list('through_event', flat=True).first() or 0
+
+
+def fold_pending(batch_size=FOLD_BATCH_SIZE):
+    """Fold the status events after the watermark into the sketches; returns how many were folded."""
+    from .models import ApplicationStatusEvent, DurationSketch, DurationWatermark
+
+    folded = 0
+    while True:
+        through = folded_through()
+        event_ids = list(
+            ApplicationStatusEvent.objects.filter(pk__gt=through).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not event_ids:
+            return folded
+        sketches = _fold_new(event_ids)
+        with transaction.atomic():
+            rows = {
+                (row.metric, row.stage, row.job_id, row.period): row
+                for row in DurationSketch.objects.filter(
+                    job_id__in={key[2] for key in sketches}, period__in={key[3] for key in sketches},
+                )
+            }
+            changed, created = [], []
+            for (metric, stage, job_id, period), sketch in sketches.items():
+                row = rows.get((metric, stage, job_id, period))
+                if row is None:
+                    row = DurationSketch(metric=metric, stage=stage, job_id=job_id, period=period)
+                    created.append(row)
+                else:
+                    sketch.merge(QuantileSketch.from_json(row.data))
+                    changed.append(row)
+                row.data = sketch.to_json()
+                row.count = sketch.count
+            DurationSketch.objects.bulk_update(changed, ['data', 'count'], batch_size=FOLD_BATCH_SIZE)
+            DurationSketch.objects.bulk_create(created, batch_size=FOLD_BATCH_SIZE)
+            DurationWatermark.objects.update_or_create(pk=1, defaults={'through_event': event_ids[-1]})
+        folded += len(event_ids)
+
+
+def merged_sketch(metric, stage='', job=None, since=None):
+    """Merge the sketches for ``metric`` over one job (or every job) and the months from ``since``."""
+    from .models import DurationSketch
+
+    from .models import ApplicationStatusEvent
+
+    since = since and since.replace(day=1)
+    rows = DurationSketch.objects.filter(metric=metric, stage=stage)
+    if job is not None:
+        rows = rows.filter(job=job)
+    if since is not None:
+        rows = rows.filter(period__gte=since)
+    sketch = QuantileSketch()
+    for data in rows.values_list('data', flat=True):
+        sketch.merge(QuantileSketch.from_json(data))
+
+    # Plus the events the worker has not folded in yet
+    tail = ApplicationStatusEvent.objects.filter(pk__gt=folded_through()).values_list('id', flat=True)
+    for (tail_metric, tail_stage, job_id, period), tail_sketch in _fold_new(tail).items():
+        if (tail_metric, tail_stage) != (metric, stage) or (since is not None and period < since):
+            continue
+        if job is None or job_id == getattr(job, 'pk', job):
+            sketch.merge(tail_sketch)
+    return sketch
+
+
+def duration_percentiles(metric, stage='', job=None, since=None, quantiles=QUANTILES):
+    """
+    Return ``{'count': n, 'p50': days, 'p90': days, 'p99': days}``.
+
+    Values are in days to one decimal place, None when nothing was recorded.
+    """
+    sketch = merged_sketch(metric, stage, job, since)
+    result = {'count': sketch.count}
+    for q in quantiles:
+        value = sketch.quantile(q)
+        result[f'p{round(q * 100)}'] = None if value is None else round(value / 86400, 1)
+    return result
+
+
+def rebuild():
+    """Recompute every sketch by replaying the status events; returns how many were replayed."""
+    from .models import ApplicationStatusEvent, DurationSketch, DurationWatermark
+
+    with transaction.atomic():
+        through = ApplicationStatusEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        events = _event_rows(ApplicationStatusEvent.objects.filter(pk__lte=through))
+        sketches = fold_events(events.iterator(chunk_size=2000), defaultdict(QuantileSketch))
+        DurationSketch.objects.all().delete()
+        DurationSketch.objects.bulk_create(
+            (
+                DurationSketch(
+                    metric=metric, stage=stage, job_id=job_id, period=period,
+                    count=sketch.count, data=sketch.to_json(),
+                )
+                for (metric, stage, job_id, period), sketch in sketches.items()
+            ),
+            batch_size=500,
+        )
+        DurationWatermark.objects.update_or_create(pk=1, defaults={'through_event': through})
+    return events.count()
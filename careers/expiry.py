@@ -0,0 +1,30 @@
+"""
+Closing job postings whose application deadline has passed.
+
+``expire_jobs`` deactivates every overdue posting in one bulk UPDATE
+(served by the ``(is_active, deadline)`` index). Because ``update()`` skips
+model signals, it also drops the jobs from the search index and bumps
+their cache versions itself.
+"""
+from django.utils import timezone
+
+from .cache import bump_version, job_namespace
+from .models import Job
+from .search import get_search_backend
+
+
+def expire_jobs(now=None):
+    """Deactivate active jobs past their deadline; returns the expired job ids."""
+    now = now or timezone.now()
+    overdue = Job.objects.filter(is_active=True, deadline__lt=now)
+    job_ids = list(overdue.values_list('id', flat=True))
+    if not job_ids:
+        return []
+
+    overdue.filter(pk__in=job_ids).update(is_active=False)
+
+    get_search_backend().remove_jobs(job_ids)
+    bump_version('jobs')
+    for job_id in job_ids:
+        bump_version(job_namespace(job_id))
+    return job_ids
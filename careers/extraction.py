@@ -0,0 +1,133 @@
+"""
+Resume text extraction.
+
+Runs outside the request cycle: ``apply_job`` only queues a pending
+``ResumeText`` row, and the ``extract_resumes`` management command turns
+pending rows into text using a process pool. Each unique (content-addressed)
+resume file is read once even when several applications share it.
+"""
+import os
+import zipfile
+from xml.etree import ElementTree
+
+from django.db import transaction
+from django.utils import timezone
+
+MAX_TEXT_LENGTH = 100_000
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UnsupportedResume(Exception):
+    pass
+
+
+def extract_pdf(path):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def extract_docx(path):
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+EXTRACTORS = {
+    '.pdf': extract_pdf,
+    '.docx': extract_docx,
+}
+
+
+def extract_text(path):
+    """
+    Return ``(text, error)`` for the file at ``path``.
+
+    Never raises, so it is safe to map over a process pool.
+    """
+    extractor = EXTRACTORS.get(os.path.splitext(path)[1].lower())
+    try:
+        if extractor is None:
+            raise UnsupportedResume("Unsupported resume format")
+        text = ' '.join(extractor(path).split())
+        return text[:MAX_TEXT_LENGTH], ''
+    except Exception as e:
+        return '', str(e)[:255] or e.__class__.__name__
+
+
+def process_pending(pool, batch_size=100):
+    """Extract one batch of pending resumes on ``pool``; returns the number of rows processed."""
+    from .models import Application, ResumeText
+    from .search import get_search_backend
+
+    pending = list(
+        ResumeText.objects
+        .filter(status='PENDING')
+        .select_related('application')
+        .order_by('id')[:batch_size]
+    )
+    if not pending:
+        return 0
+
+    paths = {}
+    for row in pending:
+        resume = row.application.resume
+        if resume and resume.name not in paths:
+            try:
+                paths[resume.name] = resume.path
+            except NotImplementedError:
+                paths[resume.name] = None
+
+    extractable = {name: path for name, path in paths.items() if path}
+    results = dict(zip(extractable, pool.map(extract_text, extractable.values())))
+
+    now = timezone.now()
+    for row in pending:
+        text, error = results.get(row.application.resume.name, ('', 'Resume file is not available'))
+        row.content = text
+        row.error = error
+        row.status = 'FAILED' if error else 'DONE'
+        row.extracted_at = now
+
+    backend = get_search_backend()
+    with transaction.atomic():
+        ResumeText.objects.bulk_update(pending, ['content', 'error', 'status', 'extracted_at'])
+        backend.index_resumes([(row.application_id, row.content) for row in pending])
+        backend.index_applicants([
+            (row.application_id, row.application.cover_letter, row.content) for row in pending
+        ])
+        # New resume text means the cached match scores are out of date
+        Application.objects.filter(pk__in=[row.application_id for row in pending]).update(
+            match_score=Application.UNSCORED,
+        )
+    return len(pending)
+
+
+def queue_missing(batch_size=1000):
+    """Create pending rows for applications that have never been extracted."""
+    from .models import Application, ResumeText
+
+    missing = (
+        Application.objects
+        .filter(resume_text__isnull=True)
+        .exclude(resume='')
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    queued = 0
+    batch = []
+    for app_id in missing.iterator(chunk_size=batch_size):
+        batch.append(ResumeText(application_id=app_id))
+        if len(batch) >= batch_size:
+            ResumeText.objects.bulk_create(batch, ignore_conflicts=True)
+            queued += len(batch)
+            batch = []
+    if batch:
+        ResumeText.objects.bulk_create(batch, ignore_conflicts=True)
+        queued += len(batch)
+    return queued
@@ -0,0 +1,67 @@
+"""
+Facet counts for the careers page filters.
+
+Counts follow the usual faceting rule: each facet respects the search
+query and every *other* active filter, so picking a location still shows
+how many jobs each job type has there. Results are cached under the
+listing version: the ``jobs`` version, which the Job save/delete signals
+bump, and the next deadline, so jobs stop being counted once they expire.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .cache import listing_version
+from .models import Job
+
+FACET_CACHE_TIMEOUT = 60 * 15
+
+
+def _facet_cache_key(filters):
+    raw = '&'.join(f'{name}={value}' for name, value in sorted(filters.items()) if value)
+    return f"careers:jobs:v{listing_version()}:facets:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def _counts(queryset, field):
+    rows = queryset.order_by().values(field).annotate(count=Count('id')).order_by(field)
+    return [(row[field], row['count']) for row in rows]
+
+
+def _location_counts(queryset):
+    rows = (
+        queryset.order_by()
+        .values('location_id', 'location__name')
+        .annotate(count=Count('id'))
+        .order_by('location__name')
+    )
+    return [(row['location_id'], row['location__name'], row['count']) for row in rows]
+
+
+def get_job_facets(queryset, job_type='', location=None, **filters):
+    """
+    Return per-location and per-job-type counts for ``queryset``.
+
+    Locations are ``(id, name, count)`` triples; ``location`` is a Location id.
+
+    ``queryset`` should already be narrowed to active jobs by every filter
+    in ``filters`` (search query, salary bounds), which only feed the cache
+    key, but not yet by job type or location.
+    """
+    key = _facet_cache_key({**filters, 'job_type': job_type, 'location': location})
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+
+    location_qs = queryset.filter(job_type=job_type) if job_type else queryset
+    type_qs = queryset.filter(location_id=location) if location else queryset
+
+    type_counts = dict(_counts(type_qs, 'job_type'))
+    facets = {
+        'locations': _location_counts(location_qs),
+        'job_types': [
+            (code, label, type_counts.get(code, 0)) for code, label in Job.JOB_TYPES
+        ],
+    }
+    cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,39 @@
+"""
+Application status history.
+
+Every status change appends an ``ApplicationStatusEvent`` (and every new
+application one from ``''`` to ``PENDING``), in the same transaction as
+the change: the Application signals cover single saves such as the HR
+status endpoint and the admin form, ``ApplicationQuerySet.update`` covers
+the admin actions and bulk review with one batched insert. Events are
+never updated. They drive the per-status daily rollups in
+``portal.rollups`` and the time-in-stage sketches in ``careers.durations``
+(both filled later, by their workers), where a stage starts at the event
+that entered it.
+"""
+from collections import namedtuple
+
+# Rows per INSERT for bulk changes
+BATCH_SIZE = 500
+
+# One status change of one application, as handed to record_status_changes
+Transition = namedtuple('Transition', 'application_id job_id old_status new_status applied_at changed_at changed_by_id')
+
+
+def record_status_changes(transitions):
+    """Append an event for each ``Transition`` that changes the status."""
+    from .models import ApplicationStatusEvent
+
+    transitions = [t for t in transitions if t.old_status != t.new_status]
+    if not transitions:
+        return
+    ApplicationStatusEvent.objects.bulk_create(
+        [
+            ApplicationStatusEvent(
+                application_id=t.application_id, job_id=t.job_id, from_status=t.old_status,
+                to_status=t.new_status, changed_at=t.changed_at, changed_by_id=t.changed_by_id,
+            )
+            for t in transitions
+        ],
+        batch_size=BATCH_SIZE,
+    )
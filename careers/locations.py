@@ -0,0 +1,22 @@
+"""
+Normalisation of the free-text locations HR types into ``Location`` rows.
+
+``"Harare, Zimbabwe"``, ``"harare,zimbabwe"`` and ``"Harare"`` all cluster
+on the place name before the first comma; whatever follows it becomes the
+region. Every spelling seen is kept as a ``LocationAlias`` so the next
+lookup for it is a single indexed hit.
+"""
+import re
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def location_key(text):
+    """Matching key for a location string: its lowercase words, single-spaced."""
+    return ' '.join(WORD_RE.findall((text or '').lower()))
+
+
+def split_location(text):
+    """Return ``(name, region)`` from ``"Name, Region"``; the region may be empty."""
+    name, _, region = ' '.join((text or '').split()).partition(',')
+    return name.strip(), region.strip(' ,')
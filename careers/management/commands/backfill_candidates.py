@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from careers.candidates import email_key, phone_key
+from careers.models import Application, Candidate
+
+
+class Command(BaseCommand):
+    help = 'Link existing applications to Candidate records, merging applications by normalised email and phone'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        unlinked = Application.objects.filter(candidate__isnull=True).order_by('id')
+        linked = created = 0
+
+        while True:
+            rows = list(unlinked.values_list('id', 'email', 'phone', 'full_name')[:batch_size])
+            if not rows:
+                break
+            with transaction.atomic():
+                batch_linked, batch_created = self.link_batch(rows)
+            linked += batch_linked
+            created += batch_created
+            self.stdout.write(f'Linked {linked} applications ({created} new candidates).')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Linked {linked} applications to {created} new candidates.'))
+
+    def link_batch(self, rows):
+        keyed = [(app_id, email_key(email), phone_key(phone), name) for app_id, email, phone, name in rows]
+        emails = {ek for _, ek, _, _ in keyed if ek}
+        phones = {pk for _, _, pk, _ in keyed if pk}
+
+        # One indexed lookup for every candidate this batch could belong to
+        by_email, by_phone = {}, {}
+        for candidate in Candidate.objects.filter(Q(email_key__in=emails) | Q(phone_key__in=phones)):
+            if candidate.email_key:
+                by_email[candidate.email_key] = candidate
+            if candidate.phone_key:
+                by_phone[candidate.phone_key] = candidate
+
+        new, changed, assignments = [], {}, []
+        for app_id, ek, pk, name in keyed:
+            candidate = (ek and by_email.get(ek)) or (pk and by_phone.get(pk)) or None
+            if candidate is None:
+                candidate = Candidate(email_key=ek or None, phone_key=pk or None, full_name=name or '')
+                new.append(candidate)
+            else:
+                if pk and not candidate.phone_key and pk not in by_phone:
+                    candidate.phone_key = pk
+                if ek and not candidate.email_key and ek not in by_email:
+                    candidate.email_key = ek
+                # Applications are processed oldest first, so the latest name wins
+                candidate.full_name = name or candidate.full_name
+                if candidate.pk:
+                    changed[candidate.pk] = candidate
+            if candidate.email_key:
+                by_email[candidate.email_key] = candidate
+            if candidate.phone_key:
+                by_phone[candidate.phone_key] = candidate
+            assignments.append((app_id, candidate))
+
+        Candidate.objects.bulk_create(new)
+        if changed:
+            Candidate.objects.bulk_update(changed.values(), ['email_key', 'phone_key', 'full_name'])
+        Application.objects.bulk_update(
+            [Application(pk=app_id, candidate_id=candidate.pk) for app_id, candidate in assignments],
+            ['candidate'],
+        )
+        return len(assignments), len(new)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from careers.cache import bump_version
+from careers.models import Job
+from careers.salary import parse_salary_range
+
+
+class Command(BaseCommand):
+    help = 'Parse salary_range into salary_min, salary_max and salary_currency for existing jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        updated = 0
+        jobs = Job.objects.only('id', 'salary_range', 'salary_min', 'salary_max', 'salary_currency').order_by('id')
+
+        for job in jobs.iterator(chunk_size=batch_size):
+            parsed = parse_salary_range(job.salary_range)
+            if parsed == (job.salary_min, job.salary_max, job.salary_currency):
+                continue
+            job.salary_min, job.salary_max, job.salary_currency = parsed
+            batch.append(job)
+            if len(batch) >= batch_size:
+                Job.objects.bulk_update(batch, ['salary_min', 'salary_max', 'salary_currency'])
+                updated += len(batch)
+                batch = []
+        if batch:
+            Job.objects.bulk_update(batch, ['salary_min', 'salary_max', 'salary_currency'])
+            updated += len(batch)
+
+        # bulk_update skips the Job signals, so invalidate salary-filtered facets here
+        bump_version('jobs')
+        self.stdout.write(self.style.SUCCESS(f'Updated salary bounds on {updated} jobs.'))
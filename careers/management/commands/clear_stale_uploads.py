@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from careers.uploads import clear_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned chunked resume uploads and their partial files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Age in hours after which an idle upload is discarded')
+
+    def handle(self, *args, **options):
+        count = clear_stale_uploads(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} stale uploads.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from careers.expiry import expire_jobs
+
+
+class Command(BaseCommand):
+    help = 'Deactivate job postings whose application deadline has passed (run on a schedule, e.g. hourly cron)'
+
+    def handle(self, *args, **options):
+        expired = expire_jobs()
+        self.stdout.write(self.style.SUCCESS(f'Deactivated {len(expired)} expired jobs.'))
@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from careers.extraction import process_pending, queue_missing
+
+
+class Command(BaseCommand):
+    help = 'Extract searchable text from pending resumes using a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backfill', action='store_true', help='Queue applications that were never extracted first')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (defaults to the CPU count)')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new resumes instead of exiting')
+        parser.add_argument('--interval', type=int, default=30, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            queued = queue_missing()
+            self.stdout.write(f'Queued {queued} existing applications.')
+
+        total = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                processed = process_pending(pool, batch_size=options['batch_size'])
+                total += processed
+                if processed:
+                    self.stdout.write(f'Extracted {processed} resumes ({total} total).')
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Processed {total} resumes.'))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from careers.talent import match_pending
+
+
+class Command(BaseCommand):
+    help = 'Shortlist past applicants for active jobs from the applicant term index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50_000, help='Application ids scored per index query')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs and applications instead of exiting')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            matched = match_pending(batch_size=options['batch_size'])
+            if matched:
+                self.stdout.write(f'Updated the talent pool for {matched} jobs.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
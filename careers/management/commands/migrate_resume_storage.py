@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from careers.models import Application, ResumeBlob
+from careers.storage import is_content_addressed, resume_storage
+
+
+class Command(BaseCommand):
+    help = 'Move existing resumes into content-addressed storage and rebuild reference counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--keep-originals', action='store_true', help='Leave the old flat files in place')
+
+    def handle(self, *args, **options):
+        moved = missing = 0
+        old_names = set()
+        legacy = (
+            Application.objects
+            .exclude(resume='')
+            .order_by('id')
+            .values_list('id', 'resume')
+        )
+
+        for app_id, name in legacy.iterator(chunk_size=options['batch_size']):
+            if is_content_addressed(name):
+                continue
+            if not resume_storage.exists(name):
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'Missing file for application {app_id}: {name}'))
+                continue
+            with resume_storage.open(name) as original:
+                new_name = resume_storage.save(name, original)
+            # update() skips the reference-count signals; counts are rebuilt below
+            Application.objects.filter(pk=app_id).update(resume=new_name)
+            old_names.add(name)
+            moved += 1
+
+        if not options['keep_originals']:
+            for name in old_names:
+                resume_storage.delete(name)
+
+        self.rebuild_reference_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f'Moved {moved} resumes ({missing} missing); tracking {ResumeBlob.objects.count()} resume files.'
+        ))
+
+    def rebuild_reference_counts(self):
+        counts = (
+            Application.objects
+            .exclude(resume='')
+            .values('resume')
+            .annotate(refs=Count('id'))
+            .order_by()
+        )
+        ResumeBlob.objects.all().delete()
+        ResumeBlob.objects.bulk_create(
+            [
+                ResumeBlob(
+                    name=row['resume'],
+                    ref_count=row['refs'],
+                    size=resume_storage.size(row['resume']) if resume_storage.exists(row['resume']) else 0,
+                )
+                for row in counts.iterator()
+            ],
+            batch_size=500,
+        )
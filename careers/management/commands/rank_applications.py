@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from careers.ranking import score_pending
+
+
+class Command(BaseCommand):
+    help = "Score applications against their job's requirements (TF-IDF) for the best match sort"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new applications instead of exiting')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between polls with --loop')
+        parser.add_argument('--rebuild-idf', action='store_true', help='Recount the IDF over the current postings first')
+
+    def handle(self, *args, **options):
+        total = 0
+        rebuild_idf = options['rebuild_idf']
+        while True:
+            scored = score_pending(batch_size=options['batch_size'], rebuild_idf=rebuild_idf)
+            rebuild_idf = False
+            total += scored
+            if scored:
+                self.stdout.write(f'Scored {scored} applications ({total} total).')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Scored {total} applications.'))
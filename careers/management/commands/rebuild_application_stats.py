@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from careers.models import ApplicationStats
+from careers.stats import recount
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-job, per-status application counters from the Application table'
+
+    def handle(self, *args, **options):
+        recount()
+        rows = ApplicationStats.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt application stats ({rows} job/status counters).'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from careers.durations import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the time-to-hire and time-in-stage sketches from the application status events'
+
+    def handle(self, *args, **options):
+        events = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt duration sketches from {events} status events.'))
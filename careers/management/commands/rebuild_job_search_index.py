@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from careers.models import Job
+from careers.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search indexes for job postings, resumes and applications'
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        count = Job.objects.filter(is_active=True).count()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} active jobs.'))
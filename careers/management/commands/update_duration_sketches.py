@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from careers.durations import fold_pending
+
+
+class Command(BaseCommand):
+    help = 'Fold new application status events into the time-to-hire and time-in-stage sketches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Status events folded per transaction')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new status events instead of exiting')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            folded = fold_pending(batch_size=options['batch_size'])
+            total += folded
+            if folded:
+                self.stdout.write(f'Folded {folded} status events into the duration sketches.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Folded {total} status events.'))
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS careers_job_fts USING fts5("
+        "title, description, requirements, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO careers_job_fts (rowid, title, description, requirements) "
+        "SELECT id, title, description, requirements FROM careers_job WHERE is_active"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS careers_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0005_alter_application_id_alter_job_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2 on 2026-10-18 10:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_resume_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS careers_resume_fts USING fts5("
+        "content, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+
+
+def drop_resume_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS careers_resume_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0008_resume_content_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Extracted'), ('FAILED', 'Failed')], db_index=True, default='PENDING', max_length=10)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_text', to='careers.application')),
+            ],
+        ),
+        migrations.RunPython(create_resume_index, drop_resume_index),
+    ]
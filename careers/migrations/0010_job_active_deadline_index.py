@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0009_resumetext'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'deadline'], name='careers_job_active_deadline'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0010_job_active_deadline_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Parsed from salary_range', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Parsed from salary_range', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_min'], name='careers_job_active_salary_min'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_max'], name='careers_job_active_salary_max'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _key(text):
+    return ' '.join(WORD_RE.findall((text or '').lower()))
+
+
+def _split(text):
+    name, _, region = ' '.join((text or '').split()).partition(',')
+    return name.strip(), region.strip(' ,')
+
+
+def cluster_locations(apps, schema_editor):
+    """Collapse the distinct free-text job locations into Location rows."""
+    Job = apps.get_model('careers', 'Job')
+    Location = apps.get_model('careers', 'Location')
+    LocationAlias = apps.get_model('careers', 'LocationAlias')
+
+    # Group spellings on the place name, most used spelling first
+    clusters = {}
+    spellings = Job.objects.order_by().values('location').annotate(jobs=Count('id')).order_by('-jobs', 'location')
+    for row in spellings:
+        text = row['location']
+        name, _ = _split(text)
+        key = _key(name) or _key(text) or 'unspecified'
+        clusters.setdefault(key, []).append(text)
+
+    for key, texts in clusters.items():
+        name = _split(texts[0])[0] or texts[0].strip() or 'Unspecified'
+        region = next((region for region in (_split(text)[1] for text in texts) if region), '')
+        location = Location.objects.create(name=name, region=region, key=key)
+        for text in texts:
+            LocationAlias.objects.get_or_create(key=_key(text) or key, defaults={'location': location})
+        Job.objects.filter(location__in=texts).update(location_ref=location)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0011_job_salary_bounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('region', models.CharField(blank=True, help_text='Country or province, e.g. Zimbabwe', max_length=100)),
+                ('key', models.CharField(editable=False, help_text='Normalised name used for matching', max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='careers.location')),
+            ],
+            options={
+                'verbose_name_plural': 'location aliases',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='location_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='careers.location'),
+        ),
+        migrations.RunPython(cluster_locations, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='job',
+            name='location',
+        ),
+        migrations.RenameField(
+            model_name='job',
+            old_name='location_ref',
+            new_name='location',
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='jobs', to='careers.location'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-18 10:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_applicant_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    # Porter stemming so "accounting" in a resume matches "accountant" in requirements
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS careers_applicant_fts USING fts5("
+        "cover_letter, resume, tokenize='porter unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO careers_applicant_fts (rowid, cover_letter, resume) "
+        "SELECT a.id, a.cover_letter, r.content FROM careers_application a "
+        "JOIN careers_resumetext r ON r.application_id = a.id WHERE r.status != 'PENDING'"
+    )
+
+
+def drop_applicant_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS careers_applicant_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0012_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='talent_pool_query',
+            field=models.TextField(blank=True, editable=False, help_text='Terms the talent pool shortlist was matched on'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='talent_pool_through',
+            field=models.PositiveBigIntegerField(default=0, editable=False, help_text='Highest application id scored for the talent pool'),
+        ),
+        migrations.CreateModel(
+            name='TalentMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text="Relevance of the applicant's cover letter and resume (higher is better)")),
+                ('matched_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='talent_matches', to='careers.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='talent_matches', to='careers.job')),
+            ],
+            options={
+                'ordering': ['-score'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'application'), name='careers_talentmatch_job_application')],
+            },
+        ),
+        migrations.RunPython(create_applicant_index, drop_applicant_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0013_talent_pool'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(blank=True, editable=False, help_text='TF-IDF similarity to the job (0-1), set by rank_applications', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='match_query',
+            field=models.TextField(blank=True, editable=False, help_text="Terms the applicants' match scores were computed for"),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'match_score'], name='careers_app_job_match'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 10:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0014_application_match_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Candidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email_key', models.CharField(blank=True, help_text='Normalised email address', max_length=254, null=True, unique=True)),
+                ('phone_key', models.CharField(blank=True, help_text='Last digits of the phone number', max_length=20, null=True, unique=True)),
+                ('full_name', models.CharField(blank=True, help_text='Name on the latest application', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='candidate',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='careers.candidate'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 10:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_applications(apps, schema_editor):
+    Application = apps.get_model('careers', 'Application')
+    ApplicationStats = apps.get_model('careers', 'ApplicationStats')
+    rows = Application.objects.order_by().values('job_id', 'status').annotate(total=Count('id'))
+    ApplicationStats.objects.bulk_create(
+        ApplicationStats(job_id=row['job_id'], status=row['status'], count=row['total']) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0015_candidate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending Review'), ('REVIEWED', 'Reviewed'), ('INTERVIEW', 'Interview Scheduled'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_stats', to='careers.job')),
+            ],
+            options={
+                'verbose_name_plural': 'application stats',
+                'constraints': [models.UniqueConstraint(fields=('job', 'status'), name='careers_applicationstats_job_status')],
+            },
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def create_application_index(apps, schema_editor):
+    connection = schema_editor.connection
+    # The trigram tokenizer arrived in SQLite 3.34; older builds keep the icontains search
+    if connection.vendor != 'sqlite' or connection.Database.sqlite_version_info < (3, 34, 0):
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS careers_application_fts USING fts5("
+        "full_name, email, phone, notes, job_title, tokenize='trigram')"
+    )
+    schema_editor.execute(
+        "INSERT INTO careers_application_fts (rowid, full_name, email, phone, notes, job_title) "
+        "SELECT a.id, a.full_name, a.email, "
+        "a.phone || ' ' || replace(replace(replace(replace(replace(a.phone, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), "
+        "a.notes, j.title FROM careers_application a JOIN careers_job j ON j.id = a.job_id"
+    )
+
+
+def drop_application_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS careers_application_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0016_application_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_application_index, drop_application_index),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 10:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0017_application_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at', 'id'], name='careers_app_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'applied_at', 'id'], name='careers_app_status_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'applied_at', 'id'], name='careers_app_job_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'applied_at', 'id'], name='careers_app_job_status_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['rating', 'applied_at', 'id'], name='careers_app_rating_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'rating', 'applied_at', 'id'], name='careers_app_status_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'rating', 'applied_at', 'id'], name='careers_app_job_rating_applied'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['full_name', 'id'], name='careers_app_name'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'full_name', 'id'], name='careers_app_status_name'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'full_name', 'id'], name='careers_app_job_name'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0018_application_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_at', 'id'], name='careers_job_posted'),
+        ),
+    ]
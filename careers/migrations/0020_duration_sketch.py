@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-18 10:48
+
+import math
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# The sketch format of careers.durations as of this migration (log buckets of
+# relative accuracy 1%, durations under a second counted as zero), copied here
+# so the seed data does not change with that module
+LOG_GAMMA = math.log(1.01 / 0.99)
+MIN_SECONDS = 1.0
+
+
+def _bucket(seconds):
+    return 'zero' if seconds < MIN_SECONDS else str(math.ceil(math.log(seconds) / LOG_GAMMA))
+
+
+def seed_hire_times(apps, schema_editor):
+    # Superseded by the replay of the status event log in 0027
+    Application = apps.get_model('careers', 'Application')
+    DurationSketch = apps.get_model('careers', 'DurationSketch')
+    # (job, month of the hire) -> bucket -> count
+    sketches = defaultdict(Counter)
+    hires = Application.objects.filter(status='HIRED', reviewed_at__isnull=False)
+    for job_id, applied_at, reviewed_at in hires.values_list('job_id', 'applied_at', 'reviewed_at').iterator():
+        period = timezone.localdate(reviewed_at).replace(day=1)
+        sketches[(job_id, period)][_bucket(max((reviewed_at - applied_at).total_seconds(), 0.0))] += 1
+    DurationSketch.objects.bulk_create(
+        DurationSketch(
+            metric='HIRE', stage='', job_id=job_id, period=period, count=sum(buckets.values()),
+            data={'zero': buckets['zero'], 'bins': {key: n for key, n in buckets.items() if key != 'zero'}},
+        )
+        for (job_id, period), buckets in sketches.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0019_job_posted_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DurationSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('HIRE', 'Time to hire'), ('STAGE', 'Time in stage')], max_length=10)),
+                ('stage', models.CharField(blank=True, choices=[('PENDING', 'Pending Review'), ('REVIEWED', 'Reviewed'), ('INTERVIEW', 'Interview Scheduled'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('period', models.DateField(help_text='First day of the month the changes happened in')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('data', models.JSONField(default=dict)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duration_sketches', to='careers.job')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'stage', 'job', 'period'), name='careers_durationsketch_key')],
+            },
+        ),
+        migrations.RunPython(seed_hire_times, migrations.RunPython.noop),
+    ]
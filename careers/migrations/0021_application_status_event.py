@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 10:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_history(apps, schema_editor):
+    # Earlier transitions were never recorded: seed what the current state implies,
+    # submitted as PENDING and moved to the current status at the last review
+    Application = apps.get_model('careers', 'Application')
+    ApplicationStatusEvent = apps.get_model('careers', 'ApplicationStatusEvent')
+    events = []
+    rows = Application.objects.values_list('id', 'job_id', 'status', 'applied_at', 'reviewed_at', 'reviewed_by_id')
+    for pk, job_id, status, applied_at, reviewed_at, reviewed_by_id in rows.iterator(chunk_size=2000):
+        events.append(ApplicationStatusEvent(
+            application_id=pk, job_id=job_id, from_status='', to_status='PENDING', changed_at=applied_at,
+        ))
+        if status != 'PENDING':
+            events.append(ApplicationStatusEvent(
+                application_id=pk, job_id=job_id, from_status='PENDING', to_status=status,
+                changed_at=reviewed_at or applied_at, changed_by_id=reviewed_by_id,
+            ))
+        if len(events) >= 1000:
+            ApplicationStatusEvent.objects.bulk_create(events)
+            events = []
+    ApplicationStatusEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0020_duration_sketch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('PENDING', 'Pending Review'), ('REVIEWED', 'Reviewed'), ('INTERVIEW', 'Interview Scheduled'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('to_status', models.CharField(choices=[('PENDING', 'Pending Review'), ('REVIEWED', 'Reviewed'), ('INTERVIEW', 'Interview Scheduled'), ('REJECTED', 'Rejected'), ('HIRED', 'Hired')], max_length=20)),
+                ('changed_at', models.DateTimeField()),
+                ('application', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='careers.application')),
+                ('changed_by', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='careers.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['application', 'changed_at'], name='careers_event_app'), models.Index(fields=['job', 'changed_at'], name='careers_event_job'), models.Index(fields=['changed_at'], name='careers_event_time')],
+            },
+        ),
+        migrations.RunPython(seed_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0021_application_status_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='match_idf',
+            field=models.CharField(blank=True, editable=False, help_text='Version of the IDF table the match scores were computed with', max_length=40),
+        ),
+    ]
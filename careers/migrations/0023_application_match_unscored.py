@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+def mark_unscored(apps, schema_editor):
+    Application = apps.get_model('careers', 'Application')
+    Application.objects.filter(match_score__isnull=True).update(match_score=-1.0)
+
+
+def unmark_unscored(apps, schema_editor):
+    Application = apps.get_model('careers', 'Application')
+    Application.objects.filter(match_score=-1.0).update(match_score=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0022_job_match_idf'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='application',
+            name='careers_app_job_match',
+        ),
+        migrations.RunPython(mark_unscored, unmark_unscored),
+        migrations.AlterField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(default=-1.0, editable=False, help_text='TF-IDF similarity to the job (0-1), set by rank_applications; -1 until then'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'match_score', 'applied_at', 'id'], name='careers_app_job_match'),
+        ),
+    ]
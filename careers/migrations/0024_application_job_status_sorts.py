@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0023_application_match_unscored'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'rating', 'applied_at', 'id'], name='careers_app_job_status_rating'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'full_name', 'id'], name='careers_app_job_status_name'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0024_application_job_status_sorts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IDFSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=40, unique=True)),
+                ('total', models.PositiveIntegerField(help_text='Job postings counted')),
+                ('frequencies', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
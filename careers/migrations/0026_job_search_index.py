@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 11:24
+
+import careers.search.fts
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0025_idf_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchIndex',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='careers.job')),
+                ('document', careers.search.fts.FTSDocumentField(db_column='careers_job_fts')),
+            ],
+            options={
+                'db_table': 'careers_job_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2 on 2026-10-18 11:28
+
+import math
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# The sketch format and replay of careers.durations as of this migration, copied
+# here so the data does not change with that module
+LOG_GAMMA = math.log(1.01 / 0.99)
+MIN_SECONDS = 1.0
+
+
+def _bucket(seconds):
+    return 'zero' if seconds < MIN_SECONDS else str(math.ceil(math.log(seconds) / LOG_GAMMA))
+
+
+def replay_events(apps, schema_editor):
+    # 0020 seeded hire times from reviewed_at; the event log (seeded by 0021) is the
+    # source of truth, so replace every sketch with its replay, as durations.rebuild does
+    ApplicationStatusEvent = apps.get_model('careers', 'ApplicationStatusEvent')
+    DurationSketch = apps.get_model('careers', 'DurationSketch')
+    DurationWatermark = apps.get_model('careers', 'DurationWatermark')
+
+    through = ApplicationStatusEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    events = (
+        ApplicationStatusEvent.objects.filter(pk__lte=through)
+        .order_by('application_id', 'changed_at', 'id')
+        .values_list('application_id', 'job_id', 'to_status', 'changed_at', 'application__applied_at')
+    )
+    # (metric, stage, job, month) -> bucket -> count
+    sketches = defaultdict(Counter)
+    previous = None
+    for event in events.iterator(chunk_size=2000):
+        application_id, job_id, status, changed_at, applied_at = event
+        period = timezone.localdate(changed_at).replace(day=1)
+        if previous is not None and previous[0] == application_id and previous[2] != status:
+            seconds = max((changed_at - previous[3]).total_seconds(), 0.0)
+            sketches[('STAGE', previous[2], job_id, period)][_bucket(seconds)] += 1
+        if status == 'HIRED':
+            sketches[('HIRE', '', job_id, period)][_bucket(max((changed_at - applied_at).total_seconds(), 0.0))] += 1
+        previous = event
+
+    DurationSketch.objects.all().delete()
+    DurationSketch.objects.bulk_create(
+        (
+            DurationSketch(
+                metric=metric, stage=stage, job_id=job_id, period=period, count=sum(buckets.values()),
+                data={'zero': buckets['zero'], 'bins': {key: n for key, n in buckets.items() if key != 'zero'}},
+            )
+            for (metric, stage, job_id, period), buckets in sketches.items()
+        ),
+        batch_size=500,
+    )
+    DurationWatermark.objects.create(pk=1, through_event=through)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0026_job_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DurationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('through_event', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(replay_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 11:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0027_duration_watermark'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='application',
+            name='careers_app_status_rating',
+        ),
+        migrations.RemoveIndex(
+            model_name='application',
+            name='careers_app_status_name',
+        ),
+        migrations.RemoveIndex(
+            model_name='application',
+            name='careers_app_job_status_rating',
+        ),
+        migrations.RemoveIndex(
+            model_name='application',
+            name='careers_app_job_status_name',
+        ),
+        migrations.RemoveIndex(
+            model_name='applicationstatusevent',
+            name='careers_event_job',
+        ),
+        migrations.AlterField(
+            model_name='applicationstatusevent',
+            name='job',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='careers.job'),
+        ),
+    ]
@@ -1,4 +1,76 @@
-from django.db import models
+import uuid
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from .candidates import email_key, phone_key
+from .locations import location_key, split_location
+from .salary import parse_salary_range
+from .search.fts import FTSDocumentField
+from .storage import get_resume_storage
+
+
+class LocationManager(models.Manager):
+    def resolve(self, text):
+        """
+        Return the Location for a free-text ``text``, creating it if needed.
+
+        Returns None for blank input. The exact spelling is recorded as an
+        alias so later lookups skip the clustering step.
+        """
+        alias_key = location_key(text)
+        if not alias_key:
+            return None
+        alias = LocationAlias.objects.select_related('location').filter(key=alias_key).first()
+        if alias is not None:
+            return alias.location
+
+        name, region = split_location(text)
+        location, _ = self.get_or_create(
+            key=location_key(name) or alias_key,
+            defaults={'name': name or text.strip(), 'region': region},
+        )
+        if not location.region and region:
+            location.region = region
+            location.save(update_fields=['region'])
+        LocationAlias.objects.get_or_create(key=alias_key, defaults={'location': location})
+        return location
+
+
+class Location(models.Model):
+    """Canonical place a job is based in; jobs point here instead of repeating free text."""
+    name = models.CharField(max_length=100, unique=True)
+    region = models.CharField(max_length=100, blank=True, help_text="Country or province, e.g. Zimbabwe")
+    key = models.CharField(max_length=100, unique=True, editable=False, help_text="Normalised name used for matching")
+
+    objects = LocationManager()
+
+    def __str__(self):
+        return f"{self.name}, {self.region}" if self.region else self.name
+
+    def save(self, *args, **kwargs):
+        self.key = location_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'key'}
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['name']
+
+
+class LocationAlias(models.Model):
+    """A spelling of a location seen in job postings, mapped to its canonical Location."""
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+    key = models.CharField(max_length=200, unique=True)
+
+    def __str__(self):
+        return f"{self.key} -> {self.location.name}"
+
+    class Meta:
+        verbose_name_plural = 'location aliases'
+
 
 class Job(models.Model):
     JOB_TYPES = [
@@ -9,20 +81,210 @@ class Job(models.Model):
     ]
 
     title = models.CharField(max_length=200)
-    location = models.CharField(max_length=100)
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name='jobs')
     job_type = models.CharField(max_length=2, choices=JOB_TYPES, default='FT')
     description = models.TextField(help_text="Detailed job description")
     requirements = models.TextField(help_text="List of requirements")
     salary_range = models.CharField(max_length=100, blank=True, null=True)
+    salary_min = models.PositiveIntegerField(blank=True, null=True, editable=False, help_text="Parsed from salary_range")
+    salary_max = models.PositiveIntegerField(blank=True, null=True, editable=False, help_text="Parsed from salary_range")
+    salary_currency = models.CharField(max_length=3, blank=True, editable=False)
     deadline = models.DateTimeField(blank=True, null=True, help_text="Application deadline")
     posted_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    talent_pool_query = models.TextField(blank=True, editable=False, help_text="Terms the talent pool shortlist was matched on")
+    talent_pool_through = models.PositiveBigIntegerField(default=0, editable=False, help_text="Highest application id scored for the talent pool")
+    match_query = models.TextField(blank=True, editable=False, help_text="Terms the applicants' match scores were computed for")
+    match_idf = models.CharField(max_length=40, blank=True, editable=False, help_text="Version of the IDF table the match scores were computed with")
 
     def __str__(self):
         return f"{self.title} - {self.location}"
 
+    def save(self, *args, **kwargs):
+        self.salary_min, self.salary_max, self.salary_currency = parse_salary_range(self.salary_range)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'salary_range' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'salary_min', 'salary_max', 'salary_currency'}
+        super().save(*args, **kwargs)
+
+    @property
+    def is_expired(self):
+        return self.deadline is not None and self.deadline < timezone.now()
+
+    @property
+    def is_accepting_applications(self):
+        return self.is_active and not self.is_expired
+
     class Meta:
         ordering = ['-posted_at']
+        indexes = [
+            models.Index(fields=['is_active', 'deadline'], name='careers_job_active_deadline'),
+            models.Index(fields=['is_active', 'salary_min'], name='careers_job_active_salary_min'),
+            models.Index(fields=['is_active', 'salary_max'], name='careers_job_active_salary_max'),
+            models.Index(fields=['posted_at', 'id'], name='careers_job_posted'),
+        ]
+
+class JobSearchIndex(models.Model):
+    """
+    A row of the FTS5 job index, ``careers_job_fts`` (SQLite only), keyed by job id.
+
+    Written only by careers.search; mapped so job searches can join and rank it.
+    """
+    job = models.OneToOneField(
+        Job, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_index',
+    )
+    # The table-named hidden column: MATCH and bm25 take it
+    document = FTSDocumentField(db_column='careers_job_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'careers_job_fts'
+
+
+class CandidateManager(models.Manager):
+    def for_applicant(self, email, phone, full_name=''):
+        """
+        Return the Candidate for an applicant's contact details, creating one if needed.
+
+        Matches on the normalised email first, then on the normalised phone
+        number, both unique-indexed lookups.
+        """
+        key = email_key(email)
+        phone = phone_key(phone)
+        candidate = self.filter(email_key=key).first() if key else None
+        if candidate is None and phone:
+            candidate = self.filter(phone_key=phone).first()
+        if candidate is None:
+            try:
+                with transaction.atomic():
+                    return self.create(email_key=key or None, phone_key=phone or None, full_name=full_name or '')
+            except IntegrityError:
+                # A concurrent submission created it first
+                return self.for_applicant(email, phone, full_name)
+
+        changed = []
+        if phone and not candidate.phone_key and not self.filter(phone_key=phone).exists():
+            candidate.phone_key = phone
+            changed.append('phone_key')
+        if key and not candidate.email_key and not self.filter(email_key=key).exists():
+            candidate.email_key = key
+            changed.append('email_key')
+        if full_name and full_name != candidate.full_name:
+            candidate.full_name = full_name
+            changed.append('full_name')
+        if changed:
+            candidate.save(update_fields=changed)
+        return candidate
+
+
+class Candidate(models.Model):
+    """A person behind one or more applications, identified by normalised email and phone."""
+    email_key = models.CharField(max_length=254, unique=True, null=True, blank=True, help_text="Normalised email address")
+    phone_key = models.CharField(max_length=20, unique=True, null=True, blank=True, help_text="Last digits of the phone number")
+    full_name = models.CharField(max_length=100, blank=True, help_text="Name on the latest application")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CandidateManager()
+
+    def __str__(self):
+        return self.full_name or self.email_key or self.phone_key or f"Candidate {self.pk}"
+
+
+class ApplicationQuerySet(models.QuerySet):
+    # Fields mirrored into the HR search index (job for its title)
+    SEARCH_FIELDS = {'full_name', 'email', 'phone', 'notes', 'job', 'job_id'}
+
+    def update(self, **kwargs):
+        """Bulk update that keeps ApplicationStats, the status history and the HR search index in step."""
+        from .search import get_search_backend
+
+        reindex = bool(self.SEARCH_FIELDS & kwargs.keys())
+        if not reindex and 'status' not in kwargs:
+            return self._update_counted(kwargs)
+
+        with transaction.atomic():
+            if 'status' in kwargs:
+                # Where each row was before, for its status events
+                before = list(self.values_list('id', 'job_id', 'status', 'applied_at'))
+                application_ids = [row[0] for row in before]
+            else:
+                application_ids = list(self.values_list('id', flat=True))
+            rows = self._update_counted(kwargs)
+            if 'status' in kwargs:
+                self._record_status_changes(before, kwargs)
+            if reindex:
+                get_search_backend().index_applications(application_ids)
+            return rows
+
+    def _record_status_changes(self, before, kwargs):
+        from .history import Transition, record_status_changes
+
+        status = kwargs['status']
+        if isinstance(status, str):
+            new_statuses = dict.fromkeys((row[0] for row in before), status)
+        else:
+            new_statuses = dict(Application.objects.filter(pk__in=[row[0] for row in before]).values_list('id', 'status'))
+        reviewer = kwargs.get('reviewed_by', kwargs.get('reviewed_by_id'))
+        reviewer_id = getattr(reviewer, 'pk', reviewer)
+        now = timezone.now()
+        record_status_changes(
+            Transition(pk, job_id, old_status, new_statuses.get(pk, old_status), applied_at, now, reviewer_id)
+            for pk, job_id, old_status, applied_at in before
+        )
+
+    def bulk_review(self, reviewer, status=None, rating=None):
+        """
+        Set ``status`` and/or ``rating`` on every application here, reviewed by ``reviewer`` now.
+
+        Returns ``(rows_updated, changed)`` where ``changed`` holds the applications
+        whose status actually changed (with ``old_status`` set), for notifications.
+        """
+        fields = {'reviewed_by': reviewer, 'reviewed_at': timezone.now()}
+        if rating is not None:
+            fields['rating'] = rating
+        changed = []
+        with transaction.atomic():
+            if status is not None:
+                fields['status'] = status
+                changed = list(
+                    self.select_for_update(of=('self',)).exclude(status=status)
+                    .select_related('job').only('id', 'full_name', 'email', 'status', 'job__title')
+                )
+            # One UPDATE; the counters move once per (job, old status) group
+            rows = self.update(**fields)
+        for application in changed:
+            application.old_status, application.status = application.status, status
+        return rows, changed
+
+    def _update_counted(self, kwargs):
+        from .stats import apply_deltas, recount
+
+        if not {'status', 'job', 'job_id'} & kwargs.keys():
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            status = kwargs.get('status')
+            if isinstance(status, str) and not {'job', 'job_id'} & kwargs.keys():
+                # Plain status change: move each (job, old status) group to the new status
+                groups = list(self.order_by().values_list('job_id', 'status').annotate(total=models.Count('id')))
+                rows = super().update(**kwargs)
+                deltas = Counter()
+                for job_id, old_status, total in groups:
+                    deltas[(job_id, old_status)] -= total
+                    deltas[(job_id, status)] += total
+                apply_deltas(deltas)
+                return rows
+
+            # Expressions or job moves: recount the jobs involved
+            job_ids = set(self.order_by().values_list('job_id', flat=True).distinct())
+            new_job = kwargs.get('job_id', kwargs.get('job'))
+            if new_job is not None:
+                job_ids.add(getattr(new_job, 'pk', new_job))
+            rows = super().update(**kwargs)
+            recount(job_ids)
+            return rows
+
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -32,13 +294,17 @@ class Application(models.Model):
         ('REJECTED', 'Rejected'),
         ('HIRED', 'Hired'),
     ]
+    # match_score until rank_applications scores the application: below every real score, so
+    # unscored applicants sort last, and not NULL, so the best match sort is a plain index scan
+    UNSCORED = -1.0
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
+    candidate = models.ForeignKey(Candidate, on_delete=models.SET_NULL, null=True, blank=True, related_name='applications')
     full_name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=20)
     linkedin_url = models.URLField(blank=True, null=True)
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', storage=get_resume_storage)
     cover_letter = models.TextField(blank=True)
     applied_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
@@ -46,6 +312,184 @@ class Application(models.Model):
     rating = models.IntegerField(default=0, help_text="Rating from 0-5 stars")
     reviewed_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='reviewed_applications')
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    match_score = models.FloatField(default=UNSCORED, editable=False, help_text="TF-IDF similarity to the job (0-1), set by rank_applications; -1 until then")
+
+    objects = ApplicationQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.full_name} - {self.job.title}"
+
+    def save(self, *args, **kwargs):
+        # The post_save handlers (counters, resume refcounts) commit or roll back with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so signal handlers can tell what a save changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    class Meta:
+        # One index per filter + sort combination the HR lists offer (portal.filters.APPLICATION_SORTS),
+        # each ending in id so keyset pages are index range scans on every database; a date range
+        # only comes with the applied_at sorts (portal.filters.DATE_RANGE_SORTS). The name and rating
+        # sorts have no status variants: a status narrows them by checking rows along the job (or
+        # unfiltered) sort index, which still stops after one page
+        indexes = [
+            models.Index(fields=['job', 'match_score', 'applied_at', 'id'], name='careers_app_job_match'),
+            models.Index(fields=['applied_at', 'id'], name='careers_app_applied'),
+            models.Index(fields=['status', 'applied_at', 'id'], name='careers_app_status_applied'),
+            models.Index(fields=['job', 'applied_at', 'id'], name='careers_app_job_applied'),
+            models.Index(fields=['job', 'status', 'applied_at', 'id'], name='careers_app_job_status_applied'),
+            models.Index(fields=['rating', 'applied_at', 'id'], name='careers_app_rating_applied'),
+            models.Index(fields=['job', 'rating', 'applied_at', 'id'], name='careers_app_job_rating_applied'),
+            models.Index(fields=['full_name', 'id'], name='careers_app_name'),
+            models.Index(fields=['job', 'full_name', 'id'], name='careers_app_job_name'),
+        ]
+
+
+class TalentMatch(models.Model):
+    """A past applicant to another posting, shortlisted for a job by the talent pool matcher."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='talent_matches')
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='talent_matches')
+    score = models.FloatField(help_text="Relevance of the applicant's cover letter and resume (higher is better)")
+    matched_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.application_id} for {self.job_id} ({self.score:.2f})"
+
+    class Meta:
+        ordering = ['-score']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'application'], name='careers_talentmatch_job_application'),
+        ]
+
+
+class ApplicationStats(models.Model):
+    """Number of applications a job has in each status, maintained by careers.stats."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_stats')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id} {self.status}: {self.count}"
+
+    class Meta:
+        verbose_name_plural = 'application stats'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'status'], name='careers_applicationstats_job_status'),
+        ]
+
+
+class IDFSnapshot(models.Model):
+    """Document frequencies of the job postings the match scores are computed with, frozen by careers.ranking."""
+    version = models.CharField(max_length=40, unique=True)
+    total = models.PositiveIntegerField(help_text="Job postings counted")
+    frequencies = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"IDF {self.version[:8]} over {self.total} jobs"
+
+
+class DurationSketch(models.Model):
+    """Quantile sketch of time-to-hire or time-in-stage for one job and month, maintained by careers.durations."""
+    METRIC_CHOICES = [
+        ('HIRE', 'Time to hire'),
+        ('STAGE', 'Time in stage'),
+    ]
+
+    metric = models.CharField(max_length=10, choices=METRIC_CHOICES)
+    # The status left, for STAGE; blank for HIRE
+    stage = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='duration_sketches')
+    period = models.DateField(help_text="First day of the month the changes happened in")
+    count = models.PositiveIntegerField(default=0)
+    data = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"{self.metric} {self.stage} {self.job_id} {self.period:%Y-%m}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'stage', 'job', 'period'], name='careers_durationsketch_key'),
+        ]
+
+
+class DurationWatermark(models.Model):
+    """The last ApplicationStatusEvent folded into the duration sketches (a single row)."""
+    through_event = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Durations through event {self.through_event}"
+
+
+class ApplicationStatusEvent(models.Model):
+    """One status change of an application, appended by careers.history and never updated."""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_events', db_index=False)
+    # Denormalised so per-job history needs no join. Not indexed, so deleting a job leaves the
+    # events to the application cascade rather than scanning the log by job
+    job = models.ForeignKey(Job, on_delete=models.DO_NOTHING, related_name='+', db_index=False)
+    # Blank for the event that creates the application
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_at = models.DateTimeField()
+    changed_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status} at {self.changed_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['application', 'changed_at'], name='careers_event_app'),
+            models.Index(fields=['changed_at'], name='careers_event_time'),
+        ]
+
+
+class ResumeText(models.Model):
+    """Plain text extracted from an application's resume by the background pipeline."""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('DONE', 'Extracted'),
+        ('FAILED', 'Failed'),
+    ]
+
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='resume_text')
+    content = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Resume text for {self.application_id} ({self.status})"
+
+
+class ResumeBlob(models.Model):
+    """Reference count for a content-addressed resume file shared by applications."""
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class ResumeUpload(models.Model):
+    """A resume being uploaded in chunks; the finished token is submitted with the application."""
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveIntegerField(help_text="Declared total size in bytes")
+    received = models.PositiveIntegerField(default=0, help_text="Bytes written so far")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes)"
+
+    @property
+    def is_complete(self):
+        return self.received == self.size
@@ -0,0 +1,178 @@
+"""
+TF-IDF ranking of a job's own applicants.
+
+The job (title, description and requirements) and every applicant (cover
+letter and extracted resume text) become sparse term vectors, plain
+``{term: weight}`` dicts with weight ``(1 + log tf) * idf``. IDF is taken
+over all job postings, so words every posting uses ("team", "management")
+count for little and the terms that set this job apart count for most. An
+applicant's ``match_score`` is the cosine similarity of the two vectors.
+
+The IDF table is frozen in an ``IDFSnapshot``: a new posting or an edit
+does not move it, so it does not touch other jobs' scores. A run rebuilds
+it only when it is older than ``IDF_MAX_AGE`` or the number of postings
+has drifted by more than ``IDF_MAX_DRIFT`` since (or on request), and
+each job records the snapshot version its scores use.
+
+Scores are cached on the application. A run only scores applications that
+have no score yet (new ones, or ones whose resume text was just extracted)
+in batches. A job whose title, description or requirements changed, or
+whose scores predate the current snapshot, has all its applicants
+rescored; new scores overwrite the old ones in place, so the best match
+sort stays usable while the rescore runs.
+"""
+import datetime
+import hashlib
+import math
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .search import tokenize
+from .talent import STOPWORDS
+
+# The IDF snapshot is rebuilt when it is this old...
+IDF_MAX_AGE = datetime.timedelta(days=7)
+# ...or the number of postings moved by more than this share of it
+IDF_MAX_DRIFT = 0.1
+
+
+class IDF:
+    """Inverse document frequencies over the job postings."""
+
+    def __init__(self, total, frequencies, version):
+        self.total = total
+        self.frequencies = frequencies
+        self.version = version
+
+    @classmethod
+    def from_jobs(cls):
+        """Count the document frequencies over every job posting now."""
+        from .models import Job
+
+        total = 0
+        frequencies = Counter()
+        for row in Job.objects.values_list('title', 'description', 'requirements').iterator():
+            total += 1
+            frequencies.update(set(tokenize(' '.join(row))))
+        # Digest of the counts, taken once: it changes whenever any weight would
+        digest = hashlib.sha1(str(total).encode())
+        for term, frequency in sorted(frequencies.items()):
+            digest.update(f' {term}:{frequency}'.encode())
+        return cls(total, frequencies, digest.hexdigest())
+
+    @classmethod
+    def current(cls, rebuild=False):
+        """The frozen snapshot, rebuilt (and saved) first if it is missing, stale or ``rebuild`` is set."""
+        from .models import IDFSnapshot, Job
+
+        snapshot = IDFSnapshot.objects.order_by('-created_at', '-id').first()
+        if snapshot is not None and not rebuild:
+            drift = abs(Job.objects.count() - snapshot.total)
+            if timezone.now() - snapshot.created_at < IDF_MAX_AGE and drift <= snapshot.total * IDF_MAX_DRIFT:
+                return cls(snapshot.total, Counter(snapshot.frequencies), snapshot.version)
+
+        idf = cls.from_jobs()
+        with transaction.atomic():
+            IDFSnapshot.objects.exclude(version=idf.version).delete()
+            IDFSnapshot.objects.update_or_create(
+                version=idf.version, defaults={'total': idf.total, 'frequencies': dict(idf.frequencies)},
+            )
+        return idf
+
+    def __getitem__(self, term):
+        # Smoothed, so unseen terms get the highest weight rather than a division by zero
+        return math.log((1 + self.total) / (1 + self.frequencies[term])) + 1
+
+
+def terms(text):
+    return [term for term in tokenize(text) if len(term) > 2 and term not in STOPWORDS]
+
+
+def term_vector(text, idf):
+    counts = Counter(terms(text))
+    return {term: (1 + math.log(count)) * idf[term] for term, count in counts.items()}
+
+
+def cosine(a, b):
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm
+
+
+def job_text(job):
+    return f'{job.title} {job.description} {job.requirements}'
+
+
+def job_match_query(job):
+    """Signature of the job text the scores depend on; a change invalidates them."""
+    return ' '.join(terms(job_text(job)))
+
+
+def unscored(applications):
+    """Applications still waiting for a score whose resume text is settled."""
+    return applications.filter(match_score=applications.model.UNSCORED).exclude(resume_text__status='PENDING')
+
+
+def score_job(job, idf, batch_size=500):
+    """
+    Score ``job``'s unscored applicants, or all of them if its text or the IDF changed.
+
+    Returns how many were scored.
+    """
+    from .models import Application, Job
+
+    query = job_match_query(job)
+    rescore = query != job.match_query or idf.version != job.match_idf
+    applications = Application.objects.filter(job=job)
+    if rescore:
+        pending = applications.exclude(resume_text__status='PENDING')
+    else:
+        pending = unscored(applications)
+
+    job_vector = term_vector(job_text(job), idf)
+    scored = 0
+    last_id = 0
+    while True:
+        rows = list(
+            pending.filter(pk__gt=last_id).order_by('id')
+            .values_list('id', 'cover_letter', 'resume_text__content')[:batch_size]
+        )
+        if not rows:
+            break
+        Application.objects.bulk_update([
+            Application(pk=app_id, match_score=cosine(job_vector, term_vector(f'{cover_letter} {resume or ""}', idf)))
+            for app_id, cover_letter, resume in rows
+        ], ['match_score'])
+        scored += len(rows)
+        last_id = rows[-1][0]
+
+    # Recorded last: a run cut short rescores the job again from the start
+    if rescore:
+        Job.objects.filter(pk=job.pk).update(match_query=query, match_idf=idf.version)
+        job.match_query, job.match_idf = query, idf.version
+    return scored
+
+
+def score_pending(batch_size=500, rebuild_idf=False):
+    """Score every unscored application (and rescore edited or outdated jobs); returns the number scored."""
+    from .models import Application, Job
+
+    idf = IDF.current(rebuild=rebuild_idf)
+    waiting = set(unscored(Application.objects.all()).values_list('job_id', flat=True).distinct())
+    jobs = (
+        Job.objects.filter(applications__isnull=False).distinct()
+        .only('id', 'title', 'description', 'requirements', 'match_query', 'match_idf')
+    )
+    scored = 0
+    for job in jobs:
+        if job.pk in waiting or job.match_idf != idf.version or job.match_query != job_match_query(job):
+            scored += score_job(job, idf, batch_size)
+    return scored
@@ -0,0 +1,129 @@
+"""
+Parsing of the free-text ``Job.salary_range`` into numeric bounds.
+
+Handles the formats HR actually types: ``"$45,000 - $65,000"``,
+``"USD 1500-2000 per month"``, ``"1.5k - 2.5k"``, ``"ZWG 12 000"``. Anything
+that cannot be read leaves the numeric fields empty, so such jobs simply
+drop out of salary-filtered searches. Bounds are only comparable within
+one currency, so salary filters go through ``salary_filter``.
+"""
+import re
+
+from django.conf import settings
+from django.db.models import Q
+
+CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '£': 'GBP',
+    '€': 'EUR',
+    'R': 'ZAR',
+}
+
+CURRENCY_CODES = {'USD', 'ZWG', 'ZWL', 'ZAR', 'GBP', 'EUR', 'BWP', 'ZMW'}
+
+MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+# Digits glued to a word ("Grade5") are not amounts unless the word is a currency (see _is_amount)
+AMOUNT_RE = re.compile(r'(?<![\d.])(\d{1,3}(?:[ ,]\d{3})+|\d+)(\.\d+)?\s*([kKmM])?(?!\w)')
+CODE_RE = re.compile(r'\b([A-Z]{3})(?![A-Z])')
+SYMBOL_RE = re.compile(r'([$£€]|\bR(?=\s?\d))')
+# A currency right before or after an amount: "$ 800", "USD800", "12 000 ZWG"
+PREFIX_RE = re.compile(r'(?:[$£€]|\bR|\b([A-Za-z]{3}))\s?$')
+SUFFIX_RE = re.compile(r'^\s?([A-Za-z]{3})\b')
+# What may sit between the two ends of a range
+RANGE_SEPARATOR_RE = re.compile(r'^\s*(?:-|–|—|to)\s*(?:[$£€]|[A-Za-z]{3})?\s*$', re.IGNORECASE)
+
+
+def parse_amount(digits, fraction, suffix):
+    value = int(re.sub(r'[ ,]', '', digits)) + float(fraction or 0)
+    return round(value * MULTIPLIERS.get((suffix or '').lower(), 1))
+
+
+def _is_currency_prefix(prefix):
+    return bool(prefix) and (prefix.group(1) is None or prefix.group(1).upper() in CURRENCY_CODES)
+
+
+def _is_amount(text, match):
+    """Whether the digits at ``match`` stand apart, or follow a currency ("USD800", "R15000")."""
+    before = text[match.start() - 1:match.start()]
+    if not before or not (before.isalnum() or before == '_'):
+        return True
+    return _is_currency_prefix(PREFIX_RE.search(text[:match.start()]))
+
+
+def _is_currency_marked(text, match):
+    """Whether the amount at ``match`` carries a currency or a k/m suffix."""
+    if match.group(3):
+        return True
+    if _is_currency_prefix(PREFIX_RE.search(text[:match.start()])):
+        return True
+    suffix = SUFFIX_RE.match(text[match.end():])
+    return bool(suffix and suffix.group(1).upper() in CURRENCY_CODES)
+
+
+def _salary_amounts(text):
+    """
+    The amount matches in ``text`` that describe pay.
+
+    When any amount is marked with a currency or a k/m suffix, bare numbers
+    ("Grade 5", "2 years") are ignored, except the other end of a marked
+    range ("$45,000 - 65,000").
+    """
+    matches = [match for match in AMOUNT_RE.finditer(text) if _is_amount(text, match)]
+    marked = [_is_currency_marked(text, match) for match in matches]
+    if any(marked):
+        for i in range(len(matches) - 1):
+            between = text[matches[i].end():matches[i + 1].start()]
+            if (marked[i] or marked[i + 1]) and RANGE_SEPARATOR_RE.match(between):
+                marked[i] = marked[i + 1] = True
+        matches = [match for match, keep in zip(matches, marked) if keep]
+    return [match for match in matches if parse_amount(*match.groups()) > 0]
+
+
+def detect_currency(text):
+    for code in CODE_RE.findall(text.upper()):
+        if code in CURRENCY_CODES:
+            return code
+    symbol = SYMBOL_RE.search(text)
+    if symbol:
+        return CURRENCY_SYMBOLS[symbol.group(1)]
+    return ''
+
+
+def parse_salary_range(text):
+    """Return ``(salary_min, salary_max, currency)`` parsed from ``text``."""
+    if not text:
+        return None, None, ''
+    matches = _salary_amounts(text)[:2]
+    if not matches:
+        return None, None, ''
+    amounts = [parse_amount(*match.groups()) for match in matches]
+    # "50 - 70k" means 50k - 70k: a bare low end takes the high end's k/m suffix, if that keeps it lower
+    if len(matches) == 2 and matches[1].group(3) and not matches[0].group(3):
+        scaled = parse_amount(*matches[0].groups()[:2], matches[1].group(3))
+        if scaled <= amounts[1]:
+            amounts[0] = scaled
+    return min(amounts), max(amounts), detect_currency(text)
+
+
+def default_currency():
+    """The currency salary filters assume when none is picked (``SALARY_CURRENCY``)."""
+    return getattr(settings, 'SALARY_CURRENCY', 'USD')
+
+
+def salary_filter(salary_min=None, salary_max=None, currency=''):
+    """
+    Q for jobs whose parsed pay band overlaps ``salary_min``-``salary_max`` in ``currency``.
+
+    ``currency`` defaults to the site currency, which also covers bands
+    posted without one.
+    """
+    currency = currency or default_currency()
+    condition = Q(salary_currency=currency)
+    if currency == default_currency():
+        condition |= Q(salary_currency='')
+    if salary_min:
+        condition &= Q(salary_max__gte=salary_min)
+    if salary_max:
+        condition &= Q(salary_min__lte=salary_max)
+    return condition
@@ -0,0 +1,49 @@
+"""
+Full-text search for the public job board and extracted resume text.
+
+On SQLite the searchable (active) jobs are mirrored into an FTS5 table,
+``careers_job_fts``, and ranked with bm25 so that title hits outrank
+requirement and description hits. Extracted resume text lives in
+``careers_resume_fts``, keyed by application id, and the talent pool
+matcher ranks past applicants through ``careers_applicant_fts`` (cover
+letter and resume, stemmed). The HR application search goes through
+``careers_application_fts``, a trigram index over each applicant's name,
+email, phone, notes and job title. Each index has its own module (jobs,
+resumes, applicants, applications); the backends below combine them.
+Other databases fall back to plain ``icontains`` scans. The backend can be
+swapped with the ``CAREERS_SEARCH_BACKEND`` setting (a dotted path to a
+backend class).
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .applicants import SimpleApplicantIndex, SQLiteApplicantIndex
+from .applications import SQLiteApplicationIndex
+from .base import BaseSearchBackend, tokenize
+from .jobs import SimpleJobIndex, SQLiteJobIndex
+from .resumes import SimpleResumeIndex, SQLiteResumeIndex
+
+class SimpleSearchBackend(SimpleJobIndex, SimpleResumeIndex, SimpleApplicantIndex, BaseSearchBackend):
+    """Unindexed fallback: plain ``icontains`` scans for every search."""
+
+
+class SQLiteFTSBackend(SQLiteJobIndex, SQLiteResumeIndex, SQLiteApplicantIndex, SQLiteApplicationIndex, BaseSearchBackend):
+    """SQLite FTS5 indexes with bm25 ranking and prefix matching."""
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    backend_path = getattr(settings, 'CAREERS_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTSBackend()
+    return SimpleSearchBackend()
+
+
+def search_jobs(queryset, query):
+    """Filter ``queryset`` by a free-text query, best matches first."""
+    return get_search_backend().search(queryset, query)
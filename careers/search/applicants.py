@@ -0,0 +1,96 @@
+"""
+The applicant index: past applicants' cover letters and resumes, ranked by
+the talent pool matcher (careers.talent).
+
+On SQLite it is ``careers_applicant_fts`` (cover letter and resume, stemmed).
+"""
+from django.db import connection
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When, Window
+from django.db.models.functions import Lower, RowNumber
+
+from .base import delete_rowids
+
+
+class SimpleApplicantIndex:
+    def rank_applicants(self, terms, exclude_job_id, after_id, through_id, limit):
+        from ..models import Application
+
+        if not terms:
+            return []
+        # Score is the number of terms found in the cover letter or resume
+        score = sum(
+            (Case(
+                When(Q(cover_letter__icontains=term) | Q(resume_text__content__icontains=term), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ) for term in terms),
+            Value(0),
+        )
+        applied = Application.objects.filter(job_id=exclude_job_id, email__iexact=OuterRef('email'))
+        rows = (
+            Application.objects
+            .filter(pk__gt=after_id, pk__lte=through_id)
+            .exclude(Exists(applied))
+            .annotate(talent_score=score)
+            .filter(talent_score__gt=0)
+            # Each person's best application only
+            .annotate(person_rank=Window(
+                RowNumber(), partition_by=Lower('email'), order_by=[F('talent_score').desc(), F('id').asc()],
+            ))
+            .filter(person_rank=1)
+            .order_by('-talent_score', 'id')
+            .values_list('id', 'talent_score')[:limit]
+        )
+        return [(app_id, float(score)) for app_id, score in rows]
+
+
+class SQLiteApplicantIndex:
+    applicant_table = 'careers_applicant_fts'
+    # bm25 column weights: cover_letter, resume
+    applicant_weights = (1.0, 2.0)
+
+    def index_applicants(self, rows):
+        rows = [(app_id, cover_letter or '', resume or '') for app_id, cover_letter, resume in rows]
+        if not rows:
+            return
+        self.remove_applicants([app_id for app_id, _, _ in rows])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.applicant_table} (rowid, cover_letter, resume) VALUES (%s, %s, %s)',
+                [row for row in rows if row[1] or row[2]],
+            )
+
+    def remove_applicants(self, application_ids):
+        delete_rowids(self.applicant_table, application_ids)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.applicant_table}')
+            cursor.execute(
+                f'INSERT INTO {self.applicant_table} (rowid, cover_letter, resume) '
+                f'SELECT a.id, a.cover_letter, r.content FROM careers_application a '
+                f"JOIN careers_resumetext r ON r.application_id = a.id WHERE r.status != 'PENDING'"
+            )
+        super().rebuild()
+
+    def rank_applicants(self, terms, exclude_job_id, after_id, through_id, limit):
+        if not terms:
+            return []
+        match = ' OR '.join(f'"{term}"' for term in terms)
+        weights = ', '.join(str(w) for w in self.applicant_weights)
+        # The rowid range keeps each call to one window of the index; bm25 is read in the
+        # innermost query (it needs the MATCH), then each person keeps their best application
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id, score FROM ('
+                f'  SELECT r.id, r.score, ROW_NUMBER() OVER ('
+                f'    PARTITION BY lower(a.email) ORDER BY r.score DESC, r.id'
+                f'  ) AS n FROM ('
+                f'    SELECT rowid AS id, -bm25({self.applicant_table}, {weights}) AS score FROM {self.applicant_table} '
+                f'    WHERE {self.applicant_table} MATCH %s AND rowid > %s AND rowid <= %s'
+                f'  ) r JOIN careers_application a ON a.id = r.id '
+                f'  WHERE lower(a.email) NOT IN (SELECT lower(email) FROM careers_application WHERE job_id = %s)'
+                f') WHERE n = 1 ORDER BY score DESC, id LIMIT %s',
+                [match, after_id, through_id, exclude_job_id, limit],
+            )
+            return cursor.fetchall()
@@ -0,0 +1,94 @@
+"""
+The application index: the HR portal's search over each applicant's name,
+email, phone, notes and job title.
+
+On SQLite 3.34+ it is ``careers_application_fts``, a trigram index, so
+substring queries like ``"mith"`` or ``"772 12"`` are index lookups rather
+than table scans. Elsewhere the base ``icontains`` filter is used.
+"""
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .base import delete_rowids
+
+
+class SQLiteApplicationIndex:
+    application_table = 'careers_application_fts'
+    # Trigrams can't match anything shorter
+    min_substring = 3
+    batch_size = 500
+
+    # Phones are stored as typed and as bare digits, so "0772123456" finds "0772 123 456"
+    application_rows_sql = (
+        '(rowid, full_name, email, phone, notes, job_title) '
+        'SELECT a.id, a.full_name, a.email, '
+        "a.phone || ' ' || replace(replace(replace(replace(replace(a.phone, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), "
+        'a.notes, j.title FROM careers_application a JOIN careers_job j ON j.id = a.job_id'
+    )
+
+    # Set once the table is known to exist (it is never dropped while the site runs)
+    application_index_ready = False
+
+    def has_trigram_tokenizer(self):
+        """
+        Whether the trigram index can be used: SQLite 3.34+ and the table in place.
+
+        The table is created by a migration only if the SQLite that ran it was
+        new enough; after an upgrade, rebuild() creates it.
+        """
+        if connection.Database.sqlite_version_info < (3, 34, 0):
+            return False
+        if not self.application_index_ready:
+            self.application_index_ready = self.application_table in connection.introspection.table_names()
+        return self.application_index_ready
+
+    def rebuild(self):
+        if connection.Database.sqlite_version_info >= (3, 34, 0):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.application_table} USING fts5('
+                    f"full_name, email, phone, notes, job_title, tokenize='trigram')"
+                )
+                cursor.execute(f'DELETE FROM {self.application_table}')
+                cursor.execute(f'INSERT INTO {self.application_table} {self.application_rows_sql}')
+            self.application_index_ready = True
+        super().rebuild()
+
+    def index_applications(self, application_ids):
+        if not self.has_trigram_tokenizer():
+            return
+        application_ids = list(application_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(application_ids), self.batch_size):
+                batch = application_ids[start:start + self.batch_size]
+                placeholders = ', '.join(['%s'] * len(batch))
+                cursor.execute(f'DELETE FROM {self.application_table} WHERE rowid IN ({placeholders})', batch)
+                cursor.execute(
+                    f'INSERT INTO {self.application_table} {self.application_rows_sql} WHERE a.id IN ({placeholders})',
+                    batch,
+                )
+
+    def remove_applications(self, application_ids):
+        if self.has_trigram_tokenizer():
+            delete_rowids(self.application_table, application_ids)
+
+    def retitle_applications(self, job):
+        if not self.has_trigram_tokenizer():
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {self.application_table} SET job_title = %s '
+                f'WHERE rowid IN (SELECT id FROM careers_application WHERE job_id = %s) AND job_title != %s',
+                [job.title, job.pk, job.title],
+            )
+
+    def application_filter(self, query):
+        query = query.strip()
+        if len(query) < self.min_substring or not self.has_trigram_tokenizer():
+            return super().application_filter(query)
+        # One quoted phrase: a case-insensitive substring match within any column
+        match = '"{}"'.format(query.replace('"', '""'))
+        return Q(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.application_table} WHERE {self.application_table} MATCH %s', [match],
+        ))
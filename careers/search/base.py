@@ -0,0 +1,99 @@
+"""
+The search backend interface and the helpers the index modules share.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split free text into lowercase search terms."""
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+def prefix_match(query):
+    """An FTS5 query with each term quoted and made a prefix match: ``"data"* "analy"*``."""
+    return ' '.join(f'"{term}"*' for term in tokenize(query))
+
+
+def delete_rowids(table, rowids):
+    """Delete the rows with the given rowids from an FTS table."""
+    rowids = list(rowids)
+    if not rowids:
+        return
+    placeholders = ', '.join(['%s'] * len(rowids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid IN ({placeholders})', rowids)
+
+
+class BaseSearchBackend:
+    """Interface every job search backend implements."""
+
+    def index_job(self, job):
+        """Add or refresh a job in the index (or drop it if no longer searchable)."""
+
+    def remove_jobs(self, job_ids):
+        """Drop the given job ids from the index."""
+
+    def rebuild(self):
+        """Rebuild the indexes from the Job and ResumeText tables."""
+
+    def search(self, queryset, query):
+        """
+        Return ``queryset`` narrowed to ``query`` and ordered by relevance.
+
+        Results carry a numeric ``search_rank`` annotation (lower is better)
+        that depends only on the query and the job, not on its position in
+        the results, so callers can paginate on ``(search_rank, id)``.
+        """
+        raise NotImplementedError
+
+    def index_resumes(self, rows):
+        """Store ``(application_id, text)`` pairs in the resume index."""
+
+    def remove_resumes(self, application_ids):
+        """Drop the given applications from the resume index."""
+
+    def resume_filter(self, query):
+        """Return a Q object matching applications whose resume text contains ``query``."""
+        raise NotImplementedError
+
+    def index_applicants(self, rows):
+        """Store ``(application_id, cover_letter, resume_text)`` rows in the applicant index."""
+
+    def remove_applicants(self, application_ids):
+        """Drop the given applications from the applicant index."""
+
+    def rank_applicants(self, terms, exclude_job_id, after_id, through_id, limit):
+        """
+        Return up to ``limit`` ``(application_id, score)`` pairs, best first.
+
+        Only applications with ``after_id < id <= through_id`` are scored,
+        and only those of people (by email) who have not applied to
+        ``exclude_job_id``; any of ``terms`` may match. Each person appears
+        once, with their best-scoring application.
+        """
+        raise NotImplementedError
+
+    def index_applications(self, application_ids):
+        """Refresh the given applications' name, contact, notes and job title in the application index."""
+
+    def remove_applications(self, application_ids):
+        """Drop the given applications from the application index."""
+
+    def retitle_applications(self, job):
+        """Update the job title stored with ``job``'s applications."""
+
+    def application_filter(self, query):
+        """Return a Q object matching applications whose name, email, phone, notes or job title contain ``query``."""
+        query = query.strip()
+        return (
+            Q(full_name__icontains=query) |
+            Q(email__icontains=query) |
+            Q(phone__icontains=query) |
+            Q(notes__icontains=query) |
+            Q(job__title__icontains=query)
+        )
@@ -0,0 +1,32 @@
+"""
+ORM support for querying SQLite FTS5 tables through unmanaged models.
+
+An FTS5 table has a hidden column named after the table itself. Mapped as
+an ``FTSDocumentField`` it takes the ``match`` lookup (``MATCH``) and is
+the first argument of ``BM25``, so an index can be joined and ranked like
+any other related table.
+"""
+from django.db import models
+
+
+class FTSDocumentField(models.TextField):
+    """The hidden, table-named column of an FTS5 table."""
+
+
+@FTSDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+class BM25(models.Func):
+    """bm25 rank of the current match (lower is better), with optional per-column weights."""
+    function = 'bm25'
+    output_field = models.FloatField()
+
+    def __init__(self, document, *weights):
+        super().__init__(document, *(models.Value(float(weight)) for weight in weights))
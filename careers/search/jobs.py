@@ -0,0 +1,72 @@
+"""
+The job index: the public job board's search, ranked by relevance.
+
+On SQLite the active jobs are mirrored into ``careers_job_fts`` (title,
+description, requirements) and ranked with bm25, title hits first. The
+index is joined through the unmanaged ``JobSearchIndex`` model.
+"""
+from django.db import connection
+from django.db.models import IntegerField, Q, Value
+
+from .base import delete_rowids, prefix_match, tokenize
+from .fts import BM25
+
+
+class SimpleJobIndex:
+    """Unindexed fallback: every term must appear in title, description or requirements."""
+
+    def search(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) |
+                Q(description__icontains=term) |
+                Q(requirements__icontains=term)
+            )
+        return queryset.annotate(search_rank=Value(0, output_field=IntegerField()))
+
+
+class SQLiteJobIndex:
+    """FTS5 job index with bm25 ranking and prefix matching."""
+
+    table = 'careers_job_fts'
+    # bm25 column weights, in table column order: title, description, requirements
+    weights = (10.0, 1.0, 2.0)
+
+    def index_job(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            if job.is_active:
+                cursor.execute(
+                    f'INSERT INTO {self.table} (rowid, title, description, requirements) '
+                    f'VALUES (%s, %s, %s, %s)',
+                    [job.pk, job.title, job.description, job.requirements],
+                )
+
+    def remove_jobs(self, job_ids):
+        delete_rowids(self.table, job_ids)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, description, requirements) '
+                f'SELECT id, title, description, requirements FROM careers_job WHERE is_active'
+            )
+        super().rebuild()
+
+    def search(self, queryset, query):
+        match = prefix_match(query)
+        if not match:
+            return queryset.none()
+
+        # Join the index rather than take a capped list of ids: every match stays in
+        # the queryset (so facets and later pages see all of them) and bm25 is read
+        # off the same index scan
+        return (
+            queryset.filter(search_index__document__match=match)
+            .annotate(search_rank=BM25('search_index__document', *self.weights))
+            .order_by('search_rank', '-id')
+        )
@@ -0,0 +1,50 @@
+"""
+The resume index: extracted resume text, searched from the HR portal.
+
+On SQLite it is ``careers_resume_fts``, keyed by application id.
+"""
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .base import delete_rowids, prefix_match
+
+
+class SimpleResumeIndex:
+    def resume_filter(self, query):
+        return Q(resume_text__content__icontains=query)
+
+
+class SQLiteResumeIndex:
+    resume_table = 'careers_resume_fts'
+
+    def index_resumes(self, rows):
+        rows = [(app_id, text) for app_id, text in rows]
+        if not rows:
+            return
+        self.remove_resumes([app_id for app_id, _ in rows])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.resume_table} (rowid, content) VALUES (%s, %s)',
+                [(app_id, text) for app_id, text in rows if text],
+            )
+
+    def remove_resumes(self, application_ids):
+        delete_rowids(self.resume_table, application_ids)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.resume_table}')
+            cursor.execute(
+                f'INSERT INTO {self.resume_table} (rowid, content) '
+                f"SELECT application_id, content FROM careers_resumetext WHERE status = 'DONE' AND content != ''"
+            )
+        super().rebuild()
+
+    def resume_filter(self, query):
+        match = prefix_match(query)
+        if not match:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(
+            f'SELECT rowid FROM {self.resume_table} WHERE {self.resume_table} MATCH %s', [match],
+        ))
@@ -0,0 +1,122 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_version, job_namespace
+from .history import Transition, record_status_changes
+from .models import Application, Candidate, Job, Location, ResumeText
+from .search import get_search_backend
+from .stats import record_change
+from .storage import acquire_resume, release_resume
+from .talent import match_saved_job
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, created, **kwargs):
+    backend = get_search_backend()
+    backend.index_job(instance)
+    if not created:
+        backend.retitle_applications(instance)
+    bump_version('jobs')
+    bump_version(job_namespace(instance.pk))
+    match_saved_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    get_search_backend().remove_jobs([instance.pk])
+    bump_version('jobs')
+    bump_version(job_namespace(instance.pk))
+
+
+@receiver(post_save, sender=Location)
+def refresh_location_jobs(sender, instance, created, **kwargs):
+    # Cards, job pages and the location facet all show the name
+    if created:
+        return
+    for job_id in Job.objects.filter(location=instance).values_list('id', flat=True):
+        bump_version(job_namespace(job_id))
+    bump_version('jobs')
+
+
+@receiver(pre_save, sender=Application)
+def link_candidate(sender, instance, **kwargs):
+    # Only new applications; existing rows are linked by the backfill_candidates command
+    if instance._state.adding and instance.candidate_id is None:
+        instance.candidate = Candidate.objects.for_applicant(instance.email, instance.phone, instance.full_name)
+
+
+@receiver(pre_save, sender=Application)
+def track_resume_change(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    instance._previous_resume = loaded.get('resume')
+
+
+@receiver(post_save, sender=Application)
+def handle_resume_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_resume', None)
+    current = instance.resume.name
+    instance._loaded_values = {**getattr(instance, '_loaded_values', {}), 'resume': current}
+
+    # Text extraction is only queued here; the extract_resumes worker does the parsing
+    if created:
+        acquire_resume(current)
+        ResumeText.objects.create(application=instance)
+    elif previous is not None and previous != current:
+        acquire_resume(current)
+        release_resume(previous)
+        ResumeText.objects.update_or_create(
+            application=instance,
+            defaults={'status': 'PENDING', 'content': '', 'error': '', 'extracted_at': None},
+        )
+
+
+def _stored_counter_key(instance):
+    # Read from the row, not the instance, which may predate a bulk update
+    return Application.objects.filter(pk=instance.pk).values_list('job_id', 'status').first()
+
+
+@receiver(pre_save, sender=Application)
+def track_counter_key(sender, instance, **kwargs):
+    instance._previous_counter_key = None if instance._state.adding else _stored_counter_key(instance)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_counter_key', None)
+    current = (instance.job_id, instance.status)
+    if previous != current:
+        record_change(previous, current)
+
+
+@receiver(post_save, sender=Application)
+def record_status_event(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_counter_key', None)
+    if previous is None and not created:
+        return
+    old_status = previous[1] if previous else ''
+    record_status_changes([Transition(
+        instance.pk, instance.job_id, old_status, instance.status,
+        instance.applied_at, timezone.now(), instance.reviewed_by_id,
+    )])
+
+
+@receiver(post_save, sender=Application)
+def index_application(sender, instance, **kwargs):
+    get_search_backend().index_applications([instance.pk])
+
+
+@receiver(pre_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    key = _stored_counter_key(instance)
+    if key is not None:
+        record_change(key, None)
+
+
+@receiver(post_delete, sender=Application)
+def release_resume_reference(sender, instance, **kwargs):
+    release_resume(instance.resume.name)
+    backend = get_search_backend()
+    backend.remove_resumes([instance.pk])
+    backend.remove_applicants([instance.pk])
+    backend.remove_applications([instance.pk])
@@ -0,0 +1,80 @@
+"""
+Per-job, per-status application counters.
+
+``ApplicationStats`` holds one ``(job, status, count)`` row per pair, kept
+in step with the Application table inside the same transaction: the
+Application signals cover create, status/job changes and deletes, and
+``ApplicationQuerySet.update`` covers bulk updates such as the admin
+actions. Dashboards read these few rows instead of counting applications.
+``rebuild_application_stats`` recomputes them from scratch.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+
+def apply_deltas(deltas):
+    """Apply ``{(job_id, status): delta}`` to the counters."""
+    from .models import ApplicationStats
+
+    for (job_id, status), delta in deltas.items():
+        if not delta:
+            continue
+        updated = ApplicationStats.objects.filter(job_id=job_id, status=status).update(count=F('count') + delta)
+        # A missing row can only gain applications; a decrement with no row means
+        # the job itself is being deleted along with its counters
+        if updated or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                ApplicationStats.objects.create(job_id=job_id, status=status, count=delta)
+        except IntegrityError:
+            ApplicationStats.objects.filter(job_id=job_id, status=status).update(count=F('count') + delta)
+
+
+def record_change(old, new):
+    """Move one application from the ``(job_id, status)`` pair ``old`` to ``new`` (either may be None)."""
+    deltas = Counter()
+    if old is not None:
+        deltas[old] -= 1
+    if new is not None:
+        deltas[new] += 1
+    apply_deltas(deltas)
+
+
+def recount(job_ids=None):
+    """Recompute the counters for ``job_ids`` (every job if None) from the Application table."""
+    from .models import Application, ApplicationStats
+
+    applications = Application.objects.all()
+    stats = ApplicationStats.objects.all()
+    if job_ids is not None:
+        job_ids = list(job_ids)
+        applications = applications.filter(job_id__in=job_ids)
+        stats = stats.filter(job_id__in=job_ids)
+
+    rows = applications.order_by().values('job_id', 'status').annotate(total=Count('id'))
+    with transaction.atomic():
+        stats.delete()
+        ApplicationStats.objects.bulk_create(
+            ApplicationStats(job_id=row['job_id'], status=row['status'], count=row['total']) for row in rows
+        )
+
+
+def status_counts(job=None):
+    """
+    Return ``{'total': n, 'pending': n, 'reviewed': n, ...}`` from the counters.
+
+    Covers one job, or every job when ``job`` is None.
+    """
+    from .models import Application, ApplicationStats
+
+    stats = ApplicationStats.objects.all()
+    if job is not None:
+        stats = stats.filter(job=job)
+    totals = dict(stats.order_by().values_list('status').annotate(total=Sum('count')))
+
+    counts = {code.lower(): totals.get(code, 0) for code, _ in Application.STATUS_CHOICES}
+    counts['total'] = sum(totals.values())
+    return counts
@@ -0,0 +1,99 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+Resumes are named by the SHA-256 of their bytes and sharded two levels
+deep (``resumes/3f/a2/3fa2….pdf``) so no single directory grows without
+bound. Identical uploads resolve to the same file; ``ResumeBlob`` counts
+how many applications point at each file and the bytes are removed when
+the last one is deleted.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+CONTENT_NAME_RE = re.compile(r'^(?P<prefix>.*/)?[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$')
+
+
+class ResumeStorage(FileSystemStorage):
+    """Filesystem storage that names files by content hash and skips duplicate writes."""
+
+    def __init__(self, **kwargs):
+        # Rewriting a content-addressed file can only write the same bytes
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, hexdigest[:2], hexdigest[2:4], hexdigest + extension)
+
+    def _save(self, name, content):
+        name = self.content_name(name, content)
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+
+resume_storage = ResumeStorage()
+
+
+def get_resume_storage():
+    return resume_storage
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_NAME_RE.match(name or ''))
+
+
+def acquire_resume(name):
+    """Record one more application referencing the stored resume ``name``."""
+    from .models import ResumeBlob
+
+    if not name:
+        return
+    updated = ResumeBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+    if not updated:
+        blob, created = ResumeBlob.objects.get_or_create(
+            name=name,
+            defaults={'ref_count': 1, 'size': _size_or_zero(name)},
+        )
+        if not created:
+            ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+
+def release_resume(name):
+    """Drop one reference to ``name``; delete the file once nothing points at it."""
+    from .models import ResumeBlob
+
+    if not name:
+        return
+    with transaction.atomic():
+        ResumeBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        orphaned = ResumeBlob.objects.select_for_update().filter(name=name, ref_count=0)
+        if orphaned.exists():
+            orphaned.delete()
+            transaction.on_commit(lambda: _delete_if_unreferenced(name))
+
+
+def _delete_if_unreferenced(name):
+    from .models import ResumeBlob
+
+    # A new upload of the same bytes may have re-acquired the file meanwhile
+    if not ResumeBlob.objects.filter(name=name).exists():
+        resume_storage.delete(name)
+
+
+def _size_or_zero(name):
+    try:
+        return resume_storage.size(name)
+    except OSError:
+        return 0
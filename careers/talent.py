@@ -0,0 +1,145 @@
+"""
+Talent pool rematching: surface strong past applicants for a new job.
+
+Every application's cover letter and extracted resume text is kept in an
+applicant term index (filled by the resume extraction worker). The
+``match_talent_pool`` command ranks that index against each active job's
+title and requirements and stores the best ``TALENT_POOL_SIZE`` people on
+the job as ``TalentMatch`` rows. A new job, or one whose title or
+requirements changed, is also matched as soon as it is saved.
+
+Scoring is incremental: each job remembers the highest application id it
+has scored (``talent_pool_through``), so a run only scores applications
+that arrived since, in id windows of ``batch_size``, and merges them into
+the existing shortlist. Editing a job's requirements starts it over. Each
+person (by email) is shortlisted once, and never for a job they have
+already applied to.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Max, Min
+from django.db.models.functions import Lower
+
+from .search import get_search_backend, tokenize
+
+logger = logging.getLogger(__name__)
+
+TALENT_POOL_SIZE = 25
+MAX_QUERY_TERMS = 40
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it of on or our that the their this to was were
+    will with you your we who able ability must should strong good excellent experience years year
+    knowledge skills skill working work plus least degree preferred required etc
+""".split())
+
+
+def requirement_terms(job):
+    """The distinct, meaningful words of a job's title and requirements."""
+    terms = [
+        term for term in tokenize(f'{job.title} {job.requirements}')
+        if len(term) > 2 and not term.isdigit() and term not in STOPWORDS
+    ]
+    return list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+
+
+def indexed_through():
+    """Highest application id up to which every application is in the applicant index."""
+    from .models import Application, ResumeText
+
+    pending = ResumeText.objects.filter(status='PENDING').aggregate(first=Min('application_id'))['first']
+    if pending is not None:
+        return pending - 1
+    return Application.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def _best_per_person(job, scores):
+    """Keep each candidate's highest-scoring application, best first, leaving out the job's applicants."""
+    from .models import Application
+
+    emails = {
+        app_id: email.lower()
+        for app_id, email in Application.objects.filter(pk__in=scores).values_list('id', 'email')
+    }
+    applied = set(
+        Application.objects.annotate(key=Lower('email'))
+        .filter(job=job, key__in=set(emails.values()) - {''})
+        .values_list('key', flat=True)
+    )
+    best = {}
+    for app_id, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+        email = emails.get(app_id, '')
+        if email not in applied:
+            best.setdefault(email or app_id, (app_id, score))
+    return list(best.values())[:TALENT_POOL_SIZE]
+
+
+def match_job(job, through, batch_size=50_000):
+    """Score applications up to ``through`` against ``job`` and store its shortlist."""
+    from .models import Job, TalentMatch
+
+    backend = get_search_backend()
+    terms = requirement_terms(job)
+    query = ' '.join(terms)
+
+    if query == job.talent_pool_query:
+        start = job.talent_pool_through
+        scores = dict(TalentMatch.objects.filter(job=job).values_list('application_id', 'score'))
+    else:
+        start, scores = 0, {}
+
+    while start < through:
+        end = min(start + batch_size, through)
+        scores.update(backend.rank_applicants(terms, job.pk, start, end, TALENT_POOL_SIZE))
+        start = end
+
+    shortlist = _best_per_person(job, scores)
+    with transaction.atomic():
+        TalentMatch.objects.filter(job=job).delete()
+        TalentMatch.objects.bulk_create(
+            TalentMatch(job=job, application_id=app_id, score=score) for app_id, score in shortlist
+        )
+        # Bypass save() so the search index and page caches are left alone
+        Job.objects.filter(pk=job.pk).update(talent_pool_query=query, talent_pool_through=through)
+    return len(shortlist)
+
+
+def is_stale(job):
+    """Whether ``job``'s shortlist was scored for other terms than its title and requirements now give."""
+    return job.talent_pool_query != ' '.join(requirement_terms(job))
+
+
+def match_saved_job(job):
+    """Shortlist a new or re-worded active job once the save commits, rather than at the next poll."""
+    if job.is_active and is_stale(job):
+        transaction.on_commit(lambda: _match_now(job.pk))
+
+
+def _match_now(job_id):
+    from .models import Job
+
+    job = Job.objects.filter(pk=job_id, is_active=True).first()
+    if job is None:
+        return
+    try:
+        match_job(job, indexed_through())
+    except Exception:
+        # The match_talent_pool worker picks the job up on its next poll
+        logger.exception('Talent pool match for job %s failed', job_id)
+
+
+def match_pending(batch_size=50_000):
+    """Bring every active job's shortlist up to date; returns the number of jobs rescored."""
+    from .models import Job
+
+    through = indexed_through()
+    jobs = Job.objects.filter(is_active=True).only(
+        'id', 'title', 'requirements', 'talent_pool_query', 'talent_pool_through',
+    )
+    matched = 0
+    for job in jobs.iterator():
+        if is_stale(job) or job.talent_pool_through < through:
+            match_job(job, through, batch_size)
+            matched += 1
+    return matched
@@ -1,3 +1,622 @@
-from django.test import TestCase
+import datetime
+import io
+import re
+import tempfile
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .durations import duration_percentiles, fold_pending, rebuild
+from .extraction import process_pending
+from .facets import get_job_facets
+from .models import (
+    Application, ApplicationStatusEvent, Candidate, DurationSketch, Job, Location, ResumeBlob, ResumeText, ResumeUpload,
+)
+from .ranking import score_pending
+from .salary import parse_salary_range
+from .stats import status_counts
+from .search import SimpleSearchBackend, SQLiteFTSBackend, get_search_backend, search_jobs
+from .storage import is_content_addressed, resume_storage
+from .talent import requirement_terms
+from .uploads import UploadError, start_upload, write_chunk
+
+
+class ParseSalaryRangeTests(SimpleTestCase):
+    def test_formats(self):
+        cases = {
+            '$45,000 - $65,000': (45000, 65000, 'USD'),
+            'USD 1500-2000 per month': (1500, 2000, 'USD'),
+            '50k - 70k': (50000, 70000, ''),
+            '50 - 70k': (50000, 70000, ''),
+            'ZWG 12 000': (12000, 12000, 'ZWG'),
+            'negotiable': (None, None, ''),
+            '$800 - $1,000': (800, 1000, 'USD'),
+            'USD 500 - 1000': (500, 1000, 'USD'),
+            '500-1000': (500, 1000, ''),
+            '800 - 1k': (800, 1000, ''),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary_range(text), expected)
+
+    def test_fractions_are_multiplied_in(self):
+        self.assertEqual(parse_salary_range('1.5k - 2.5k'), (1500, 2500, ''))
+        self.assertEqual(parse_salary_range('1.5 - 2.5k'), (1500, 2500, ''))
+        self.assertEqual(parse_salary_range('$1.2m'), (1200000, 1200000, 'USD'))
+
+    def test_bare_numbers_ignored_next_to_currency_amounts(self):
+        self.assertEqual(parse_salary_range('Grade 5, USD 800'), (800, 800, 'USD'))
+        self.assertEqual(parse_salary_range('2 years experience, $3,000 per month'), (3000, 3000, 'USD'))
+
+    def test_currency_glued_to_the_amount(self):
+        cases = {
+            'USD800': (800, 800, 'USD'),
+            'R15000 - R20000': (15000, 20000, 'ZAR'),
+            'ZAR5,000 to 7,000': (5000, 7000, 'ZAR'),
+            'Grade5 role': (None, None, ''),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary_range(text), expected)
+
+    def test_unmarked_end_of_marked_range_is_kept(self):
+        self.assertEqual(parse_salary_range('$45,000 - 65,000'), (45000, 65000, 'USD'))
+
+
+@override_settings(SALARY_CURRENCY='USD')
+class LocationResolveTests(TestCase):
+    def test_spellings_resolve_to_one_location(self):
+        harare = Location.objects.resolve('Harare, Zimbabwe')
+        self.assertEqual((harare.name, harare.region), ('Harare', 'Zimbabwe'))
+        self.assertEqual(Location.objects.resolve('  harare '), harare)
+        with self.assertNumQueries(1):
+            self.assertEqual(Location.objects.resolve('HARARE, zimbabwe'), harare)
+        self.assertIsNone(Location.objects.resolve(' , '))
+        self.assertEqual(Location.objects.count(), 1)
+
+    def test_location_filter_uses_the_foreign_key(self):
+        harare = Location.objects.resolve('Harare')
+        Job.objects.create(title='Clerk', location=harare, description='d', requirements='r')
+        Job.objects.create(title='Driver', location=Location.objects.resolve('Mutare'), description='d', requirements='r')
+        response = self.client.get(reverse('careers:job_list'), {'location': harare.pk})
+        self.assertContains(response, 'Clerk')
+        self.assertNotContains(response, 'Driver')
+
+
+class SalaryCurrencyFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        location = Location.objects.resolve('Harare')
+        cls.usd = Job.objects.create(
+            title='Analyst', location=location, description='d', requirements='r', salary_range='$60,000 - $70,000',
+        )
+        cls.zwl = Job.objects.create(
+            title='Clerk', location=location, description='d', requirements='r', salary_range='ZWL 500,000',
+        )
+
+    def titles(self, **params):
+        response = self.client.get('/careers/', params)
+        return {job.title for job in response.context['page']}
+
+    def test_salary_filter_defaults_to_site_currency(self):
+        self.assertEqual(self.titles(salary_min=50000), {'Analyst'})
+
+    def test_salary_filter_in_other_currency(self):
+        self.assertEqual(self.titles(salary_min=50000, currency='zwl'), {'Clerk'})
+
+
+class SearchFeedCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.location = Location.objects.resolve('Harare')
+        # Equal-length texts, so a new posting moves every bm25 score (through the
+        # term's IDF) without changing the order of the ones already there
+        for i in range(30):
+            cls.add_job(f'Keeper {i}', ['zebra'] * (i % 5 + 1) + ['stripes'] * (4 - i % 5))
+        for i in range(40):
+            cls.add_job(f'Ranger {i}', ['giraffe'] * 5)
+
+    @classmethod
+    def add_job(cls, title, words):
+        return Job.objects.create(title=title, location=cls.location, requirements='r', description=' '.join(words))
+
+    def feed(self, cursor=None):
+        params = {'q': 'zebra'}
+        if cursor:
+            params['cursor'] = cursor
+        return self.client.get('/careers/feed/', params).json()
+
+    def titles(self, page):
+        return re.findall(r'<h3>(Keeper \w+)</h3>', page['html'])
+
+    def test_jobs_added_between_pages_neither_repeat_nor_skip(self):
+        first = self.feed()
+        self.add_job('Keeper new', ['zebra'] * 5)
+        self.add_job('Ranger new', ['giraffe'] * 5)
+        seen = self.titles(first)
+        page = first
+        while page['has_next']:
+            page = self.feed(page['next_cursor'])
+            seen += self.titles(page)
+        # The new posting ranks first, above the cursor, so it only shows up on a fresh search
+        self.assertEqual(seen, list(dict.fromkeys(seen)))
+        self.assertEqual(set(seen), {f'Keeper {i}' for i in range(30)})
+
+
+class JobSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        location = Location.objects.resolve('Harare')
+        for title, description in [
+            ('Clerk', 'Supports the analytics team'),
+            ('Data Analyst', 'Reporting'),
+            ('Driver', 'Deliveries'),
+        ]:
+            Job.objects.create(title=title, location=location, description=description, requirements='r')
+        Job.objects.create(title='Analyst Intern', location=location, description='d', requirements='r', is_active=False)
+
+    def test_prefix_terms_rank_title_hits_first(self):
+        jobs = search_jobs(Job.objects.all(), 'analy')
+        self.assertEqual([job.title for job in jobs], ['Data Analyst', 'Clerk'])
+        self.assertLess(jobs[0].search_rank, jobs[1].search_rank)
+        self.assertFalse(search_jobs(Job.objects.all(), '  '))
+
+    def test_index_is_joined_not_listed(self):
+        sql = str(search_jobs(Job.objects.all(), 'analy data').query)
+        self.assertIn('INNER JOIN "careers_job_fts"', sql)
+        self.assertIn('MATCH', sql)
+
+
+class CandidateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def apply(self, email, phone):
+        return Application.objects.create(
+            job=self.job, full_name='Jane Doe', email=email, phone=phone, resume='resumes/cv.pdf',
+        )
+
+    def test_spellings_of_one_person_share_a_candidate(self):
+        first = self.apply('Jane.Doe@Gmail.com', '0772 123 456')
+        self.assertEqual(self.apply('janedoe+jobs@googlemail.com', '1').candidate, first.candidate)
+        self.assertEqual(self.apply('jane@work.example', '+263 772 123 456').candidate, first.candidate)
+        self.assertNotEqual(self.apply('john@example.com', '0772 999 999').candidate, first.candidate)
+        self.assertEqual(Candidate.objects.count(), 2)
+        self.assertEqual(first.candidate.email_key, 'janedoe@gmail.com')
+        self.assertEqual(first.candidate.phone_key, '772123456')
+
+
+class ApplicationStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        location = Location.objects.resolve('Harare')
+        cls.jobs = [
+            Job.objects.create(title=title, location=location, description='d', requirements='r')
+            for title in ['Clerk', 'Driver']
+        ]
+        for i in range(4):
+            Application.objects.create(
+                job=cls.jobs[i % 2], full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+
+    def assertCounted(self):
+        for job in [None, *self.jobs]:
+            applications = Application.objects.filter(job=job) if job else Application.objects.all()
+            expected = {code.lower(): applications.filter(status=code).count() for code, _ in Application.STATUS_CHOICES}
+            expected['total'] = applications.count()
+            self.assertEqual(status_counts(job), expected)
+
+    def test_counters_follow_every_kind_of_change(self):
+        self.assertCounted()
+        stale = Application.objects.first()
+        Application.objects.filter(pk=stale.pk).update(status='REVIEWED')
+        stale.status = 'HIRED'
+        stale.save()
+        self.assertCounted()
+        Application.objects.filter(job=self.jobs[1]).update(status='REJECTED')
+        self.assertCounted()
+        Application.objects.filter(status='REJECTED').update(job=self.jobs[0])
+        self.assertCounted()
+        Application.objects.last().delete()
+        self.assertCounted()
+
+
+class MatchScoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.location = Location.objects.resolve('Harare')
+        cls.job = cls.add_job('Keeper', 'zebra feeding rounds')
+        # Enough postings that one more stays within the IDF snapshot's drift allowance
+        for i in range(20):
+            cls.add_job(f'Clerk {i}', 'filing and typing')
+        for name, cover_letter in [('Zara', 'years of zebra feeding'), ('Abel', 'ledgers and accounting')]:
+            Application.objects.create(
+                job=cls.job, full_name=name, email=f'{name}@example.com', phone='1',
+                cover_letter=cover_letter, resume='resumes/cv.pdf',
+            )
+        ResumeText.objects.update(status='DONE')
+
+    @classmethod
+    def add_job(cls, title, description):
+        return Job.objects.create(title=title, location=cls.location, description=description, requirements='r')
+
+    def scores(self):
+        return dict(self.job.applications.values_list('full_name', 'match_score'))
+
+    def test_description_edit_rescores(self):
+        score_pending()
+        self.assertGreater(self.scores()['Zara'], self.scores()['Abel'])
+        Job.objects.filter(pk=self.job.pk).update(description='accounting ledgers')
+        self.assertEqual(score_pending(), 2)
+        self.assertGreater(self.scores()['Abel'], self.scores()['Zara'])
+
+    def test_new_posting_keeps_the_frozen_idf(self):
+        score_pending()
+        before = self.scores()
+        self.add_job('Ranger', 'zebra counts')
+        self.assertEqual(score_pending(), 0)
+        self.assertEqual(self.scores(), before)
+
+    def test_idf_rebuild_rescores_in_place(self):
+        score_pending()
+        before = self.scores()
+        self.add_job('Ranger', 'zebra counts')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(score_pending(rebuild_idf=True), 2)
+        # Overwritten straight away, never cleared back to unscored first
+        self.assertFalse([
+            query for query in queries if query['sql'].startswith('UPDATE') and str(Application.UNSCORED) in query['sql']
+        ])
+        self.assertNotEqual(self.scores()['Zara'], before['Zara'])
+
+
+class ApplicationAdminActionTests(TestCase):
+    def test_actions_record_the_reviewer(self):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        app = Application.objects.create(job=job, full_name='A', email='a@example.com', phone='1', resume='resumes/cv.pdf')
+        self.client.force_login(admin_user)
+        self.client.post('/admin/careers/application/', {'action': 'mark_interview', '_selected_action': [app.pk]})
+        app.refresh_from_db()
+        self.assertEqual((app.status, app.reviewed_by), ('INTERVIEW', admin_user))
+        event = ApplicationStatusEvent.objects.get(application=app, to_status='INTERVIEW')
+        self.assertEqual(event.changed_by, admin_user)
+
+
+class ApplyUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.url = reverse('careers:apply_job', args=[self.job.pk])
+
+    def apply(self, **data):
+        return self.client.post(self.url, {'full_name': 'A', 'email': 'a@example.com', 'phone': '1', 'cover_letter': 'c', **data})
+
+    def test_posted_resume_is_checked_like_the_chunks(self):
+        self.apply(resume=SimpleUploadedFile('cv.pdf', b'MZ not a pdf'))
+        with mock.patch('careers.uploads.MAX_RESUME_SIZE', 10):
+            self.apply(resume=SimpleUploadedFile('cv.pdf', b'%PDF-1.4 too long'))
+        self.assertFalse(Application.objects.exists())
+        self.apply(resume=SimpleUploadedFile('cv.pdf', b'%PDF-1.4 fine'))
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_chunked_upload_is_submitted_by_token(self):
+        content = b'%PDF-1.4 chunked'
+        upload = start_upload('cv.pdf', len(content))
+        with self.assertRaises(UploadError):
+            write_chunk(upload, 0, io.BytesIO(b'MZ' + content[2:]), len(content))
+        write_chunk(upload, 0, io.BytesIO(content), len(content))
+        self.apply(resume_token=str(upload.token))
+        application = Application.objects.get()
+        self.assertEqual(application.resume.read(), content)
+        self.assertFalse(ResumeUpload.objects.exists())
+
+
+class JobFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.harare = Location.objects.resolve('Harare')
+        cls.bulawayo = Location.objects.resolve('Bulawayo')
+        for title, location, job_type in [('A', cls.harare, 'FT'), ('B', cls.harare, 'PT'), ('C', cls.bulawayo, 'FT')]:
+            Job.objects.create(title=title, location=location, job_type=job_type, description='d', requirements='r')
+
+    def setUp(self):
+        cache.clear()
+
+    def facets(self, **filters):
+        return get_job_facets(Job.objects.filter(is_active=True), **filters)
+
+    def test_each_facet_ignores_its_own_filter(self):
+        facets = self.facets(job_type='PT', location=self.harare.pk)
+        self.assertEqual(facets['locations'], [(self.harare.pk, 'Harare', 1)])
+        self.assertEqual([count for _, _, count in facets['job_types']], [1, 1, 0, 0])
+
+    def test_counts_are_cached_until_a_job_changes(self):
+        self.assertEqual(self.facets()['job_types'][0], ('FT', 'Full-time', 2))
+        with self.assertNumQueries(0):
+            self.facets()
+        Job.objects.create(title='D', location=self.harare, job_type='FT', description='d', requirements='r')
+        self.assertEqual(self.facets()['job_types'][0], ('FT', 'Full-time', 3))
+
+
+class ResumeStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def apply(self, name, content):
+        return Application.objects.create(
+            job=self.job, full_name='A', email=f'{name}@example.com', phone='1',
+            resume=SimpleUploadedFile(name, content),
+        )
+
+    def test_identical_resumes_share_one_counted_file(self):
+        first = self.apply('cv.PDF', b'%PDF-1.4 same')
+        second = self.apply('other.pdf', b'%PDF-1.4 same')
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertTrue(is_content_addressed(first.resume.name))
+        self.assertTrue(first.resume.name.endswith('.pdf'))
+        self.assertEqual(ResumeBlob.objects.get(name=first.resume.name).ref_count, 2)
+
+        name = first.resume.name
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(resume_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(resume_storage.exists(name))
+        self.assertFalse(ResumeBlob.objects.exists())
+
+
+class ResumeExtractionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def docx(self, text):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+            ))
+        return buffer.getvalue()
+
+    def apply(self, email, name, content):
+        return Application.objects.create(
+            job=self.job, full_name='A', email=email, phone='1', resume=SimpleUploadedFile(name, content),
+        )
+
+    def test_each_shared_file_is_read_once_and_indexed(self):
+        first = self.apply('a@example.com', 'cv.docx', self.docx('Bookkeeping and payroll'))
+        second = self.apply('b@example.com', 'copy.docx', self.docx('Bookkeeping and payroll'))
+        broken = self.apply('c@example.com', 'cv.docx', b'not a zip')
+        self.assertEqual(ResumeText.objects.filter(status='PENDING').count(), 3)
+
+        pool = mock.Mock()
+        pool.map.side_effect = lambda function, paths: list(map(function, paths))
+        self.assertEqual(process_pending(pool), 3)
+        self.assertEqual(len(pool.map.call_args.args[1]), 2)
+        self.assertEqual(process_pending(pool), 0)
+
+        texts = {row.application_id: row for row in ResumeText.objects.all()}
+        self.assertEqual(texts[first.pk].content, 'Bookkeeping and payroll')
+        self.assertEqual(texts[second.pk].status, 'DONE')
+        self.assertEqual(texts[broken.pk].status, 'FAILED')
+        self.assertTrue(texts[broken.pk].error)
+        matches = Application.objects.filter(get_search_backend().resume_filter('payroll'))
+        self.assertEqual(set(matches), {first, second})
+
+
+class JobPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_pages_cost_no_queries_until_the_job_changes(self):
+        detail = reverse('careers:job_detail', args=[self.job.pk])
+        self.client.get(detail)
+        self.client.get(reverse('careers:job_list'))
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(detail), 'Clerk')
+            self.assertContains(self.client.get(reverse('careers:job_list')), 'Clerk')
+
+        self.job.title = 'Senior Clerk'
+        self.job.save()
+        self.assertContains(self.client.get(detail), 'Senior Clerk')
+        self.assertContains(self.client.get(reverse('careers:job_list')), 'Senior Clerk')
+
+
+class ListingCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        location = Location.objects.resolve('Harare')
+        Job.objects.create(title='Open Clerk', location=location, description='d', requirements='r')
+        Job.objects.create(
+            title='Closing Clerk', location=location, description='d', requirements='r',
+            deadline=timezone.now() + datetime.timedelta(hours=1),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_expired_jobs_leave_the_cached_listing_and_facets(self):
+        response = self.client.get(reverse('careers:job_list'))
+        self.assertContains(response, 'Closing Clerk')
+        self.assertEqual(response.context['locations'][0][2], 2)
+
+        later = timezone.now() + datetime.timedelta(hours=2)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            response = self.client.get(reverse('careers:job_list'))
+        self.assertNotContains(response, 'Closing Clerk')
+        self.assertContains(response, 'Open Clerk')
+        self.assertEqual(response.context['locations'][0][2], 1)
+
+
+class TalentPoolTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.location = Location.objects.resolve('Harare')
+        older = Job.objects.create(title='Clerk', location=cls.location, description='d', requirements='r')
+        cls.apps = {}
+        for key, email, letter in [
+            ('twice_best', 'twice@example.com', 'python django python django'),
+            ('twice_other', 'TWICE@example.com', 'python'),
+            ('once', 'once@example.com', 'django'),
+            ('applied', 'applied@example.com', 'python django'),
+            ('unrelated', 'nurse@example.com', 'nursing'),
+        ]:
+            cls.apps[key] = Application.objects.create(
+                job=older, full_name=key, email=email, phone='1', resume='resumes/cv.pdf', cover_letter=letter,
+            )
+        ResumeText.objects.update(status='DONE')
+        get_search_backend().rebuild()
+
+    def create_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(
+                title='Developer', location=self.location, description='d', requirements='Python and Django',
+            )
+            # Applied before the shortlist is drawn up, under a differently cased address
+            Application.objects.create(
+                job=job, full_name='a', email='Applied@example.com', phone='1', resume='resumes/cv.pdf', cover_letter='c',
+            )
+        return job
+
+    def test_saved_job_is_matched_once_per_person(self):
+        job = self.create_job()
+        shortlist = list(job.talent_matches.values_list('application_id', flat=True))
+        self.assertEqual(shortlist, [self.apps['twice_best'].pk, self.apps['once'].pk])
+
+    def test_backends_rank_people_not_applications(self):
+        job = self.create_job()
+        terms = requirement_terms(job)
+        through = Application.objects.latest('id').pk
+        expected = [self.apps['twice_best'].pk, self.apps['once'].pk]
+        for backend in (SQLiteFTSBackend(), SimpleSearchBackend()):
+            with self.subTest(backend=type(backend).__name__):
+                ranked = backend.rank_applicants(terms, job.pk, 0, through, 25)
+                self.assertEqual([app_id for app_id, _ in ranked], expected)
+
+
+class StatusHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+
+    def test_every_status_change_appends_one_event(self):
+        apps = [
+            Application.objects.create(
+                job=self.job, full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+            for i in range(2)
+        ]
+        apps[0].notes = 'called'
+        apps[0].save()
+        apps[0].status = 'REVIEWED'
+        apps[0].save()
+        Application.objects.filter(job=self.job).update(status='REVIEWED')
+
+        events = ApplicationStatusEvent.objects.order_by('id').values_list('application_id', 'from_status', 'to_status')
+        self.assertEqual(list(events), [
+            (apps[0].pk, '', 'PENDING'),
+            (apps[1].pk, '', 'PENDING'),
+            (apps[0].pk, 'PENDING', 'REVIEWED'),
+            (apps[1].pk, 'PENDING', 'REVIEWED'),
+        ])
+
+
+class DurationSketchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        now = timezone.now()
+        for i in range(4):
+            app = Application.objects.create(
+                job=job, full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+            for status in ['REVIEWED', 'HIRED'] if i % 2 else ['REJECTED']:
+                app.status = status
+                app.save()
+            Application.objects.filter(pk=app.pk).update(applied_at=now - datetime.timedelta(days=10 + i))
+            for days_ago, event in zip([6, 2], app.status_events.exclude(to_status='PENDING').order_by('id')):
+                ApplicationStatusEvent.objects.filter(pk=event.pk).update(changed_at=now - datetime.timedelta(days=days_ago))
+
+    def snapshot(self):
+        return sorted(DurationSketch.objects.values_list('metric', 'stage', 'job_id', 'period', 'count', 'data'))
+
+    def test_status_changes_leave_the_sketches_to_the_worker(self):
+        self.assertFalse(DurationSketch.objects.exists())
+        # Read from the events not folded in yet
+        before = duration_percentiles('HIRE')
+        self.assertEqual(before['count'], 2)
+
+        self.assertEqual(fold_pending(batch_size=3), ApplicationStatusEvent.objects.count())
+        self.assertEqual(duration_percentiles('HIRE'), before)
+        self.assertEqual(duration_percentiles('STAGE', 'REVIEWED')['count'], 2)
+        self.assertEqual(fold_pending(), 0)
+
+    def test_folding_matches_the_rebuild(self):
+        fold_pending(batch_size=2)
+        folded = self.snapshot()
+        rebuild()
+        self.assertEqual(self.snapshot(), folded)
+
+
+class ApplicationIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        cls.smith = Application.objects.create(
+            job=job, full_name='Jane Smith', email='jane@example.com', phone='0772 123 456', resume='resumes/cv.pdf',
+        )
+        Application.objects.create(job=job, full_name='Tom Jones', email='tom@example.com', phone='1', resume='resumes/cv.pdf')
+
+    def matches(self, backend, query):
+        return list(Application.objects.filter(backend.application_filter(query)).values_list('pk', flat=True))
+
+    def test_substrings_and_bare_phone_digits_match(self):
+        backend = SQLiteFTSBackend()
+        self.assertTrue(backend.has_trigram_tokenizer())
+        self.assertIn('careers_application_fts', str(Application.objects.filter(backend.application_filter('mith')).query))
+        self.assertEqual(self.matches(backend, 'mith'), [self.smith.pk])
+        self.assertEqual(self.matches(backend, '0772123456'), [self.smith.pk])
+
+    def test_missing_table_falls_back_until_rebuilt(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE careers_application_fts')
+        backend = SQLiteFTSBackend()
+        self.assertFalse(backend.has_trigram_tokenizer())
+        self.assertEqual(self.matches(backend, 'mith'), [self.smith.pk])
+        backend.index_applications([self.smith.pk])
+
+        backend.rebuild()
+        self.assertTrue(backend.has_trigram_tokenizer())
+        self.assertEqual(self.matches(backend, '0772123456'), [self.smith.pk])
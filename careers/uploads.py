@@ -0,0 +1,174 @@
+"""
+Resumable, chunked resume uploads.
+
+The browser opens an upload session, then sends the file in chunks, each
+tagged with its byte offset. Chunks are streamed straight to a ``.part``
+file under ``MEDIA_ROOT/resume_uploads/`` so a worker never buffers the
+whole resume. After a dropped connection the client asks for the current
+offset and carries on from there. Once every byte has arrived, the
+application form submits only the session token.
+"""
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.utils import timezone
+
+from .models import ResumeUpload
+
+MAX_RESUME_SIZE = getattr(settings, 'RESUME_UPLOAD_MAX_SIZE', 5 * 1024 * 1024)
+CHUNK_SIZE = getattr(settings, 'RESUME_UPLOAD_CHUNK_SIZE', 512 * 1024)
+READ_BLOCK_SIZE = 64 * 1024
+
+# Only formats careers.extraction can read, so every resume is searchable from HR
+ALLOWED_EXTENSIONS = {'.pdf', '.docx'}
+
+# Leading bytes of each accepted format, checked on the first chunk
+FILE_SIGNATURES = {
+    '.pdf': (b'%PDF',),
+    '.docx': (b'PK\x03\x04',),
+}
+
+
+class UploadError(Exception):
+    """Raised when an upload request breaks the size, type or offset rules."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _part_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, 'resume_uploads', f'{upload.token}.part')
+
+
+def is_allowed_resume(filename):
+    return os.path.splitext(filename or '')[1].lower() in ALLOWED_EXTENSIONS
+
+
+def check_resume(resume):
+    """Check a whole resume file (posted with the form or a finished session) as the chunks are checked."""
+    if not is_allowed_resume(resume.name):
+        raise UploadError("Resume must be a PDF or DOCX file.")
+    if resume.size > MAX_RESUME_SIZE:
+        raise UploadError(f"Resume must be smaller than {MAX_RESUME_SIZE // (1024 * 1024)} MB.", status=413)
+    resume.seek(0)
+    _check_signature(resume.name, resume.read(READ_BLOCK_SIZE))
+    resume.seek(0)
+
+
+def start_upload(filename, size):
+    """Validate the declared file and open a new upload session."""
+    filename = os.path.basename(filename or '')
+    if not is_allowed_resume(filename):
+        raise UploadError("Resume must be a PDF or DOCX file.")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Missing file size.")
+    if size <= 0:
+        raise UploadError("The file is empty.")
+    if size > MAX_RESUME_SIZE:
+        raise UploadError(f"Resume must be smaller than {MAX_RESUME_SIZE // (1024 * 1024)} MB.", status=413)
+
+    upload = ResumeUpload.objects.create(filename=filename, size=size)
+    path = _part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload
+
+
+def get_upload(token):
+    """Return the upload session for ``token`` or None if it is unknown or malformed."""
+    try:
+        return ResumeUpload.objects.filter(token=token).first()
+    except (ValueError, ValidationError):
+        return None
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Append ``length`` bytes read from ``stream`` at ``offset``.
+
+    The offset must equal the bytes already received, which makes retries
+    of an already-stored chunk harmless: the client is told the real offset
+    and continues from there.
+    """
+    try:
+        offset = int(offset)
+        length = int(length)
+    except (TypeError, ValueError):
+        raise UploadError("Missing chunk offset or length.")
+    if offset != upload.received:
+        raise UploadError("Offset does not match the bytes received so far.", status=409)
+    if length <= 0 or length > CHUNK_SIZE:
+        raise UploadError(f"Chunks must be between 1 and {CHUNK_SIZE} bytes.", status=413)
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared file size.", status=413)
+
+    path = _part_path(upload)
+    if not os.path.exists(path):
+        raise UploadError("Upload session has expired.", status=410)
+
+    with open(path, 'r+b') as part:
+        part.seek(offset)
+        remaining = length
+        first_block = offset == 0
+        while remaining:
+            block = stream.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            if first_block:
+                _check_signature(upload.filename, block)
+                first_block = False
+            part.write(block)
+            remaining -= len(block)
+        if remaining:
+            part.truncate(offset)
+
+    if remaining:
+        raise UploadError("Chunk was cut short; resume from the reported offset.", status=409)
+
+    # Guard against a concurrent retry of the same chunk having moved the offset
+    updated = ResumeUpload.objects.filter(pk=upload.pk, received=offset).update(
+        received=offset + length, updated_at=timezone.now(),
+    )
+    if not updated:
+        upload.refresh_from_db()
+        raise UploadError("Offset does not match the bytes received so far.", status=409)
+    upload.received = offset + length
+    return upload
+
+
+def _check_signature(filename, block):
+    extension = os.path.splitext(filename)[1].lower()
+    if not block.startswith(FILE_SIGNATURES[extension]):
+        raise UploadError("File contents do not match a PDF or DOCX resume.")
+
+
+def open_completed_upload(token):
+    """Return ``(upload, File)`` for a finished upload, or ``(None, None)``."""
+    upload = get_upload(token)
+    if upload is None or not upload.is_complete:
+        return None, None
+    return upload, File(open(_part_path(upload), 'rb'), name=upload.filename)
+
+
+def discard_upload(upload):
+    try:
+        os.remove(_part_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def clear_stale_uploads(max_age=timedelta(hours=24)):
+    """Delete sessions (and their partial files) untouched for ``max_age``."""
+    stale = ResumeUpload.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for upload in stale.iterator():
+        discard_upload(upload)
+        count += 1
+    return count
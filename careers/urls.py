@@ -5,6 +5,9 @@ app_name = 'careers'
 
 urlpatterns = [
     path('', views.job_list, name='job_list'),
+    path('feed/', views.job_feed, name='job_feed'),
     path('<int:job_id>/', views.job_detail, name='job_detail'),
     path('<int:job_id>/apply/', views.apply_job, name='apply_job'),
+    path('uploads/', views.start_resume_upload, name='start_resume_upload'),
+    path('uploads/<uuid:token>/', views.resume_upload_chunk, name='resume_upload_chunk'),
 ]
@@ -1,49 +1,158 @@
-from django.shortcuts import render, get_object_or_404, redirect
+import json
+
+from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.db.models import Q
+from django.http import Http404, JsonResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import require_http_methods, require_POST
+from core.pagination import decode_cursor, encode_cursor, keyset_paginate
 from .models import Job, Application
+from .cache import attach_card_versions, get_cached_job, listing_version
+from .facets import get_job_facets
+from .salary import CURRENCY_CODES, default_currency, salary_filter
+from .search import search_jobs
+from .uploads import (
+    CHUNK_SIZE, UploadError, check_resume, discard_upload, get_upload, open_completed_upload, start_upload,
+    write_chunk,
+)
 
-from django.db.models import Q
+JOBS_PER_PAGE = 12
+JOB_ORDERING = ('-posted_at', '-id')
+# search_rank is the job's bm25 score for the query
+SEARCH_ORDERING = ('search_rank', '-id')
+
+def _positive_int(value):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+def _salary_currency(value):
+    # The site currency is the default, kept blank so the plain listing stays cacheable
+    value = (value or '').upper()
+    return value if value in CURRENCY_CODES and value != default_currency() else ''
+
+def _job_filters(request):
+    return {
+        'q': request.GET.get('q') or '',
+        'job_type': request.GET.get('job_type') or '',
+        'location': _positive_int(request.GET.get('location')),
+        'salary_min': _positive_int(request.GET.get('salary_min')),
+        'salary_max': _positive_int(request.GET.get('salary_max')),
+        'currency': _salary_currency(request.GET.get('currency')),
+    }
+
+def _search_jobs(filters):
+    """Open jobs narrowed by the search query and salary range (not by job type/location)."""
+    # Past-deadline jobs drop out straight away rather than at the next expire_jobs sweep
+    jobs = Job.objects.filter(
+        Q(deadline__isnull=True) | Q(deadline__gte=timezone.now()), is_active=True,
+    ).select_related('location')
+
+    if filters['q']:
+        jobs = search_jobs(jobs, filters['q'])
+
+    # Keep jobs whose parsed pay band, in the chosen currency, overlaps the requested range
+    if filters['salary_min'] or filters['salary_max']:
+        jobs = jobs.filter(salary_filter(filters['salary_min'], filters['salary_max'], filters['currency']))
+    return jobs
+
+def _narrow_jobs(jobs, filters):
+    if filters['job_type']:
+        jobs = jobs.filter(job_type=filters['job_type'])
+    if filters['location']:
+        jobs = jobs.filter(location_id=filters['location'])
+    return jobs
+
+def _search_cursor(jobs, cursor):
+    """
+    Re-anchor a search cursor on its job's current score.
+
+    bm25 depends on the whole index, so a posting added or removed between
+    two pages shifts every score a little; continuing from the last job's
+    score as it is now keeps the pages from repeating or skipping jobs.
+    """
+    values = decode_cursor(cursor, len(SEARCH_ORDERING))
+    if values is None:
+        return cursor
+    try:
+        score = jobs.filter(pk=int(values[-1])).values_list('search_rank', flat=True).first()
+    except (TypeError, ValueError):
+        return cursor
+    return cursor if score is None else encode_cursor([score, values[-1]])
+
+def _job_page(jobs, filters, cursor):
+    ordering = SEARCH_ORDERING if filters['q'] else JOB_ORDERING
+    if filters['q'] and cursor:
+        cursor = _search_cursor(jobs, cursor)
+    page = keyset_paginate(jobs, ordering, cursor, JOBS_PER_PAGE)
+    attach_card_versions(page.items)
+    return page
 
 def job_list(request):
-    query = request.GET.get('q')
-    job_type = request.GET.get('job_type')
-    location = request.GET.get('location')
-    
-    jobs = Job.objects.filter(is_active=True)
-    
-    if query:
-        jobs = jobs.filter(
-            Q(title__icontains=query) | 
-            Q(description__icontains=query) | 
-            Q(requirements__icontains=query)
-        )
-    
-    if job_type:
-        jobs = jobs.filter(job_type=job_type)
-        
-    if location:
-        jobs = jobs.filter(location=location)
-
-    locations = Job.objects.filter(is_active=True).values_list('location', flat=True).distinct()
-    job_types = Job.JOB_TYPES
+    filters = _job_filters(request)
+    cursor = request.GET.get('cursor')
+
+    jobs = _search_jobs(filters)
+    facets = get_job_facets(
+        jobs, job_type=filters['job_type'], location=filters['location'],
+        q=filters['q'], salary_min=filters['salary_min'], salary_max=filters['salary_max'],
+        currency=filters['currency'],
+    )
+    jobs = _narrow_jobs(jobs, filters)
+
+    is_default_listing = not cursor and not any(filters.values())
+    filter_query = request.GET.copy()
+    filter_query.pop('cursor', None)
 
     context = {
-        'jobs': jobs,
-        'locations': locations,
-        'job_types': job_types,
-        'query': query,
-        'selected_job_type': job_type,
-        'selected_location': location,
+        # Evaluated only if the template renders the grid (not on a cached listing hit)
+        'page': SimpleLazyObject(lambda: _job_page(jobs, filters, cursor)),
+        # The first page of the unfiltered listing is served as one cached fragment
+        'listing_version': listing_version() if is_default_listing else None,
+        'locations': facets['locations'],
+        'job_types': facets['job_types'],
+        'query': filters['q'],
+        'selected_job_type': filters['job_type'],
+        'selected_location': filters['location'],
+        'salary_min': filters['salary_min'],
+        'salary_max': filters['salary_max'],
+        'currency': filters['currency'] or default_currency(),
+        'currencies': sorted(CURRENCY_CODES),
+        'filter_query': filter_query.urlencode(),
     }
     return render(request, 'careers/job_list.html', context)
 
+def job_feed(request):
+    """JSON endpoint returning the next page of rendered job cards for infinite scroll"""
+    filters = _job_filters(request)
+    jobs = _narrow_jobs(_search_jobs(filters), filters)
+    page = _job_page(jobs, filters, request.GET.get('cursor'))
+    html = render_to_string('careers/_job_cards.html', {'jobs': page.items}, request=request)
+    return JsonResponse({
+        'html': html,
+        'count': len(page),
+        'next_cursor': page.next_cursor,
+        'has_next': page.has_next,
+    })
+
 def job_detail(request, job_id):
-    job = get_object_or_404(Job, pk=job_id)
+    job = get_cached_job(job_id)
+    if job is None:
+        raise Http404("No Job matches the given query.")
     return render(request, 'careers/job_detail.html', {'job': job})
 
 def apply_job(request, job_id):
-    job = get_object_or_404(Job, pk=job_id)
-    if request.method == 'POST':
+    job = get_cached_job(job_id)
+    if job is None:
+        raise Http404("No Job matches the given query.")
+    if request.method == 'POST' and not job.is_accepting_applications:
+        messages.error(request, f"Applications for {job.title} have closed.")
+    elif request.method == 'POST':
         full_name = request.POST.get('full_name')
         email = request.POST.get('email')
         phone = request.POST.get('phone')
@@ -51,22 +160,80 @@ def apply_job(request, job_id):
         cover_letter = request.POST.get('cover_letter')
         resume = request.FILES.get('resume')
 
-        if resume:
-            application = Application.objects.create(
-                job=job,
-                full_name=full_name,
-                email=email,
-                phone=phone,
-                linkedin_url=linkedin_url,
-                cover_letter=cover_letter,
-                resume=resume
-            )
-            # Send confirmation email to applicant
-            from core.notifications import send_application_confirmation
-            send_application_confirmation(application)
-            messages.success(request, f"Application for {job.title} submitted successfully!")
-            return redirect('careers:job_list') # Ideally redirect to a success page or back to list
-        else:
+        # Resumes sent through the chunked upload endpoints arrive as a token
+        upload = None
+        resume_token = request.POST.get('resume_token')
+        if resume_token and not resume:
+            upload, resume = open_completed_upload(resume_token)
+
+        if not resume:
             messages.error(request, "Please upload your resume.")
+        else:
+            try:
+                # Same type, size and content checks as the chunked uploads
+                check_resume(resume)
+                application = Application.objects.create(
+                    job=job,
+                    full_name=full_name,
+                    email=email,
+                    phone=phone,
+                    linkedin_url=linkedin_url,
+                    cover_letter=cover_letter,
+                    resume=resume
+                )
+            except UploadError as e:
+                messages.error(request, str(e))
+            else:
+                # Send confirmation email to applicant
+                from core.notifications import send_application_confirmation
+                send_application_confirmation(application)
+                messages.success(request, f"Application for {job.title} submitted successfully!")
+                return redirect('careers:job_list') # Ideally redirect to a success page or back to list
+            finally:
+                # The resume has been copied into storage (or rejected): either way the session
+                # file is done with, and its handle must not outlive the request
+                if upload is not None:
+                    resume.close()
+                    discard_upload(upload)
 
     return render(request, 'careers/job_detail.html', {'job': job}) 
+
+
+def _upload_state(upload):
+    return {
+        'token': str(upload.token),
+        'offset': upload.received,
+        'size': upload.size,
+        'complete': upload.is_complete,
+    }
+
+@require_POST
+def start_resume_upload(request):
+    """AJAX endpoint to open a chunked resume upload session"""
+    try:
+        data = json.loads(request.body)
+        upload = start_upload(data.get('filename'), data.get('size'))
+    except (ValueError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
+    except UploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+    return JsonResponse({'success': True, 'chunk_size': CHUNK_SIZE, **_upload_state(upload)})
+
+@require_http_methods(['GET', 'POST'])
+def resume_upload_chunk(request, token):
+    """AJAX endpoint: GET reports the resume offset, POST appends a raw chunk"""
+    upload = get_upload(token)
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'Unknown upload.'}, status=404)
+
+    if request.method == 'POST':
+        try:
+            write_chunk(
+                upload,
+                request.headers.get('X-Upload-Offset'),
+                request,
+                request.META.get('CONTENT_LENGTH'),
+            )
+        except UploadError as e:
+            return JsonResponse({'success': False, 'error': str(e), **_upload_state(upload)}, status=e.status)
+    return JsonResponse({'success': True, **_upload_state(upload)})
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import NewsletterSubscriber
+from .models import NewsletterSubscriber, JobAlert
 
 @admin.register(NewsletterSubscriber)
 class NewsletterSubscriberAdmin(admin.ModelAdmin):
@@ -7,4 +7,11 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'subscribed_at')
     search_fields = ('email',)
 
+@admin.register(JobAlert)
+class JobAlertAdmin(admin.ModelAdmin):
+    list_display = ('subscriber', 'keywords', 'job_type', 'location', 'salary_min', 'is_active', 'created_at')
+    list_filter = ('is_active', 'job_type', 'location')
+    search_fields = ('subscriber__email', 'keywords')
+    raw_id_fields = ('subscriber',)
+
 # Register your models here.
@@ -0,0 +1,96 @@
+"""
+Matching new jobs against saved job alerts.
+
+Alert keywords are kept in an inverted index (``JobAlertTerm``: term ->
+alert). For a new job we look up only the postings for the prefixes of
+the job's own words (a keyword matches the way a careers search term
+does, as a prefix: "analy" hits "analyst") and keep the alerts whose
+every keyword was hit, then apply the
+structured criteria (job type, location, salary floor) as indexed filters.
+Keywords shorter than ``MIN_ALERT_TERM_LENGTH`` are never indexed, so no
+shorter prefix is looked up either, and the prefixes are sent in chunks
+to stay under the databases' bound parameter limits. No alert is ever
+evaluated one by one, so the cost depends on how many alerts share words
+with the job, not on how many alerts exist. Active newsletter subscribers
+who never saved an alert still hear about every new job.
+"""
+from collections import Counter
+
+from django.db.models import Count, Exists, OuterRef, Q
+
+from careers.salary import default_currency
+from careers.search import tokenize
+
+from .models import MIN_ALERT_TERM_LENGTH, JobAlert, JobAlertTerm, NewsletterSubscriber
+
+# Bound parameters per query
+QUERY_CHUNK_SIZE = 500
+
+
+def chunked(values):
+    for start in range(0, len(values), QUERY_CHUNK_SIZE):
+        yield values[start:start + QUERY_CHUNK_SIZE]
+
+
+def job_terms(job):
+    """The prefixes (as long as an indexed keyword can be) of the distinct words of a job."""
+    words = set(tokenize(' '.join([job.title, job.description, job.requirements])))
+    return sorted({word[:end] for word in words for end in range(MIN_ALERT_TERM_LENGTH, len(word) + 1)})
+
+
+def keyword_matches(job):
+    """Ids of the active alerts with keywords, every one of which is a prefix of a word of ``job``."""
+    hits, needed = Counter(), {}
+    for terms in chunked(job_terms(job)):
+        postings = (
+            JobAlertTerm.objects
+            .filter(term__in=terms, alert__is_active=True)
+            .values_list('alert_id', 'alert__term_count')
+            .annotate(hits=Count('id'))
+            .order_by()
+        )
+        for alert_id, term_count, count in postings:
+            hits[alert_id] += count
+            needed[alert_id] = term_count
+    return sorted(alert_id for alert_id, count in hits.items() if count == needed[alert_id])
+
+
+def filter_alerts(alerts, job):
+    """Narrow ``alerts`` to the active ones (of active subscribers) whose structured criteria ``job`` meets."""
+    alerts = alerts.filter(
+        is_active=True,
+        subscriber__is_active=True,
+        job_type__in=['', job.job_type],
+    ).filter(
+        Q(location__isnull=True) | Q(location_id=job.location_id),
+    )
+
+    # A salary floor (in the site currency) only matches jobs with a parsed pay band that reaches it
+    if job.salary_max is None or job.salary_currency not in ('', default_currency()):
+        return alerts.filter(salary_min__isnull=True)
+    return alerts.filter(Q(salary_min__isnull=True) | Q(salary_min__lte=job.salary_max))
+
+
+def alert_batches(job):
+    """Querysets of the alerts ``job`` satisfies, together all of them, each within the parameter limit."""
+    yield filter_alerts(JobAlert.objects.filter(term_count=0), job)
+    for alert_ids in chunked(keyword_matches(job)):
+        yield filter_alerts(JobAlert.objects.filter(pk__in=alert_ids), job)
+
+
+def matching_alerts(job):
+    """Return the active alerts (of active subscribers) that ``job`` satisfies."""
+    return [alert for alerts in alert_batches(job) for alert in alerts]
+
+
+def matching_subscribers(job):
+    """Distinct email addresses to notify about ``job``."""
+    emails = set(
+        NewsletterSubscriber.objects
+        .filter(is_active=True)
+        .filter(~Q(Exists(JobAlert.objects.filter(subscriber=OuterRef('pk')))))
+        .values_list('email', flat=True)
+    )
+    for alerts in alert_batches(job):
+        emails.update(alerts.values_list('subscriber__email', flat=True))
+    return sorted(emails)
@@ -0,0 +1,64 @@
+"""
+Streaming file exports.
+
+Exports are produced as a generator of byte chunks so a response (or a
+file on disk) can be written while the rows are still being read from the
+database: memory stays flat however many rows there are, and the first
+bytes reach the client straight away. Rows are grouped into chunks of
+``CHUNK_ROWS`` so each write is a reasonable size rather than one line.
+"""
+import csv
+import io
+import json
+import zlib
+
+CHUNK_ROWS = 500
+
+
+def _chunked(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_chunks(header, rows, chunk_rows=CHUNK_ROWS):
+    """Encode ``header`` and then ``rows`` as UTF-8 CSV, yielding bytes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for batch in _chunked(rows, chunk_rows):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _json_default(value):
+    # Dates and datetimes as ISO 8601, anything else (Decimal, UUID) as its string form
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def jsonl_chunks(records, chunk_rows=CHUNK_ROWS):
+    """Encode dicts as JSON Lines, yielding bytes."""
+    for batch in _chunked(records, chunk_rows):
+        yield ''.join(json.dumps(record, default=_json_default) + '\n' for record in batch).encode('utf-8')
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of byte chunks on the fly."""
+    # wbits 16 + 15 writes a gzip header and trailer rather than a bare zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
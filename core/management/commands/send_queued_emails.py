@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.notifications import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Send the emails queued by bulk actions (such as bulk application status changes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Emails sent per mail connection')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for queued emails instead of exiting')
+        parser.add_argument('--interval', type=int, default=10, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_queued_emails(batch_size=options['batch_size'])
+            total += sent
+            if sent:
+                self.stdout.write(f'Sent {sent} emails ({total} total).')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Sent {total} emails.'))
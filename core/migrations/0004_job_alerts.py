@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-18 10:26
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0012_location'),
+        ('core', '0003_alter_feedback_id_alter_newslettersubscriber_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keywords', models.CharField(blank=True, help_text='All of these words must appear in the job', max_length=200)),
+                ('job_type', models.CharField(blank=True, choices=[('FT', 'Full-time'), ('PT', 'Part-time'), ('CT', 'Contract'), ('IN', 'Internship')], max_length=2)),
+                ('salary_min', models.PositiveIntegerField(blank=True, help_text='Only jobs paying at least this much', null=True)),
+                ('term_count', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='job_alerts', to='careers.location')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_alerts', to='core.newslettersubscriber')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobAlertTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_terms', to='core.jobalert')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(fields=['is_active', 'term_count'], name='core_jobalert_active_terms'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobalertterm',
+            constraint=models.UniqueConstraint(fields=('term', 'alert'), name='core_jobalertterm_term_alert'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Length
+
+# core.models.MIN_ALERT_TERM_LENGTH when this migration was written
+MIN_ALERT_TERM_LENGTH = 2
+
+
+def drop_short_terms(apps, schema_editor):
+    JobAlert = apps.get_model('core', 'JobAlert')
+    JobAlertTerm = apps.get_model('core', 'JobAlertTerm')
+    JobAlertTerm.objects.annotate(length=Length('term')).filter(length__lt=MIN_ALERT_TERM_LENGTH).delete()
+    remaining = (
+        JobAlertTerm.objects
+        .filter(alert=OuterRef('pk'))
+        .order_by()
+        .values('alert')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    JobAlert.objects.filter(term_count__gt=0).update(term_count=Coalesce(Subquery(remaining), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_job_alerts'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_short_terms, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
+
+from careers.models import Job
+from careers.search import tokenize
+
+MAX_ALERT_TERMS = 10
+# Shorter keywords are not indexed; job words are matched by prefixes at least this long
+MIN_ALERT_TERM_LENGTH = 2
 
 class NewsletterSubscriber(models.Model):
     email = models.EmailField(unique=True)
@@ -8,6 +17,74 @@ class NewsletterSubscriber(models.Model):
     def __str__(self):
         return self.email
 
+class JobAlert(models.Model):
+    """Saved job search; the subscriber is emailed when a new job matches every criterion set."""
+    subscriber = models.ForeignKey(NewsletterSubscriber, on_delete=models.CASCADE, related_name='job_alerts')
+    keywords = models.CharField(max_length=200, blank=True, help_text="All of these words must appear in the job")
+    job_type = models.CharField(max_length=2, choices=Job.JOB_TYPES, blank=True)
+    location = models.ForeignKey('careers.Location', on_delete=models.CASCADE, null=True, blank=True, related_name='job_alerts')
+    salary_min = models.PositiveIntegerField(null=True, blank=True, help_text="Only jobs paying at least this much")
+    term_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.subscriber.email}: {self.keywords or 'any job'}"
+
+    @property
+    def terms(self):
+        words = (word for word in tokenize(self.keywords) if len(word) >= MIN_ALERT_TERM_LENGTH)
+        return list(dict.fromkeys(words))[:MAX_ALERT_TERMS]
+
+    def save(self, *args, **kwargs):
+        terms = self.terms
+        self.term_count = len(terms)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'keywords' not in update_fields:
+            return super().save(*args, **kwargs)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'term_count'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Keep the inverted index (term -> alerts) in step with the keywords
+            self.index_terms.all().delete()
+            JobAlertTerm.objects.bulk_create(JobAlertTerm(alert=self, term=term) for term in terms)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'term_count'], name='core_jobalert_active_terms'),
+        ]
+
+class JobAlertTerm(models.Model):
+    """Posting in the keyword index: one row per (term, alert)."""
+    alert = models.ForeignKey(JobAlert, on_delete=models.CASCADE, related_name='index_terms')
+    term = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.term
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'alert'], name='core_jobalertterm_term_alert'),
+        ]
+
+class QueuedEmail(models.Model):
+    """An email queued in the same transaction as the change it reports, sent by the send_queued_emails worker."""
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.subject} to {self.recipient}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent_at', 'id'], name='core_queuedemail_unsent'),
+        ]
+
 class Feedback(models.Model):
     RATING_CHOICES = [
         (1, 'Poor'),
@@ -2,9 +2,13 @@
 Email notification utilities for Strategic Synergy HR Web App.
 Uses Django's send_mail — console backend in dev, SMTP in production.
 """
-from django.core.mail import send_mail
+import logging
+
+from django.core.mail import send_mail, send_mass_mail
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 def send_application_confirmation(application):
     """Send confirmation email to applicant after submitting."""
@@ -33,26 +37,30 @@ def send_application_confirmation(application):
         pass  # Don't break the flow if email fails
 
 
-def send_status_change_notification(application, old_status):
-    """Notify applicant when their application status changes."""
-    try:
-        status_display = dict(application.STATUS_CHOICES).get(application.status, application.status)
-        subject = f"Application Update — {application.job.title}"
-        message = (
-            f"Dear {application.full_name},\n\n"
-            f"Your application for {application.job.title} has been updated.\n\n"
-            f"New Status: {status_display}\n\n"
-        )
+def _status_change_email(application):
+    status_display = dict(application.STATUS_CHOICES).get(application.status, application.status)
+    subject = f"Application Update — {application.job.title}"
+    message = (
+        f"Dear {application.full_name},\n\n"
+        f"Your application for {application.job.title} has been updated.\n\n"
+        f"New Status: {status_display}\n\n"
+    )
+
+    if application.status == 'INTERVIEW':
+        message += "Congratulations! We'd like to invite you for an interview. Our team will reach out with scheduling details soon.\n\n"
+    elif application.status == 'HIRED':
+        message += "Congratulations! We're thrilled to welcome you to the Strategic Synergy team! You will receive onboarding information shortly.\n\n"
+    elif application.status == 'REJECTED':
+        message += "After careful consideration, we've decided to move forward with other candidates. We appreciate your interest and encourage you to apply for future openings.\n\n"
 
-        if application.status == 'INTERVIEW':
-            message += "Congratulations! We'd like to invite you for an interview. Our team will reach out with scheduling details soon.\n\n"
-        elif application.status == 'HIRED':
-            message += "Congratulations! We're thrilled to welcome you to the Strategic Synergy team! You will receive onboarding information shortly.\n\n"
-        elif application.status == 'REJECTED':
-            message += "After careful consideration, we've decided to move forward with other candidates. We appreciate your interest and encourage you to apply for future openings.\n\n"
+    message += "Best regards,\nStrategic Synergy HR Team"
+    return subject, message
 
-        message += "Best regards,\nStrategic Synergy HR Team"
 
+def send_status_change_notification(application, old_status):
+    """Notify applicant when their application status changes."""
+    try:
+        subject, message = _status_change_email(application)
         send_mail(
             subject,
             message,
@@ -64,6 +72,45 @@ def send_status_change_notification(application, old_status):
         pass
 
 
+def queue_status_change_notifications(applications):
+    """
+    Queue status change emails for many applicants; the send_queued_emails worker sends them.
+
+    Call it in the transaction that changes the statuses, so the emails are
+    queued if and only if the change commits.
+    """
+    from core.models import QueuedEmail
+
+    queued = []
+    for application in applications:
+        subject, message = _status_change_email(application)
+        queued.append(QueuedEmail(recipient=application.email, subject=subject, message=message))
+    QueuedEmail.objects.bulk_create(queued)
+
+
+def send_queued_emails(batch_size=200):
+    """Send queued emails, a batch per mail connection; returns how many were sent."""
+    from django.utils import timezone
+    from core.models import QueuedEmail
+
+    sent = 0
+    while True:
+        batch = list(QueuedEmail.objects.filter(sent_at__isnull=True).order_by('id')[:batch_size])
+        if not batch:
+            return sent
+        try:
+            send_mass_mail(
+                ((email.subject, email.message, settings.DEFAULT_FROM_EMAIL, [email.recipient]) for email in batch),
+                fail_silently=False,
+            )
+        except Exception:
+            # Left queued for the next run
+            logger.exception('Sending %s queued emails failed', len(batch))
+            return sent
+        QueuedEmail.objects.filter(pk__in=[email.pk for email in batch]).update(sent_at=timezone.now())
+        sent += len(batch)
+
+
 def send_event_registration_confirmation(registration):
     """Send confirmation email after event registration."""
     try:
@@ -97,12 +144,46 @@ def send_event_registration_confirmation(registration):
         pass
 
 
+def send_job_alert_confirmation(alert, cancel_url):
+    """Confirm a saved job alert and tell the subscriber how to cancel it."""
+    try:
+        criteria = []
+        if alert.keywords:
+            criteria.append(f"Keywords: {alert.keywords}")
+        if alert.job_type:
+            criteria.append(f"Type: {alert.get_job_type_display()}")
+        if alert.location:
+            criteria.append(f"Location: {alert.location}")
+        if alert.salary_min:
+            criteria.append(f"Minimum salary: {alert.salary_min:,}")
+        criteria = '\n'.join(criteria) or 'Any new position'
+
+        message = (
+            f"Your job alert is set up. We'll email you when a new position matches:\n\n"
+            f"{criteria}\n\n"
+            f"To stop these emails, visit: {cancel_url}\n\n"
+            f"Best regards,\n"
+            f"Strategic Synergy HR Team"
+        )
+        send_mail(
+            "Job Alert Confirmed",
+            message,
+            settings.DEFAULT_FROM_EMAIL,
+            [alert.subscriber.email],
+            fail_silently=True,
+        )
+    except Exception:
+        pass
+
+
 def send_new_job_notification(job):
-    """Notify active newsletter subscribers about a new job posting."""
+    """Notify subscribers whose saved job alerts match a new job posting, and those with no alerts."""
     try:
-        from core.models import NewsletterSubscriber
+        from core.alerts import matching_subscribers
 
-        subscribers = NewsletterSubscriber.objects.filter(is_active=True).values_list('email', flat=True)
+        if not job.is_active:
+            return
+        subscribers = matching_subscribers(job)
         if not subscribers:
             return
 
@@ -125,16 +206,13 @@ def send_new_job_notification(job):
             f"Best regards,\n"
             f"Strategic Synergy HR Team\n\n"
             f"—\n"
-            f"You're receiving this because you subscribed to our newsletter."
+            f"You're receiving this because you subscribed to job updates or saved a matching job alert."
         )
 
-        for email in subscribers:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [email],
-                fail_silently=True,
-            )
+        # One connection for the whole batch; each subscriber gets a single email
+        send_mass_mail(
+            ((subject, message, settings.DEFAULT_FROM_EMAIL, [email]) for email in subscribers),
+            fail_silently=True,
+        )
     except Exception:
-        pass
+        logger.exception('New job notification for job %s failed', job.pk)
@@ -1,3 +1,101 @@
+from unittest import mock
+
+from django.core import mail
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from careers.models import Job, Location
+
+from .alerts import job_terms, matching_subscribers
+from .models import JobAlert, NewsletterSubscriber
+from .notifications import send_new_job_notification
+from .pagination import bounded_count, keyset_paginate
+
+
+class NewJobNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.location = Location.objects.resolve('Harare')
+        cls.job = Job.objects.create(
+            title='Data Analyst', location=cls.location, job_type='FT',
+            description='Reporting for the finance team', requirements='SQL',
+        )
+
+    def subscribe(self, email, **alert):
+        subscriber = NewsletterSubscriber.objects.create(email=email)
+        if alert:
+            JobAlert.objects.create(subscriber=subscriber, **alert)
+        return subscriber
+
+    def recipients(self):
+        mail.outbox = []
+        send_new_job_notification(self.job)
+        return {address for message in mail.outbox for address in message.to}
+
+    def test_subscribers_without_alerts_hear_about_every_job(self):
+        self.subscribe('plain@example.com')
+        NewsletterSubscriber.objects.create(email='gone@example.com', is_active=False)
+        self.assertEqual(self.recipients(), {'plain@example.com'})
+
+    def test_alert_keywords_match_as_prefixes(self):
+        self.subscribe('prefix@example.com', keywords='analy financ')
+        self.subscribe('other@example.com', keywords='nurse')
+        self.subscribe('cancelled@example.com', keywords='analyst', is_active=False)
+        self.assertEqual(self.recipients(), {'prefix@example.com'})
+
+    def test_structured_criteria_still_apply(self):
+        self.subscribe('type@example.com', job_type='PT')
+        self.subscribe('match@example.com', job_type='FT', location=self.location)
+        self.assertEqual(self.recipients(), {'match@example.com'})
+
+    def test_short_keywords_are_not_indexed(self):
+        subscriber = self.subscribe('short@example.com')
+        alert = JobAlert.objects.create(subscriber=subscriber, keywords='a analyst')
+        self.assertEqual(alert.terms, ['analyst'])
+        self.assertEqual(alert.term_count, 1)
+        self.assertNotIn('a', job_terms(self.job))
+        self.assertIn('an', job_terms(self.job))
+
+    def test_prefixes_are_looked_up_in_chunks(self):
+        self.subscribe('prefix@example.com', keywords='report sql')
+        self.subscribe('other@example.com', keywords='report nurse')
+        with mock.patch('core.alerts.QUERY_CHUNK_SIZE', 3):
+            with CaptureQueriesContext(connection) as queries:
+                emails = matching_subscribers(self.job)
+        self.assertEqual(emails, ['prefix@example.com'])
+        postings = [query['sql'] for query in queries if 'core_jobalertterm' in query['sql']]
+        self.assertEqual(len(postings), -(-len(job_terms(self.job)) // 3))
+
+    def test_failures_are_logged(self):
+        self.subscribe('plain@example.com')
+        with mock.patch('core.alerts.matching_subscribers', side_effect=DatabaseError('locked')):
+            with self.assertLogs('core.notifications', 'ERROR'):
+                self.assertEqual(self.recipients(), set())
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        location = Location.objects.resolve('Harare')
+        for i in range(7):
+            Job.objects.create(title=f'Job {i % 3}', location=location, description='d', requirements='r')
+
+    def test_mixed_direction_pages_cover_every_row_once(self):
+        ordering = ('title', '-id')
+        seen, page = [], keyset_paginate(Job.objects.all(), ordering, per_page=3)
+        seen += page.items
+        while page.has_next:
+            page = keyset_paginate(Job.objects.all(), ordering, page.next_cursor, per_page=3)
+            seen += page.items
+        self.assertEqual(seen, list(Job.objects.order_by(*ordering)))
+
+    def test_bad_cursors_restart_from_the_first_page(self):
+        first = keyset_paginate(Job.objects.all(), ('title', 'id'), per_page=2).items
+        for cursor in ['not base64!', 'WyJhIl0', 'WyJhIiwieCJd']:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(keyset_paginate(Job.objects.all(), ('title', 'id'), cursor, per_page=2).items, first)
 
-# Create your tests here.
+    def test_counts_stop_at_the_cap(self):
+        self.assertEqual(bounded_count(Job.objects.all(), 5), (5, True))
+        self.assertEqual(bounded_count(Job.objects.all(), 7), (7, False))
@@ -10,4 +10,6 @@ urlpatterns = [
     path('contact/', views.contact, name='contact'),
     path('feedback/', views.feedback, name='feedback'),
     path('newsletter/signup/', views.newsletter_signup, name='newsletter_signup'),
+    path('newsletter/alerts/', views.job_alert_signup, name='job_alert_signup'),
+    path('newsletter/alerts/<uuid:token>/cancel/', views.job_alert_cancel, name='job_alert_cancel'),
 ]
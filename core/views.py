@@ -35,6 +35,53 @@ def newsletter_signup(request):
             messages.error(request, 'Please provide a valid email address.')
     return redirect(request.META.get('HTTP_REFERER', 'home'))
 
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from careers.models import Job, Location
+from .models import JobAlert
+from .notifications import send_job_alert_confirmation
+
+@require_POST
+def job_alert_signup(request):
+    """Save the careers page search as a job alert for the given email address."""
+    email = (request.POST.get('email') or '').strip().lower()
+    try:
+        validate_email(email)
+    except ValidationError:
+        messages.error(request, 'Please provide a valid email address.')
+        return redirect(request.META.get('HTTP_REFERER', 'careers:job_list'))
+
+    job_type = request.POST.get('job_type') or ''
+    location = request.POST.get('location') or ''
+    salary_min = request.POST.get('salary_min') or ''
+
+    subscriber, _ = NewsletterSubscriber.objects.get_or_create(email=email)
+    if not subscriber.is_active:
+        subscriber.is_active = True
+        subscriber.save(update_fields=['is_active'])
+
+    alert = JobAlert.objects.create(
+        subscriber=subscriber,
+        keywords=(request.POST.get('keywords') or '')[:200],
+        job_type=job_type if job_type in dict(Job.JOB_TYPES) else '',
+        location=Location.objects.filter(pk=location).first() if location.isdigit() else None,
+        salary_min=int(salary_min) if salary_min.isdigit() else None,
+    )
+    cancel_url = request.build_absolute_uri(reverse('job_alert_cancel', args=[alert.token]))
+    send_job_alert_confirmation(alert, cancel_url)
+    messages.success(request, "Job alert saved! We'll email you when a matching position is posted.")
+    return redirect(request.META.get('HTTP_REFERER', 'careers:job_list'))
+
+def job_alert_cancel(request, token):
+    updated = JobAlert.objects.filter(token=token, is_active=True).update(is_active=False)
+    if updated:
+        messages.success(request, 'Your job alert has been cancelled.')
+    else:
+        messages.info(request, 'This job alert is no longer active.')
+    return redirect('careers:job_list')
+
 from .models import Feedback
 
 def feedback(request):
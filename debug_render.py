@@ -7,7 +7,7 @@ from django.conf import settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'strategic_synergy.settings')
 django.setup()
 
-from careers.models import Application, Job
+from careers.models import Application, Job, Location
 from portal.views import Application as ViewApplication # Using Application model
 
 def debug_render():
@@ -16,7 +16,7 @@ def debug_render():
         # Create a dummy one if none exists
         job = Job.objects.first()
         if not job:
-            job = Job.objects.create(title="Test Job", location="Virtual")
+            job = Job.objects.create(title="Test Job", location=Location.objects.resolve("Virtual"))
         app = Application(id=1, full_name="Test User", job=job, status='PENDING')
     
     status_choices = Application.STATUS_CHOICES
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0003_alter_article_id_alter_resource_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['created_at', 'id'], name='insights_article_created'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['created_at', 'id'], name='insights_resource_created'),
+        ),
+    ]
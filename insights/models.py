@@ -25,6 +25,9 @@ class Article(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='insights_article_created'),
+        ]
 
 class Resource(models.Model):
     RESOURCE_TYPES = [
@@ -43,3 +46,8 @@ class Resource(models.Model):
 
     def __str__(self):
         return self.title
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='insights_resource_created'),
+        ]
@@ -8,7 +8,7 @@ import random
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'strategic_synergy.settings')
 django.setup()
 
-from careers.models import Job
+from careers.models import Job, Location
 from insights.models import Article
 
 def populate_jobs():
@@ -49,6 +49,7 @@ def populate_jobs():
     ]
 
     for job in jobs_data:
+        job["location"] = Location.objects.resolve(job["location"])
         Job.objects.get_or_create(
             title=job["title"],
             defaults=job
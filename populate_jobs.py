@@ -3,7 +3,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'strategic_synergy.settings')
 sys.path.insert(0, os.path.dirname(__file__))
 django.setup()
 
-from careers.models import Job
+from careers.models import Job, Location
 from django.utils import timezone
 from datetime import timedelta
 
@@ -103,7 +103,7 @@ jobs = [
 ]
 
 for j in jobs:
-    Job.objects.create(**j)
+    Job.objects.create(**{**j, 'location': Location.objects.resolve(j['location'])})
     print(f'Created: {j["title"]}')
 
 print(f'\nTotal jobs now: {Job.objects.count()}')
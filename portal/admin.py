@@ -1,8 +1,16 @@
 from django.contrib import admin
-from .models import ClientDocument
+from .models import ClientDocument, ExportJob
 
 @admin.register(ClientDocument)
 class ClientDocumentAdmin(admin.ModelAdmin):
     list_display = ('title', 'client', 'uploaded_at')
     list_filter = ('client', 'uploaded_at')
     search_fields = ('title', 'client__username', 'client__email')
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'format', 'status', 'requested_by', 'rows_written', 'total_rows', 'created_at', 'expires_at')
+    list_filter = ('kind', 'status', 'format')
+    search_fields = ('requested_by__username',)
+    readonly_fields = ('rows_written', 'total_rows', 'started_at', 'finished_at', 'error')
@@ -0,0 +1,180 @@
+"""
+Background exports for the HR portal.
+
+Exports too large to build inside a request (every application with its
+notes, every event registration, everyone's onboarding progress) are
+queued as ``ExportJob`` rows. The ``run_exports`` worker claims a queued
+job, streams the rows out of the database in chunks into a gzipped CSV or
+JSON Lines file, records progress as it goes and stores the file, outside
+MEDIA_ROOT, for download through the portal. A job left running by a worker
+that died is claimed again after ``RUNNING_TIMEOUT``. Finished files are
+deleted after ``EXPORT_RETENTION_DAYS``.
+"""
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.exports import csv_chunks, gzip_chunks, jsonl_chunks
+
+from .filters import filter_applications
+
+logger = logging.getLogger(__name__)
+
+# Rows between progress updates
+PROGRESS_ROWS = 2000
+ITERATOR_CHUNK_SIZE = 2000
+# A running export started longer ago than this has lost its worker and is queued again
+RUNNING_TIMEOUT = timedelta(hours=2)
+
+
+def application_rows(filters):
+    from careers.models import Application
+
+    applications = filter_applications(Application.objects.all(), filters).order_by('-applied_at', '-id')
+    statuses = dict(Application.STATUS_CHOICES)
+    header = ['ID', 'Name', 'Email', 'Phone', 'Job Title', 'Applied At', 'Status', 'Rating', 'Reviewed At', 'Notes']
+    rows = (
+        (app_id, name, email, phone, job_title, applied_at, statuses.get(status, status), rating, reviewed_at, notes)
+        for app_id, name, email, phone, job_title, applied_at, status, rating, reviewed_at, notes
+        in applications.values_list(
+            'id', 'full_name', 'email', 'phone', 'job__title', 'applied_at', 'status', 'rating', 'reviewed_at', 'notes',
+        ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    return header, rows, applications.count()
+
+
+def registration_rows(filters):
+    from events.models import Registration
+
+    registrations = Registration.objects.order_by('id')
+    header = ['ID', 'Event', 'Event Start', 'Name', 'Email', 'Phone', 'Registered At']
+    rows = registrations.values_list(
+        'id', 'event__title', 'event__start_time', 'name', 'email', 'phone', 'registered_at',
+    ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    return header, rows, registrations.count()
+
+
+def onboarding_rows(filters):
+    from onboarding.models import OnboardingAssignment
+
+    assignments = OnboardingAssignment.objects.order_by('id')
+    header = [
+        'ID', 'Employee', 'Email', 'Program', 'Assigned At', 'Due Date',
+        'Tasks Completed', 'Tasks Total', 'Progress %', 'Completed', 'Completed At',
+    ]
+    # Task counts in the same query rather than two per assignment
+    values = assignments.annotate(
+        tasks_total=Count('program__tasks', distinct=True),
+        tasks_completed=Count('task_completions', filter=Q(task_completions__is_completed=True), distinct=True),
+    ).values_list(
+        'id', 'employee__username', 'employee__email', 'program__title', 'assigned_at', 'due_date',
+        'tasks_completed', 'tasks_total', 'is_completed', 'completed_at',
+    )
+    rows = (
+        (pk, username, email, program, assigned_at, due_date, done, total,
+         int(done * 100 / total) if total else 100, is_completed, completed_at)
+        for pk, username, email, program, assigned_at, due_date, done, total, is_completed, completed_at
+        in values.iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    return header, rows, assignments.count()
+
+
+EXPORTS = {
+    'APPLICATIONS': application_rows,
+    'REGISTRATIONS': registration_rows,
+    'ONBOARDING': onboarding_rows,
+}
+
+
+def _track_progress(job, rows):
+    from .models import ExportJob
+
+    written = 0
+    for row in rows:
+        yield row
+        written += 1
+        if written % PROGRESS_ROWS == 0:
+            ExportJob.objects.filter(pk=job.pk).update(rows_written=written)
+    job.rows_written = written
+
+
+def claim_next():
+    """Mark the oldest queued (or abandoned) export as running and return it (None if there is none)."""
+    from .models import ExportJob
+
+    now = timezone.now()
+    claimable = ExportJob.objects.filter(
+        Q(status='PENDING') | Q(status='RUNNING', started_at__lt=now - RUNNING_TIMEOUT),
+    )
+    for job in claimable.order_by('created_at')[:10]:
+        # Only one worker can move a given job on from the state it was read in
+        claimed = ExportJob.objects.filter(pk=job.pk, status=job.status, started_at=job.started_at).update(
+            status='RUNNING', started_at=now, rows_written=0,
+        )
+        if claimed:
+            if job.status == 'RUNNING':
+                logger.warning('Export %s was abandoned by its worker; running it again', job.pk)
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_export(job):
+    """Write ``job``'s file and mark it done (or failed)."""
+    from .models import ExportJob
+
+    try:
+        header, rows, total = EXPORTS[job.kind](job.filters)
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=total)
+        job.total_rows = total
+
+        rows = _track_progress(job, rows)
+        if job.format == 'jsonl':
+            chunks = jsonl_chunks(dict(zip(header, row)) for row in rows)
+        else:
+            chunks = csv_chunks(header, rows)
+
+        with tempfile.TemporaryFile() as output:
+            for chunk in gzip_chunks(chunks):
+                output.write(chunk)
+            output.seek(0)
+            job.file.save(job.filename(), File(output), save=False)
+    except Exception as e:
+        logger.exception('Export %s failed', job.pk)
+        job.status = 'FAILED'
+        job.error = str(e)[:255] or e.__class__.__name__
+    else:
+        job.status = 'DONE'
+        job.expires_at = timezone.now() + timedelta(days=settings.EXPORT_RETENTION_DAYS)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'file', 'total_rows', 'rows_written', 'finished_at', 'expires_at'])
+    return job
+
+
+def run_pending():
+    """Run queued exports until the queue is empty; returns how many ran."""
+    ran = 0
+    while True:
+        job = claim_next()
+        if job is None:
+            return ran
+        run_export(job)
+        ran += 1
+
+
+def expire_exports():
+    """Delete the files of exports past their expiry; returns how many expired."""
+    from .models import ExportJob
+
+    expired = 0
+    for job in ExportJob.objects.filter(status='DONE', expires_at__lte=timezone.now()):
+        job.file.delete(save=False)
+        job.status = 'EXPIRED'
+        job.save(update_fields=['file', 'status'])
+        expired += 1
+    return expired
@@ -0,0 +1,63 @@
+"""
+Filters and orderings shared by the HR applications lists, their CSV export
+and the background application exports (portal.exports).
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from careers.search import get_search_backend
+
+# Keyset orderings for the applications lists; the trailing id makes each one total.
+# Each has an Application index alone and after the job filter (the applied_at ones
+# after the status filter too; a status narrows the others along their sort index), so
+# only these are accepted: anything else falls back to newest first.
+APPLICATION_SORTS = {
+    '-applied_at': ('-applied_at', '-id'),
+    'applied_at': ('applied_at', 'id'),
+    'full_name': ('full_name', 'id'),
+    '-rating': ('-rating', '-applied_at', '-id'),
+}
+# The date range filter's choices, in days. A range on applied_at can only be walked in
+# applied_at order: with a name or rating sort no index serves both (the range would be
+# sorted in a temp b-tree, or the whole sort index scanned), so a date range keeps these.
+DATE_RANGES = ('7', '30', '90')
+DATE_RANGE_SORTS = ('-applied_at', 'applied_at')
+
+
+def application_sort(params):
+    """The ``APPLICATION_SORTS`` key for ``params``: the requested sort, or newest first."""
+    sort_by = params.get('sort', '-applied_at')
+    if sort_by not in APPLICATION_SORTS:
+        return '-applied_at'
+    if params.get('date_range') in DATE_RANGES and sort_by not in DATE_RANGE_SORTS:
+        return '-applied_at'
+    return sort_by
+
+
+def filter_applications(applications, params):
+    """Apply the HR applications list filters (search, job, status, date range) in ``params``."""
+    # Search functionality
+    search_query = params.get('search', '')
+    if search_query:
+        backend = get_search_backend()
+        applications = applications.filter(
+            backend.application_filter(search_query) | backend.resume_filter(search_query)
+        )
+
+    # Filter by job
+    job_filter = params.get('job', '')
+    if job_filter.isdigit():
+        applications = applications.filter(job_id=int(job_filter))
+
+    # Filter by status
+    status_filter = params.get('status', '')
+    if status_filter:
+        applications = applications.filter(status=status_filter)
+
+    # Filter by date range
+    date_filter = params.get('date_range', '')
+    if date_filter in DATE_RANGES:
+        applications = applications.filter(applied_at__gte=timezone.now() - timedelta(days=int(date_filter)))
+
+    return applications
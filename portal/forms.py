@@ -1,7 +1,8 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from careers.models import Job
+from careers.locations import location_key
+from careers.models import Job, Location
 from insights.models import Article, Resource
 
 class RegistrationForm(UserCreationForm):
@@ -18,9 +19,29 @@ class RegistrationForm(UserCreationForm):
         return email
 
 class JobForm(forms.ModelForm):
+    location = forms.CharField(max_length=100, help_text="e.g. Harare, Zimbabwe")
+    field_order = ['title', 'location']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.location_id:
+            self.initial['location'] = str(self.instance.location)
+
+    def clean_location(self):
+        location = self.cleaned_data['location']
+        if not location_key(location):
+            raise forms.ValidationError("Enter a valid location.")
+        return location
+
+    def save(self, commit=True):
+        # Free text is matched against known locations (and their aliases) or added as a new one,
+        # only once the form is valid so a rejected submission leaves no stray Location behind
+        self.instance.location = Location.objects.resolve(self.cleaned_data['location'])
+        return super().save(commit)
+
     class Meta:
         model = Job
-        fields = ['title', 'location', 'job_type', 'description', 'requirements', 'salary_range', 'deadline', 'is_active']
+        fields = ['title', 'job_type', 'description', 'requirements', 'salary_range', 'deadline', 'is_active']
         widgets = {
             'description': forms.Textarea(attrs={'rows': 4}),
             'requirements': forms.Textarea(attrs={'rows': 4}),
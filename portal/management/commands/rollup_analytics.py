@@ -0,0 +1,31 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from portal.rollups import run_rollups
+
+
+class Command(BaseCommand):
+    help = 'Fold the days since the last run into the daily analytics rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--through', type=datetime.date.fromisoformat, default=None,
+                            help='Last day to roll up, YYYY-MM-DD (defaults to yesterday)')
+        parser.add_argument('--rebuild', action='store_true', help='Recompute every day from the first one with data')
+        parser.add_argument('--loop', action='store_true', help='Keep running once an interval instead of exiting')
+        parser.add_argument('--interval', type=int, default=3600, help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        rebuild = options['rebuild']
+        while True:
+            processed = run_rollups(through=options['through'], rebuild=rebuild)
+            for name, days in processed.items():
+                if days:
+                    self.stdout.write(f'Rolled up {days} days of {name}.')
+            rebuild = False
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
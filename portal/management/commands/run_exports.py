@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portal.exports import expire_exports, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Write queued HR portal exports to compressed files and delete expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new exports instead of exiting')
+        parser.add_argument('--interval', type=int, default=10, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            expired = expire_exports()
+            if expired:
+                self.stdout.write(f'Deleted {expired} expired exports.')
+            ran = run_pending()
+            total += ran
+            if ran:
+                self.stdout.write(f'Finished {ran} exports ({total} total).')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Ran {total} exports.'))
@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-18 10:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0019_job_posted_index'),
+        ('events', '0001_initial'),
+        ('portal', '0002_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySiteStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('new_subscribers', models.PositiveIntegerField(default=0)),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('feedback_rating_total', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'daily site stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('through', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='careers.job')),
+            ],
+            options={
+                'verbose_name_plural': 'daily application stats',
+                'constraints': [models.UniqueConstraint(fields=('day', 'job', 'status'), name='portal_dailyappstats_day_job_status')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRegistrationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='events.event')),
+            ],
+            options={
+                'verbose_name_plural': 'daily registration stats',
+                'constraints': [models.UniqueConstraint(fields=('day', 'event'), name='portal_dailyregstats_day_event')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 11:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0003_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='dailysitestats',
+            name='feedback_count',
+        ),
+        migrations.RemoveField(
+            model_name='dailysitestats',
+            name='feedback_rating_total',
+        ),
+    ]
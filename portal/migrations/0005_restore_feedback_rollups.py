@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 11:17
+
+from django.db import migrations, models
+
+
+def reset_rollups(apps, schema_editor):
+    # Application rows now follow the day each application was received, and the site rows
+    # carry feedback again: drop both so the next rollup_analytics run rebuilds them
+    DailyApplicationStats = apps.get_model('portal', 'DailyApplicationStats')
+    DailySiteStats = apps.get_model('portal', 'DailySiteStats')
+    RollupWatermark = apps.get_model('portal', 'RollupWatermark')
+    DailyApplicationStats.objects.all().delete()
+    DailySiteStats.objects.all().delete()
+    RollupWatermark.objects.filter(name__in=['applications', 'site']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0004_drop_feedback_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailysitestats',
+            name='feedback_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dailysitestats',
+            name='feedback_rating_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(reset_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 11:20
+
+import portal.models
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def expire_public_exports(apps, schema_editor):
+    # Files written so far sit under MEDIA_ROOT: delete them rather than leave them public
+    ExportJob = apps.get_model('portal', 'ExportJob')
+    for job in ExportJob.objects.exclude(file=''):
+        default_storage.delete(job.file.name)
+        job.file = ''
+        if job.status == 'DONE':
+            job.status = 'EXPIRED'
+        job.save(update_fields=['file', 'status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0005_restore_feedback_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(expire_public_exports, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=portal.models.export_storage, upload_to=portal.models.export_upload_to),
+        ),
+    ]
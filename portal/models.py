@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -10,3 +12,127 @@ class ClientDocument(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.client.username}"
+
+
+def export_storage():
+    # Exports hold applicants' personal details: kept out of MEDIA_ROOT (served to anyone),
+    # they can only be fetched through the HR download view
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT / 'exports')
+
+
+def export_upload_to(instance, filename):
+    return f'{instance.kind.lower()}/{filename}'
+
+
+class ExportJob(models.Model):
+    """A large export requested from the HR portal and written by the run_exports worker."""
+    KIND_CHOICES = [
+        ('APPLICATIONS', 'Applications'),
+        ('REGISTRATIONS', 'Event Registrations'),
+        ('ONBOARDING', 'Onboarding Progress'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Ready'),
+        ('FAILED', 'Failed'),
+        ('EXPIRED', 'Expired'),
+    ]
+
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    filters = models.JSONField(default=dict, blank=True, help_text="List filters (search, job, status, date_range) for application exports")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to=export_upload_to, storage=export_storage, blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} export #{self.pk} ({self.status})"
+
+    def progress_percent(self):
+        if self.status == 'DONE':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.rows_written * 100 / self.total_rows))
+
+    def filename(self):
+        return f"{self.kind.lower()}-{self.pk}.{self.format}.gz"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='portal_export_status_created'),
+        ]
+
+
+class DailyApplicationStats(models.Model):
+    """
+    Applications of a job received on ``day`` that have reached ``status``, filled by portal.rollups.
+
+    ``PENDING`` rows count all the applications received that day.
+    """
+    day = models.DateField()
+    job = models.ForeignKey('careers.Job', on_delete=models.CASCADE, related_name='daily_stats')
+    status = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.job_id} {self.status}: {self.count}"
+
+    class Meta:
+        verbose_name_plural = 'daily application stats'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'job', 'status'], name='portal_dailyappstats_day_job_status'),
+        ]
+
+
+class DailyRegistrationStats(models.Model):
+    """Event registrations received on ``day``, filled by portal.rollups."""
+    day = models.DateField()
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='daily_stats')
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.event_id}: {self.count}"
+
+    class Meta:
+        verbose_name_plural = 'daily registration stats'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'event'], name='portal_dailyregstats_day_event'),
+        ]
+
+
+class DailySiteStats(models.Model):
+    """New newsletter subscribers and feedback received on ``day``, filled by portal.rollups."""
+    day = models.DateField(unique=True)
+    new_subscribers = models.PositiveIntegerField(default=0)
+    feedback_count = models.PositiveIntegerField(default=0)
+    feedback_rating_total = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.day)
+
+    class Meta:
+        verbose_name_plural = 'daily site stats'
+
+
+class RollupWatermark(models.Model):
+    """The last day a rollup has been computed through."""
+    name = models.CharField(max_length=50, unique=True)
+    through = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} through {self.through}"
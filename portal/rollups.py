@@ -0,0 +1,312 @@
+"""
+Daily rollups behind the HR analytics page.
+
+Instead of grouping raw rows on every visit, the ``rollup_analytics``
+command folds each finished day into small summary tables:
+
+* ``DailyApplicationStats``: per day and job, the applications received
+  that day (``PENDING``) and, per status, how many of them have reached it
+  so far, from the status events. A move adds to the row of the day its
+  application was received, so each day's rows follow one cohort.
+* ``DailyRegistrationStats``: per day and event, new registrations.
+* ``DailySiteStats``: per day, new newsletter subscribers and feedback.
+
+Each rollup keeps a ``RollupWatermark``, the last day it covers, and a run
+only processes the days after it, up to yesterday. Days are bucketed in
+the site time zone. Readers combine the rollups with the raw rows after
+the watermark, usually just today's, so results are always current.
+"""
+import datetime
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, DateField, Exists, F, Min, OuterRef, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+# Days rolled up per transaction
+CHUNK_DAYS = 31
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _bounds(start, end):
+    """``[start 00:00, end + 1 day 00:00)`` as aware datetimes, so range filters use the indexes."""
+    return _day_start(start), _day_start(end + ONE_DAY)
+
+
+def _first_day(queryset, field):
+    first = queryset.aggregate(first=Min(field))['first']
+    return timezone.localdate(first) if first else None
+
+
+def _replace(model, start, end, rows):
+    model.objects.filter(day__gte=start, day__lte=end).delete()
+    model.objects.bulk_create(rows)
+
+
+def first_arrivals(events):
+    """The status events that are their application's first move into that status."""
+    from careers.models import ApplicationStatusEvent
+
+    earlier = ApplicationStatusEvent.objects.filter(
+        Q(changed_at__lt=OuterRef('changed_at')) | Q(changed_at=OuterRef('changed_at'), id__lt=OuterRef('id')),
+        application_id=OuterRef('application_id'),
+        to_status=OuterRef('to_status'),
+    )
+    return events.exclude(to_status='PENDING').exclude(Exists(earlier))
+
+
+def roll_applications(start, end):
+    from careers.models import Application, ApplicationStatusEvent
+    from .models import DailyApplicationStats
+
+    lo, hi = _bounds(start, end)
+    counts = Counter()
+    received = (
+        Application.objects.filter(applied_at__gte=lo, applied_at__lt=hi)
+        .annotate(day=TruncDate('applied_at')).order_by()
+        .values_list('day', 'job_id').annotate(total=Count('id'))
+    )
+    for day, job_id, total in received:
+        counts[(day, job_id, 'PENDING')] += total
+    # Each application counts once per status, on the day it was received
+    reached = (
+        first_arrivals(ApplicationStatusEvent.objects.filter(changed_at__gte=lo, changed_at__lt=hi))
+        .annotate(day=TruncDate('application__applied_at')).order_by()
+        .values_list('day', 'job_id', 'to_status').annotate(total=Count('id'))
+    )
+    earlier_days = []
+    for day, job_id, status, total in reached:
+        if day >= start:
+            counts[(day, job_id, status)] += total
+        else:
+            earlier_days.append((day, job_id, status, total))
+
+    _replace(DailyApplicationStats, start, end, [
+        DailyApplicationStats(day=day, job_id=job_id, status=status, count=total)
+        for (day, job_id, status), total in counts.items()
+    ])
+    # Moves of applications received before this range add to their days' rows
+    for day, job_id, status, total in earlier_days:
+        updated = DailyApplicationStats.objects.filter(day=day, job_id=job_id, status=status).update(
+            count=F('count') + total,
+        )
+        if not updated:
+            DailyApplicationStats.objects.create(day=day, job_id=job_id, status=status, count=total)
+
+
+def roll_registrations(start, end):
+    from events.models import Registration
+    from .models import DailyRegistrationStats
+
+    lo, hi = _bounds(start, end)
+    rows = (
+        Registration.objects.filter(registered_at__gte=lo, registered_at__lt=hi)
+        .annotate(day=TruncDate('registered_at')).order_by()
+        .values_list('day', 'event_id').annotate(total=Count('id'))
+    )
+    _replace(DailyRegistrationStats, start, end, [
+        DailyRegistrationStats(day=day, event_id=event_id, count=total) for day, event_id, total in rows
+    ])
+
+
+def roll_site(start, end):
+    from core.models import Feedback, NewsletterSubscriber
+    from .models import DailySiteStats
+
+    lo, hi = _bounds(start, end)
+    days = {}
+    subscribers = (
+        NewsletterSubscriber.objects.filter(subscribed_at__gte=lo, subscribed_at__lt=hi)
+        .annotate(day=TruncDate('subscribed_at')).order_by()
+        .values_list('day').annotate(total=Count('id'))
+    )
+    for day, total in subscribers:
+        days.setdefault(day, DailySiteStats(day=day)).new_subscribers = total
+    feedback = (
+        Feedback.objects.filter(created_at__gte=lo, created_at__lt=hi)
+        .annotate(day=TruncDate('created_at')).order_by()
+        .values_list('day').annotate(total=Count('id'), ratings=Sum('rating'))
+    )
+    for day, total, ratings in feedback:
+        stats = days.setdefault(day, DailySiteStats(day=day))
+        stats.feedback_count = total
+        stats.feedback_rating_total = ratings or 0
+    _replace(DailySiteStats, start, end, list(days.values()))
+
+
+def _first_application_day():
+    from careers.models import Application
+    return _first_day(Application.objects.all(), 'applied_at')
+
+
+def _first_registration_day():
+    from events.models import Registration
+    return _first_day(Registration.objects.all(), 'registered_at')
+
+
+def _first_site_day():
+    from core.models import Feedback, NewsletterSubscriber
+    days = [
+        _first_day(NewsletterSubscriber.objects.all(), 'subscribed_at'),
+        _first_day(Feedback.objects.all(), 'created_at'),
+    ]
+    return min((day for day in days if day), default=None)
+
+
+# Rollup name -> (first day with data, function rolling up a range of days)
+ROLLUPS = {
+    'applications': (_first_application_day, roll_applications),
+    'registrations': (_first_registration_day, roll_registrations),
+    'site': (_first_site_day, roll_site),
+}
+
+
+def rolled_through(name):
+    """The last day rollup ``name`` covers, or None if it has never run."""
+    from .models import RollupWatermark
+
+    return RollupWatermark.objects.filter(name=name).values_list('through', flat=True).first()
+
+
+def run_rollups(through=None, rebuild=False, chunk_days=CHUNK_DAYS):
+    """
+    Roll up every day after each rollup's watermark, through ``through`` (default yesterday).
+
+    With ``rebuild`` the rollups start over from the first day with data.
+    Returns ``{name: days processed}``.
+    """
+    from .models import RollupWatermark
+
+    through = through or timezone.localdate() - ONE_DAY
+    processed = {}
+    for name, (first_day, roll) in ROLLUPS.items():
+        watermark = None if rebuild else rolled_through(name)
+        start = watermark + ONE_DAY if watermark else (first_day() or through + ONE_DAY)
+        days = 0
+        while start <= through:
+            end = min(start + datetime.timedelta(days=chunk_days - 1), through)
+            with transaction.atomic():
+                roll(start, end)
+                RollupWatermark.objects.update_or_create(name=name, defaults={'through': end})
+            days += (end - start).days + 1
+            start = end + ONE_DAY
+        if not RollupWatermark.objects.filter(name=name).exists():
+            # Nothing to roll up yet: later runs start from today
+            RollupWatermark.objects.create(name=name, through=through)
+        processed[name] = days
+    return processed
+
+
+def _tail_start(name):
+    """Where the raw rows not yet in rollup ``name`` begin (None: nothing is rolled up)."""
+    through = rolled_through(name)
+    return _day_start(through + ONE_DAY) if through else None
+
+
+def applications_by_month(since):
+    """``[(month, applications received)]`` from the date ``since`` onwards, oldest first."""
+    from careers.models import Application
+    from .models import DailyApplicationStats
+
+    months = Counter()
+    rolled = (
+        DailyApplicationStats.objects.filter(status='PENDING', day__gte=since)
+        .annotate(month=TruncMonth('day')).order_by()
+        .values_list('month').annotate(total=Sum('count'))
+    )
+    months.update(dict(rolled))
+
+    start = _day_start(since)
+    tail = _tail_start('applications')
+    if tail is not None:
+        start = max(start, tail)
+    recent = (
+        Application.objects.filter(applied_at__gte=start)
+        .annotate(month=TruncMonth('applied_at', output_field=DateField())).order_by()
+        .values_list('month').annotate(total=Count('id'))
+    )
+    months.update(dict(recent))
+    return sorted(months.items())
+
+
+def stage_cohort(since):
+    """
+    ``{status: applications received from the date ``since`` that reached it}``.
+
+    ``PENDING`` is every application received. Each application counts once
+    per status, whenever it got there, so no stage exceeds ``PENDING``.
+    """
+    from careers.models import Application, ApplicationStatusEvent
+    from .models import DailyApplicationStats
+
+    counts = Counter(dict(
+        DailyApplicationStats.objects.filter(day__gte=since).order_by()
+        .values_list('status').annotate(total=Sum('count'))
+    ))
+    start = _day_start(since)
+    tail = _tail_start('applications')
+    moves = ApplicationStatusEvent.objects.filter(application__applied_at__gte=start)
+    received = Application.objects.filter(applied_at__gte=start)
+    if tail is not None:
+        moves = moves.filter(changed_at__gte=tail)
+        received = received.filter(applied_at__gte=tail)
+    counts['PENDING'] += received.count()
+    counts.update(dict(
+        first_arrivals(moves).order_by().values_list('to_status').annotate(total=Count('id'))
+    ))
+    return counts
+
+
+def registrations_by_event(events):
+    """``{event_id: registrations}`` for the given events."""
+    from events.models import Registration
+    from .models import DailyRegistrationStats
+
+    event_ids = [event.pk for event in events]
+    counts = Counter(dict(
+        DailyRegistrationStats.objects.filter(event_id__in=event_ids).order_by()
+        .values_list('event_id').annotate(total=Sum('count'))
+    ))
+    raw = Registration.objects.filter(event_id__in=event_ids)
+    tail = _tail_start('registrations')
+    if tail is not None:
+        raw = raw.filter(registered_at__gte=tail)
+    counts.update(dict(raw.order_by().values_list('event_id').annotate(total=Count('id'))))
+    return counts
+
+
+def new_subscribers(since):
+    """Newsletter sign-ups from the date ``since`` onwards."""
+    from core.models import NewsletterSubscriber
+    from .models import DailySiteStats
+
+    total = DailySiteStats.objects.filter(day__gte=since).aggregate(total=Sum('new_subscribers'))['total'] or 0
+    tail = _tail_start('site')
+    start = _day_start(since)
+    if tail is not None:
+        start = max(start, tail)
+    return total + NewsletterSubscriber.objects.filter(subscribed_at__gte=start).count()
+
+
+def feedback_summary(since):
+    """``(feedback received, average rating or None)`` from the date ``since`` onwards."""
+    from core.models import Feedback
+    from .models import DailySiteStats
+
+    rolled = DailySiteStats.objects.filter(day__gte=since).aggregate(
+        count=Sum('feedback_count'), ratings=Sum('feedback_rating_total'),
+    )
+    tail = _tail_start('site')
+    start = _day_start(since)
+    if tail is not None:
+        start = max(start, tail)
+    recent = Feedback.objects.filter(created_at__gte=start).aggregate(count=Count('id'), ratings=Sum('rating'))
+    count = (rolled['count'] or 0) + recent['count']
+    ratings = (rolled['ratings'] or 0) + (recent['ratings'] or 0)
+    return count, round(ratings / count, 1) if count else None
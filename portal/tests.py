@@ -1,3 +1,309 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from careers.models import Application, ApplicationStatusEvent, Job, Location
+from core.models import QueuedEmail
+from core.notifications import send_queued_emails
+
+from .exports import RUNNING_TIMEOUT, claim_next, run_pending
+from .filters import APPLICATION_SORTS, application_sort, filter_applications
+from .models import DailyApplicationStats, ExportJob, export_storage
+from .rollups import run_rollups, stage_cohort
+from .views import DASHBOARD_PAGE_SIZE
+
+
+class DashboardSectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        location = Location.objects.resolve('Harare')
+        for i in range(DASHBOARD_PAGE_SIZE + 5):
+            Job.objects.create(title=f'Job {i}', location=location, description='d', requirements='r')
+
+    def setUp(self):
+        self.client.force_login(self.hr)
+
+    def test_first_page_is_rendered_and_the_rest_fetched(self):
+        response = self.client.get(reverse('portal:hr_dashboard'))
+        section = response.context['jobs_section']
+        self.assertEqual(len(section['items']), DASHBOARD_PAGE_SIZE)
+        self.assertEqual(response.context['job_count'], DASHBOARD_PAGE_SIZE + 5)
+        self.assertEqual(section['items'][0]['title'], f'Job {DASHBOARD_PAGE_SIZE + 4}')
+
+        url = reverse('portal:hr_dashboard_feed', args=['jobs'])
+        data = self.client.get(url, {'cursor': section['page'].next_cursor}).json()
+        self.assertEqual(data['count'], 5)
+        self.assertFalse(data['has_next'])
+        self.assertIn('Job 0', data['html'])
+
+    def test_unknown_sections_are_not_found(self):
+        self.assertEqual(self.client.get(reverse('portal:hr_dashboard_feed', args=['users'])).status_code, 404)
+
+
+class BestMatchPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        cls.job = Job.objects.create(
+            title='Analyst', location=Location.objects.resolve('Harare'), description='d', requirements='r',
+        )
+        for i in range(60):
+            Application.objects.create(
+                job=cls.job, full_name=f'Applicant {i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+        # Ties on the score and a tail of unscored (-1) applications, as after a partial run
+        for app in Application.objects.filter(job=cls.job)[:45]:
+            Application.objects.filter(pk=app.pk).update(match_score=(app.pk % 7) / 10)
+
+    def setUp(self):
+        self.client.force_login(self.hr)
+
+    def page(self, cursor=None):
+        params = {'sort': 'best_match', 'format': 'json'}
+        if cursor:
+            params['cursor'] = cursor
+        url = reverse('portal:hr_job_applications', args=[self.job.pk])
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url, params).json()
+        return data, [query['sql'] for query in queries if 'ORDER BY' in query['sql']]
+
+    def test_pages_follow_the_score_order(self):
+        expected = list(
+            self.job.applications.order_by('-match_score', '-applied_at', '-id').values_list('id', flat=True)
+        )
+        seen, data = [], {'next_cursor': None, 'has_next': True}
+        while data['has_next']:
+            data, _ = self.page(data['next_cursor'])
+            seen += [app['id'] for app in data['applications']]
+        self.assertEqual(seen, expected)
+        self.assertIsNone(data['applications'][-1]['match_score'])
+
+    def test_cursor_pages_are_index_range_scans_on_the_raw_column(self):
+        first, _ = self.page()
+        _, queries = self.page(first['next_cursor'])
+        sql = queries[-1]
+        self.assertIn('"careers_application"."match_score" <', sql)
+        self.assertNotIn('COALESCE', sql.upper())
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('careers_app_job_match', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class CandidateGroupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        location = Location.objects.resolve('Harare')
+        for title in ['Clerk', 'Driver']:
+            job = Job.objects.create(title=title, location=location, description='d', requirements='r')
+            Application.objects.create(
+                job=job, full_name='Jane', email='jane@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+        Application.objects.create(job=job, full_name='John', email='john@example.com', phone='1', resume='resumes/cv.pdf')
+
+    def test_one_row_per_candidate_with_their_latest_application(self):
+        self.client.force_login(self.hr)
+        data = self.client.get(reverse('portal:hr_all_applications'), {'group': 'candidate', 'format': 'json'}).json()
+        rows = {app['full_name']: app for app in data['applications']}
+        self.assertEqual(data['count'], 2)
+        self.assertEqual((rows['Jane']['job_title'], rows['Jane']['candidate_applications']), ('Driver', 2))
+        self.assertEqual(rows['John']['candidate_applications'], 1)
+
+
+class ApplicationSortTests(SimpleTestCase):
+    def test_only_whitelisted_sorts_are_accepted(self):
+        self.assertEqual(application_sort({'sort': 'full_name'}), 'full_name')
+        self.assertEqual(application_sort({'sort': 'email'}), '-applied_at')
+        self.assertEqual(application_sort({}), '-applied_at')
+
+    def test_date_ranges_keep_the_applied_at_sorts(self):
+        self.assertEqual(application_sort({'sort': 'applied_at', 'date_range': '30'}), 'applied_at')
+        self.assertEqual(application_sort({'sort': '-rating', 'date_range': '30'}), '-applied_at')
+        self.assertEqual(application_sort({'sort': '-rating', 'date_range': '365'}), '-rating')
+
+
+class StageCohortTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        now = timezone.now()
+        for i, applied_days_ago in enumerate([400, 300, 10]):
+            app = Application.objects.create(
+                job=job, full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+            # Hired five days ago, whenever they applied; the last one twice over
+            for status in ['HIRED', 'REVIEWED', 'HIRED'] if i == 2 else ['HIRED']:
+                app.status = status
+                app.save()
+            Application.objects.filter(pk=app.pk).update(applied_at=now - datetime.timedelta(days=applied_days_ago))
+        ApplicationStatusEvent.objects.exclude(to_status='PENDING').update(changed_at=now - datetime.timedelta(days=5))
+        cls.since = timezone.localdate() - datetime.timedelta(days=180)
+
+    def test_moves_of_older_applications_stay_out_of_the_cohort(self):
+        self.assertEqual(stage_cohort(self.since), {'PENDING': 1, 'HIRED': 1, 'REVIEWED': 1})
+
+    def test_rolled_up_counts_match_the_raw_ones(self):
+        raw = stage_cohort(self.since)
+        run_rollups()
+        self.assertTrue(DailyApplicationStats.objects.filter(status='HIRED').exists())
+        with self.assertNumQueries(4):
+            self.assertEqual(stage_cohort(self.since), raw)
+
+
+class CSVExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        for name in ['Carol', 'Alice', 'Bob']:
+            Application.objects.create(
+                job=job, full_name=name, email=f'{name.lower()}@example.com', phone='1', resume='resumes/cv.pdf',
+                status='PENDING' if name == 'Bob' else 'REVIEWED',
+            )
+
+    def export(self, **params):
+        self.client.force_login(self.hr)
+        response = self.client.get(reverse('portal:hr_export_applications'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_export_streams_the_filtered_list_in_its_order(self):
+        response, content = self.export(status='REVIEWED', sort='full_name')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(content.decode())))
+        self.assertEqual(rows[0][0], 'Name')
+        self.assertEqual([row[0] for row in rows[1:]], ['Alice', 'Carol'])
+        self.assertEqual(rows[1][5], 'Reviewed')
+
+    def test_gzip_export_holds_the_same_csv(self):
+        _, plain = self.export(sort='full_name')
+        response, packed = self.export(sort='full_name', compress='gzip')
+        self.assertIn('applications.csv.gz', response['Content-Disposition'])
+        self.assertEqual(gzip.decompress(packed), plain)
+
+
+class ExportWorkerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        for i in range(3):
+            Application.objects.create(
+                job=job, full_name=f'Applicant {i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+                status='REVIEWED' if i else 'PENDING',
+            )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = mock.patch.object(ExportJob._meta.get_field('file'), 'storage', FileSystemStorage(directory.name))
+        storage.start()
+        self.addCleanup(storage.stop)
+
+    def test_files_are_kept_out_of_media_root(self):
+        location = Path(export_storage().location)
+        self.assertFalse(location.is_relative_to(Path(settings.MEDIA_ROOT).resolve()))
+
+    def test_worker_writes_the_filtered_applications(self):
+        export = ExportJob.objects.create(requested_by=self.hr, kind='APPLICATIONS', filters={'status': 'REVIEWED'})
+        self.assertEqual(run_pending(), 1)
+        export.refresh_from_db()
+        self.assertEqual((export.status, export.total_rows, export.rows_written), ('DONE', 2, 2))
+        with export.file.open('rb') as f:
+            lines = gzip.decompress(f.read()).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+        self.client.force_login(self.hr)
+        response = self.client.get(reverse('portal:hr_export_download', args=[export.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.client.force_login(User.objects.create_user('client', password='pw'))
+        response = self.client.get(reverse('portal:hr_export_download', args=[export.pk]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_abandoned_running_exports_are_claimed_again(self):
+        started = timezone.now() - RUNNING_TIMEOUT
+        stale = ExportJob.objects.create(requested_by=self.hr, kind='REGISTRATIONS', status='RUNNING', started_at=started)
+        ExportJob.objects.create(
+            requested_by=self.hr, kind='ONBOARDING', status='RUNNING', started_at=timezone.now(),
+        )
+        with self.assertLogs('portal.exports', 'WARNING'):
+            job = claim_next()
+        self.assertEqual(job.pk, stale.pk)
+        self.assertGreater(job.started_at, started)
+        self.assertIsNone(claim_next())
+
+
+class BulkUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user('hr', password='pw', is_staff=True)
+        job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        cls.ids = [
+            Application.objects.create(
+                job=job, full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+                status='REVIEWED' if i == 2 else 'PENDING',
+            ).pk
+            for i in range(3)
+        ]
+
+    def test_status_emails_are_queued_with_the_update(self):
+        self.client.force_login(self.hr)
+        response = self.client.post(
+            reverse('portal:hr_bulk_update'), {'ids': self.ids, 'status': 'REVIEWED'}, content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'success': True, 'updated': 3, 'notified': 2})
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(QueuedEmail.objects.filter(sent_at__isnull=True).count(), 2)
+
+        self.assertEqual(send_queued_emails(batch_size=1), 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['a0@example.com', 'a1@example.com'])
+        self.assertEqual(send_queued_emails(), 0)
+
+
+class ApplicationIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = Job.objects.create(title='Clerk', location=Location.objects.resolve('Harare'), description='d', requirements='r')
+        for i in range(3):
+            app = Application.objects.create(
+                job=cls.job, full_name=f'A{i}', email=f'a{i}@example.com', phone='1', resume='resumes/cv.pdf',
+            )
+            app.status = 'REVIEWED'
+            app.save()
+
+    def plan(self, params, sort):
+        applications = filter_applications(Application.objects.all(), params).order_by(*APPLICATION_SORTS[sort])[:25]
+        sql, sql_params = applications.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', sql_params)
+            return ' '.join(row[-1] for row in cursor.fetchall())
+
+    def test_job_and_status_lists_walk_the_job_sort_index(self):
+        params = {'job': str(self.job.pk), 'status': 'REVIEWED'}
+        for sort, index in [('full_name', 'careers_app_job_name'), ('-rating', 'careers_app_job_rating_applied')]:
+            plan = self.plan(params, sort)
+            self.assertIn(index, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+        self.assertIn('careers_app_job_status_applied', self.plan(params, '-applied_at'))
+
+    def test_deleting_a_job_drops_its_events_with_the_applications(self):
+        self.assertEqual(ApplicationStatusEvent.objects.filter(job=self.job).count(), 6)
+        self.job.delete()
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
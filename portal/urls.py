@@ -27,6 +27,7 @@ urlpatterns = [
     
     # HR Dashboard
     path('hr-dashboard/', views.hr_dashboard, name='hr_dashboard'),
+    path('hr-dashboard/feed/<str:section>/', views.hr_dashboard_feed, name='hr_dashboard_feed'),
     
     # Jobs
     path('hr-dashboard/add-job/', views.hr_add_job, name='hr_add_job'),
@@ -38,9 +39,14 @@ urlpatterns = [
     # Application Management AJAX Endpoints
     path('hr-applications/update-rating/<int:app_id>/', views.hr_update_application_rating, name='hr_update_rating'),
     path('hr-applications/update-status/<int:app_id>/', views.hr_update_application_status, name='hr_update_status'),
+    path('hr-applications/bulk-update/', views.hr_bulk_update_applications, name='hr_bulk_update'),
     path('hr-applications/add-note/<int:app_id>/', views.hr_add_application_note, name='hr_add_note'),
     path('hr-applications/export/', views.hr_export_applications, name='hr_export_applications'),
 
+    # Background exports
+    path('hr-dashboard/exports/', views.hr_exports, name='hr_exports'),
+    path('hr-dashboard/exports/<int:export_id>/download/', views.hr_export_download, name='hr_export_download'),
+
     # Articles
     path('hr-dashboard/add-article/', views.hr_add_article, name='hr_add_article'),
     path('hr-dashboard/edit-article/<int:article_id>/', views.hr_edit_article, name='hr_edit_article'),
@@ -1,13 +1,34 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.views import LoginView
 from django.contrib.auth import login
 from django.contrib import messages
-from .models import ClientDocument
+from .models import ClientDocument, ExportJob
 from careers.models import Job, Application
+from careers.durations import duration_percentiles
+from careers.salary import CURRENCY_CODES, default_currency, salary_filter
+from careers.stats import status_counts
+from core.pagination import bounded_count, keyset_paginate
 from insights.models import Article, Resource
+from .filters import APPLICATION_SORTS, application_sort, filter_applications
 from .forms import JobForm, ArticleForm, ResourceForm, RegistrationForm
 
+APPLICATIONS_PER_PAGE = 25
+# Filtered searches are counted up to this many matches ("1000+")
+APPLICATION_COUNT_CAP = 1000
+# Most applications one bulk status/rating request may change
+BULK_UPDATE_LIMIT = 1000
+
+DASHBOARD_PAGE_SIZE = 20
+# Dashboard section -> (fragment template for its rows, keyset ordering)
+DASHBOARD_SECTIONS = {
+    'jobs': ('portal/_dashboard_jobs.html', ('-posted_at', '-id')),
+    'articles': ('portal/_dashboard_articles.html', ('-created_at', '-id')),
+    'resources': ('portal/_dashboard_resources.html', ('-created_at', '-id')),
+}
+
+
 class PortalLoginView(LoginView):
     template_name = 'portal/login.html'
     redirect_authenticated_user = True
@@ -37,33 +58,99 @@ def dashboard(request):
 def is_hr_manager(user):
     return user.is_staff
 
-@login_required
-@user_passes_test(is_hr_manager)
-def hr_dashboard(request):
-    jobs = Job.objects.all().order_by('-posted_at')
-    articles = Article.objects.all().order_by('-created_at')
-    resources = Resource.objects.all().order_by('-created_at')
-    
-    # Pre-format job data to avoid template rendering issues
-    jobs_data = []
-    for job in jobs:
-        jobs_data.append({
+def format_salary(job):
+    if job.salary_min is None:
+        return job.salary_range or '—'
+    amount = f"{job.salary_min:,}" if job.salary_min == job.salary_max else f"{job.salary_min:,} – {job.salary_max:,}"
+    return f"{job.salary_currency} {amount}".strip()
+
+def _dashboard_section(section, params):
+    """Queryset behind one HR dashboard section, loading only the columns it shows."""
+    if section == 'jobs':
+        jobs = Job.objects.select_related('location').only(
+            'id', 'title', 'location', 'location__name', 'location__region', 'salary_min', 'salary_max', 'salary_currency',
+            'salary_range', 'posted_at', 'deadline',
+        )
+        # Salary range filter on the parsed bounds, within one currency (index-backed range query)
+        salary_min = params.get('salary_min', '')
+        salary_max = params.get('salary_max', '')
+        salary_min = int(salary_min) if salary_min.isdigit() else None
+        salary_max = int(salary_max) if salary_max.isdigit() else None
+        if salary_min or salary_max:
+            currency = params.get('currency', '').upper()
+            jobs = jobs.filter(salary_filter(salary_min, salary_max, currency if currency in CURRENCY_CODES else ''))
+        return jobs
+    if section == 'articles':
+        return Article.objects.only('id', 'title', 'created_at')
+    return Resource.objects.only('id', 'title', 'resource_type', 'created_at')
+
+
+def _dashboard_page(section, params, cursor=None):
+    """One keyset page of a dashboard section, as the context its fragment template renders."""
+    template, ordering = DASHBOARD_SECTIONS[section]
+    page = keyset_paginate(_dashboard_section(section, params), ordering, cursor, DASHBOARD_PAGE_SIZE)
+    items = page.items
+    if section == 'jobs':
+        # Pre-format job data to avoid template rendering issues
+        items = [{
             'id': job.id,
             'title': job.title,
             'location': job.location,
+            'salary': format_salary(job),
             'posted_at': job.posted_at.strftime('%b %d, %Y'),
             'deadline': job.deadline.strftime('%b %d, %Y') if job.deadline else 'None',
             'has_deadline': job.deadline is not None,
-        })
+        } for job in items]
+    return {'items': items, 'page': page, 'section': section}
+
+
+@login_required
+@user_passes_test(is_hr_manager)
+def hr_dashboard(request):
+    # Only the first page of each section is rendered; "Load more" fetches the rest from hr_dashboard_feed
+    sections = {
+        section: _dashboard_page(section, request.GET, request.GET.get(f'{section}_cursor'))
+        for section in DASHBOARD_SECTIONS
+    }
+    filter_query = request.GET.copy()
+    for section in DASHBOARD_SECTIONS:
+        filter_query.pop(f'{section}_cursor', None)
     
     context = {
-        'jobs': jobs,
-        'jobs_data': jobs_data,
-        'articles': articles,
-        'resources': resources,
+        'jobs_section': sections['jobs'],
+        'articles_section': sections['articles'],
+        'resources_section': sections['resources'],
+        'job_count': _dashboard_section('jobs', request.GET).count(),
+        'article_count': Article.objects.count(),
+        'resource_count': Resource.objects.count(),
+        'salary_min': request.GET.get('salary_min', ''),
+        'salary_max': request.GET.get('salary_max', ''),
+        'currency': request.GET.get('currency', '').upper() or default_currency(),
+        'currencies': sorted(CURRENCY_CODES),
+        'filter_query': filter_query.urlencode(),
     }
     return render(request, 'portal/hr_dashboard.html', context)
 
+
+@login_required
+@user_passes_test(is_hr_manager)
+def hr_dashboard_feed(request, section):
+    """JSON endpoint returning the next page of one dashboard section as rendered HTML"""
+    from django.http import Http404, JsonResponse
+    from django.template.loader import render_to_string
+    
+    if section not in DASHBOARD_SECTIONS:
+        raise Http404('Unknown dashboard section.')
+    context = _dashboard_page(section, request.GET, request.GET.get('cursor'))
+    page = context['page']
+    html = render_to_string(DASHBOARD_SECTIONS[section][0], context, request=request)
+    return JsonResponse({
+        'html': html,
+        'count': len(page),
+        'next_cursor': page.next_cursor,
+        'has_next': page.has_next,
+    })
+
 @login_required
 @user_passes_test(is_hr_manager)
 def hr_add_job(request):
@@ -104,30 +191,30 @@ def hr_delete_job(request, job_id):
 @login_required
 @user_passes_test(is_hr_manager)
 def hr_job_applications(request, job_id):
-    from django.db.models import Count
-    from django.core.paginator import Paginator
+    from django.http import JsonResponse
     
     job = get_object_or_404(Job, id=job_id)
-    applications = job.applications.select_related('reviewed_by').all().order_by('-applied_at')
-    
-    # Calculate statistics for this specific job
-    stats = {
-        'total': applications.count(),
-        'pending': applications.filter(status='PENDING').count(),
-        'reviewed': applications.filter(status='REVIEWED').count(),
-        'interview': applications.filter(status='INTERVIEW').count(),
-        'rejected': applications.filter(status='REJECTED').count(),
-        'hired': applications.filter(status='HIRED').count(),
-    }
     
-    # Pagination
-    paginator = Paginator(applications, 25)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Sorting; "best_match" uses the TF-IDF scores cached by rank_applications (unscored, at -1, last)
+    job_sorts = {**APPLICATION_SORTS, 'best_match': ('-match_score', '-applied_at', '-id')}
+    sort_by = request.GET.get('sort', '-applied_at')
+    if sort_by not in job_sorts:
+        sort_by = '-applied_at'
+    applications = job.applications.select_related('job', 'reviewed_by')
+    
+    # Statistics for this specific job, from the per-status counters
+    stats = status_counts(job)
+    
+    # Keyset pagination: every page costs the same index range scan
+    cursor = request.GET.get('cursor')
+    page = keyset_paginate(applications, job_sorts[sort_by], cursor, APPLICATIONS_PER_PAGE)
+    filter_query = request.GET.copy()
+    filter_query.pop('cursor', None)
+    filter_query.pop('format', None)
     
     # Pre-format application data to avoid template rendering issues
     apps_data = []
-    for app in page_obj:
+    for app in page:
         apps_data.append({
             'id': app.id,
             'full_name': app.full_name,
@@ -139,6 +226,29 @@ def hr_job_applications(request, job_id):
             'status': app.status,
             'resume_url': app.resume.url if app.resume else '#',
             'notes': app.notes,
+            'match_score': round(app.match_score * 100) if app.match_score != Application.UNSCORED else None,
+        })
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'applications': apps_data,
+            'count': stats['total'],
+            'count_is_estimate': False,
+            'next_cursor': page.next_cursor,
+            'has_next': page.has_next,
+        })
+    
+    # Past applicants to other postings, shortlisted by the match_talent_pool worker
+    talent_pool = []
+    for match in job.talent_matches.select_related('application__job'):
+        talent_pool.append({
+            'id': match.application.id,
+            'full_name': match.application.full_name,
+            'email': match.application.email,
+            'applied_for': match.application.job.title,
+            'status': match.application.get_status_display(),
+            'score': round(match.score, 2),
+            'resume_url': match.application.resume.url if match.application.resume else '#',
         })
     
     # Get all jobs for filter dropdown
@@ -146,8 +256,13 @@ def hr_job_applications(request, job_id):
     
     context = {
         'applications': apps_data,
-        'page_obj': page_obj,
+        'page': page,
+        'cursor': cursor,
+        'filter_query': filter_query.urlencode(),
+        'result_count': stats['total'],
         'stats': stats,
+        'time_to_hire': duration_percentiles('HIRE', job=job),
+        'talent_pool': talent_pool,
         'apps_by_job': [],  # Empty for single job view
         'all_jobs': all_jobs,
         'search_query': '',
@@ -155,7 +270,7 @@ def hr_job_applications(request, job_id):
         'selected_job_id': job.id,
         'status_filter': '',
         'date_filter': '',
-        'sort_by': '-applied_at',
+        'sort_by': sort_by,
         'title': f'Applications for {job.title}',
         'status_choices': Application.STATUS_CHOICES,
     }
@@ -166,73 +281,72 @@ def hr_job_applications(request, job_id):
 @login_required
 @user_passes_test(is_hr_manager)
 def hr_all_applications(request):
-    from django.db.models import Q, Count
-    from django.core.paginator import Paginator
-    from datetime import datetime, timedelta
+    from django.db.models import Count, F, Sum, Window
+    from django.db.models.functions import Coalesce, RowNumber
+    from django.http import JsonResponse
     
     applications = Application.objects.select_related('job', 'reviewed_by').all()
-    
-    # Search functionality
+    applications = filter_applications(applications, request.GET)
     search_query = request.GET.get('search', '')
-    if search_query:
-        applications = applications.filter(
-            Q(full_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(job__title__icontains=search_query)
-        )
-    
-    # Filter by job
     job_filter = request.GET.get('job', '')
-    selected_job_id = None
-    if job_filter:
-        applications = applications.filter(job_id=job_filter)
-        try:
-            selected_job_id = int(job_filter)
-        except ValueError:
-            selected_job_id = None
-    
-    # Filter by status
+    selected_job_id = int(job_filter) if job_filter.isdigit() else None
     status_filter = request.GET.get('status', '')
-    if status_filter:
-        applications = applications.filter(status=status_filter)
-    
-    # Filter by date range
     date_filter = request.GET.get('date_range', '')
-    if date_filter:
-        today = datetime.now()
-        if date_filter == '7':
-            applications = applications.filter(applied_at__gte=today - timedelta(days=7))
-        elif date_filter == '30':
-            applications = applications.filter(applied_at__gte=today - timedelta(days=30))
-        elif date_filter == '90':
-            applications = applications.filter(applied_at__gte=today - timedelta(days=90))
+    
+    # One row per candidate: their latest matching application, ranked in the database.
+    # The ranking runs in a subquery so the page cursor cannot change which row is latest.
+    matching = applications
+    group_by = request.GET.get('group', '')
+    if group_by == 'candidate':
+        # Unlinked applications each stand alone
+        person = Coalesce(F('candidate_id'), -F('id'))
+        latest = matching.annotate(
+            candidate_rank=Window(RowNumber(), partition_by=[person], order_by=[F('applied_at').desc(), F('id').desc()]),
+        ).filter(candidate_rank=1)
+        applications = applications.filter(pk__in=latest.values('pk'))
+    else:
+        group_by = ''
     
     # Sorting
-    sort_by = request.GET.get('sort', '-applied_at')
-    applications = applications.order_by(sort_by)
-    
-    # Calculate statistics
-    total_count = Application.objects.count()
-    stats = {
-        'total': total_count,
-        'pending': Application.objects.filter(status='PENDING').count(),
-        'reviewed': Application.objects.filter(status='REVIEWED').count(),
-        'interview': Application.objects.filter(status='INTERVIEW').count(),
-        'rejected': Application.objects.filter(status='REJECTED').count(),
-        'hired': Application.objects.filter(status='HIRED').count(),
-    }
+    sort_by = application_sort(request.GET)
+    
+    # Statistics from the per-status counters
+    stats = status_counts()
+    
+    # Counts come from the counters where they can; other searches are counted up to a cap
+    result_count_capped = False
+    if search_query or date_filter or group_by:
+        result_count, result_count_capped = bounded_count(applications, APPLICATION_COUNT_CAP)
+    else:
+        counts = status_counts(selected_job_id) if selected_job_id else stats
+        result_count = counts.get(status_filter.lower(), 0) if status_filter else counts['total']
     
     # Applications by job (for charts)
-    apps_by_job = Job.objects.annotate(app_count=Count('applications')).order_by('-app_count')[:5]
+    apps_by_job = (
+        Job.objects
+        .annotate(app_count=Coalesce(Sum('application_stats__count'), 0))
+        .order_by('-app_count')[:5]
+    )
     
-    # Pagination
-    paginator = Paginator(applications, 25)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: every page costs the same index range scan
+    cursor = request.GET.get('cursor')
+    page = keyset_paginate(applications, APPLICATION_SORTS[sort_by], cursor, APPLICATIONS_PER_PAGE)
+    filter_query = request.GET.copy()
+    filter_query.pop('cursor', None)
+    filter_query.pop('format', None)
+    
+    # Applications per candidate (within the current filters), for this page only
+    candidate_applications = {}
+    if group_by:
+        candidate_ids = {app.candidate_id for app in page if app.candidate_id}
+        candidate_applications = dict(
+            matching.filter(candidate_id__in=candidate_ids)
+            .order_by().values_list('candidate_id').annotate(total=Count('id'))
+        )
     
     # Pre-format application data
     apps_data = []
-    for app in page_obj:
+    for app in page:
         apps_data.append({
             'id': app.id,
             'full_name': app.full_name,
@@ -244,6 +358,16 @@ def hr_all_applications(request):
             'status': app.status,
             'resume_url': app.resume.url if app.resume else '#',
             'notes': app.notes,
+            'candidate_applications': candidate_applications.get(app.candidate_id, 1) if group_by else None,
+        })
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'applications': apps_data,
+            'count': result_count,
+            'count_is_estimate': result_count_capped,
+            'next_cursor': page.next_cursor,
+            'has_next': page.has_next,
         })
     
     # Get all jobs for filter dropdown
@@ -251,8 +375,12 @@ def hr_all_applications(request):
     
     context = {
         'applications': apps_data,
-        'page_obj': page_obj,
+        'page': page,
+        'cursor': cursor,
+        'filter_query': filter_query.urlencode(),
+        'result_count': f'{result_count}+' if result_count_capped else result_count,
         'stats': stats,
+        'group_by': group_by,
         'apps_by_job': apps_by_job,
         'all_jobs': all_jobs,
         'search_query': search_query,
@@ -315,6 +443,44 @@ def hr_update_application_status(request, app_id):
     return JsonResponse({'success': False})
 
 
+@login_required
+@user_passes_test(is_hr_manager)
+def hr_bulk_update_applications(request):
+    """AJAX endpoint to set the status and/or rating of many applications at once"""
+    import json
+    from django.db import transaction
+    from django.http import JsonResponse
+    
+    if request.method != 'POST':
+        return JsonResponse({'success': False})
+    try:
+        data = json.loads(request.body)
+        ids = [int(app_id) for app_id in data.get('ids', [])]
+        status = data.get('status') or None
+        rating = data.get('rating')
+        rating = None if rating in (None, '') else int(rating)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+    
+    if not ids or len(ids) > BULK_UPDATE_LIMIT:
+        return JsonResponse({'success': False, 'error': f'Select between 1 and {BULK_UPDATE_LIMIT} applications.'})
+    if status is None and rating is None:
+        return JsonResponse({'success': False, 'error': 'Choose a status or a rating.'})
+    if status is not None and status not in dict(Application.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid status.'})
+    if rating is not None and not 0 <= rating <= 5:
+        return JsonResponse({'success': False, 'error': 'Rating must be between 0 and 5.'})
+    
+    from core.notifications import queue_status_change_notifications
+    
+    # The emails to everyone whose status changed are queued with the update, and sent
+    # by the send_queued_emails worker rather than in this request
+    with transaction.atomic():
+        updated, changed = Application.objects.filter(pk__in=ids).bulk_review(request.user, status=status, rating=rating)
+        queue_status_change_notifications(changed)
+    return JsonResponse({'success': True, 'updated': updated, 'notified': len(changed)})
+
+
 @login_required
 @user_passes_test(is_hr_manager)
 def hr_add_application_note(request, app_id):
@@ -338,53 +504,86 @@ def hr_add_application_note(request, app_id):
 @login_required
 @user_passes_test(is_hr_manager)
 def hr_export_applications(request):
-    """Export applications to CSV"""
-    import csv
-    from django.http import HttpResponse
-    from django.db.models import Q
-    
-    # Get filtered applications (reuse same logic as hr_all_applications)
-    applications = Application.objects.select_related('job').all()
-    
-    # Apply same filters
-    search_query = request.GET.get('search', '')
-    if search_query:
-        applications = applications.filter(
-            Q(full_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(job__title__icontains=search_query)
-        )
+    """Export applications to CSV, streamed straight from the database (gzipped with ``compress=gzip``)"""
+    from django.http import StreamingHttpResponse
+    from core.exports import csv_chunks, gzip_chunks
+    
+    # Same filters and ordering as hr_all_applications
+    applications = filter_applications(Application.objects.all(), request.GET)
+    applications = applications.order_by(*APPLICATION_SORTS[application_sort(request.GET)])
+    
+    # Plain tuples read in chunks: no model instances, and memory stays flat however many rows match
+    statuses = dict(Application.STATUS_CHOICES)
+    rows = (
+        (name, email, phone, job_title, applied_at.strftime('%Y-%m-%d'), statuses.get(status, status), rating, notes)
+        for name, email, phone, job_title, applied_at, status, rating, notes in applications.values_list(
+            'full_name', 'email', 'phone', 'job__title', 'applied_at', 'status', 'rating', 'notes',
+        ).iterator(chunk_size=2000)
+    )
+    chunks = csv_chunks(['Name', 'Email', 'Phone', 'Job Title', 'Applied Date', 'Status', 'Rating', 'Notes'], rows)
     
-    job_filter = request.GET.get('job', '')
-    if job_filter:
-        applications = applications.filter(job_id=job_filter)
+    if request.GET.get('compress') == 'gzip':
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename="applications.csv.gz"'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="applications.csv"'
+    return response
+
+
+
+@login_required
+@user_passes_test(is_hr_manager)
+def hr_exports(request):
+    """Queue a background export (POST) or list the user's recent exports"""
+    from django.http import JsonResponse
     
-    status_filter = request.GET.get('status', '')
-    if status_filter:
-        applications = applications.filter(status=status_filter)
-    
-    # Create CSV response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="applications.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Name', 'Email', 'Phone', 'Job Title', 'Applied Date', 'Status', 'Rating', 'Notes'])
-    
-    for app in applications:
-        writer.writerow([
-            app.full_name,
-            app.email,
-            app.phone,
-            app.job.title,
-            app.applied_at.strftime('%Y-%m-%d'),
-            app.get_status_display(),
-            app.rating,
-            app.notes
-        ])
+    if request.method == 'POST':
+        kind = request.POST.get('kind', '')
+        export_format = request.POST.get('format', 'csv')
+        if kind not in dict(ExportJob.KIND_CHOICES) or export_format not in dict(ExportJob.FORMAT_CHOICES):
+            messages.error(request, 'Choose a valid export.')
+            return redirect('portal:hr_exports')
+        filters = {}
+        if kind == 'APPLICATIONS':
+            filters = {key: request.POST[key] for key in ('search', 'job', 'status', 'date_range') if request.POST.get(key)}
+        ExportJob.objects.create(requested_by=request.user, kind=kind, format=export_format, filters=filters)
+        messages.success(request, 'Your export has been queued. The download link will appear here when it is ready.')
+        return redirect('portal:hr_exports')
+    
+    exports = ExportJob.objects.filter(requested_by=request.user)[:20]
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'exports': [{
+            'id': export.id,
+            'status': export.status,
+            'progress': export.progress_percent(),
+            'rows_written': export.rows_written,
+            'total_rows': export.total_rows,
+        } for export in exports]})
     
-    return response
+    context = {
+        'exports': exports,
+        'has_active': any(export.status in ('PENDING', 'RUNNING') for export in exports),
+        'kind_choices': ExportJob.KIND_CHOICES,
+        'format_choices': ExportJob.FORMAT_CHOICES,
+        'retention_days': settings.EXPORT_RETENTION_DAYS,
+        'title': 'Exports',
+    }
+    return render(request, 'portal/hr_exports.html', context)
 
 
+@login_required
+@user_passes_test(is_hr_manager)
+def hr_export_download(request, export_id):
+    from django.http import FileResponse, Http404
+    
+    export = get_object_or_404(ExportJob, id=export_id, requested_by=request.user)
+    if export.status != 'DONE' or not export.file:
+        raise Http404('This export is not available.')
+    return FileResponse(export.file.open('rb'), as_attachment=True, filename=export.filename(),
+                        content_type='application/gzip')
+
 
 @login_required
 @user_passes_test(is_hr_manager)
@@ -459,39 +658,26 @@ def hr_delete_resource(request, resource_id):
 @user_passes_test(is_hr_manager)
 def hr_analytics(request):
     """HR Analytics Dashboard with charts and metrics"""
-    from django.db.models import Count, Avg, F
-    from django.db.models.functions import TruncMonth
-    from datetime import datetime, timedelta
+    from django.db.models import Sum
+    from django.db.models.functions import Coalesce
+    from datetime import timedelta
     from django.utils import timezone
     from core.models import NewsletterSubscriber
-    from events.models import Event, Registration
+    from events.models import Event
     from onboarding.models import OnboardingAssignment
+    from .rollups import (
+        applications_by_month, feedback_summary, new_subscribers, registrations_by_event, stage_cohort,
+    )
 
-    # Hiring funnel counts
-    funnel = {
-        'pending': Application.objects.filter(status='PENDING').count(),
-        'reviewed': Application.objects.filter(status='REVIEWED').count(),
-        'interview': Application.objects.filter(status='INTERVIEW').count(),
-        'hired': Application.objects.filter(status='HIRED').count(),
-        'rejected': Application.objects.filter(status='REJECTED').count(),
-    }
+    # Hiring funnel counts, from the per-status counters
+    funnel = status_counts()
 
-    # Applications over last 6 months
-    six_months_ago = timezone.now() - timedelta(days=180)
-    timeline_qs = (
-        Application.objects
-        .filter(applied_at__gte=six_months_ago)
-        .annotate(month=TruncMonth('applied_at'))
-        .values('month')
-        .annotate(count=Count('id'))
-        .order_by('month')
-    )
-    timeline = []
-    for item in timeline_qs:
-        timeline.append({
-            'month': item['month'].strftime('%b %Y'),
-            'count': item['count'],
-        })
+    # Applications over last 6 months, from the daily rollups (plus today's raw rows)
+    six_months_ago = timezone.localdate() - timedelta(days=180)
+    timeline = [
+        {'month': month.strftime('%b %Y'), 'count': count}
+        for month, count in applications_by_month(six_months_ago)
+    ]
     # If no data, provide at least the current month
     if not timeline:
         timeline = [{'month': timezone.now().strftime('%b %Y'), 'count': 0}]
@@ -499,38 +685,45 @@ def hr_analytics(request):
     # Top jobs by application count
     top_jobs = (
         Job.objects
-        .annotate(app_count=Count('applications'))
+        .annotate(app_count=Coalesce(Sum('application_stats__count'), 0))
         .order_by('-app_count')[:5]
     )
     top_jobs_data = [{'title': j.title, 'app_count': j.app_count} for j in top_jobs]
 
-    # Event registration stats
-    event_stats = (
-        Event.objects
-        .filter(is_active=True)
-        .annotate(reg_count=Count('registrations'))
-        .order_by('-reg_count')[:5]
-    )
-    event_stats_data = [{'title': e.title, 'reg_count': e.reg_count} for e in event_stats]
-
-    # Average time to hire (days from application to hired status)
-    hired_apps = Application.objects.filter(status='HIRED', reviewed_at__isnull=False)
-    if hired_apps.exists():
-        total_days = 0
-        count = 0
-        for app in hired_apps:
-            delta = (app.reviewed_at - app.applied_at).days
-            total_days += delta
-            count += 1
-        avg_time_to_hire = round(total_days / count) if count > 0 else 0
-    else:
-        avg_time_to_hire = 0
+    # Event registration stats, from the daily rollups
+    active_events = list(Event.objects.filter(is_active=True).only('id', 'title'))
+    registrations = registrations_by_event(active_events)
+    event_stats = sorted(active_events, key=lambda e: registrations[e.pk], reverse=True)[:5]
+    event_stats_data = [{'title': e.title, 'reg_count': registrations[e.pk]} for e in event_stats]
+
+    # Time to hire, merged from the per-job monthly sketches
+    time_to_hire = duration_percentiles('HIRE')
+
+    # Stage conversion of the applications received in the same 6 months, from the status
+    # events: how many of them reached each stage, and how long applications sat there
+    reached_by_stage = stage_cohort(six_months_ago)
+    received = reached_by_stage['PENDING']
+    stages = []
+    for code, label in Application.STATUS_CHOICES:
+        reached = reached_by_stage[code]
+        stages.append({
+            'label': label,
+            'reached': reached,
+            'rate': round(reached * 100 / received, 1) if received else None,
+            'times': duration_percentiles('STAGE', code, since=six_months_ago),
+        })
+
+    from careers.models import Candidate
 
     context = {
-        'total_applications': Application.objects.count(),
+        'total_applications': funnel['total'],
+        'total_candidates': Candidate.objects.count(),
         'open_positions': Job.objects.filter(is_active=True).count(),
-        'avg_time_to_hire': avg_time_to_hire,
+        'time_to_hire': time_to_hire,
+        'stages': stages,
         'subscriber_count': NewsletterSubscriber.objects.filter(is_active=True).count(),
+        'new_subscribers': new_subscribers(timezone.localdate() - timedelta(days=30)),
+        'feedback': dict(zip(('count', 'rating'), feedback_summary(timezone.localdate() - timedelta(days=30)))),
         'total_events': Event.objects.filter(is_active=True).count(),
         'onboarding_active': OnboardingAssignment.objects.filter(is_completed=False).count(),
         'funnel': funnel,
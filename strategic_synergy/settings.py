@@ -89,6 +89,17 @@ DATABASES = {
 }
 
 
+# Cache
+# Local memory is fine for a single process; use Redis or Memcached in production
+# so version bumps are shared across workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'strategic-synergy',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -135,6 +146,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Media files (Resumes, User uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Files served only through views that check permissions (background exports); never under MEDIA_ROOT
+PRIVATE_MEDIA_ROOT = BASE_DIR / 'private_media'
 
 # Session Configuration
 # Session expires after 30 minutes of inactivity
@@ -160,3 +173,17 @@ DEFAULT_FROM_EMAIL = 'noreply@strategicsynergy.co.zw'
 # EMAIL_HOST_PASSWORD = 'your-app-password'
 
 
+# Careers search
+# Defaults to the SQLite FTS5 index on SQLite and a plain icontains scan elsewhere.
+# CAREERS_SEARCH_BACKEND = 'careers.search.SimpleSearchBackend'
+
+# Salary filters compare parsed pay bands in this currency unless another is picked;
+# bands posted without a currency are assumed to be in it
+SALARY_CURRENCY = 'USD'
+
+# Chunked resume uploads
+RESUME_UPLOAD_MAX_SIZE = 5 * 1024 * 1024  # 5 MB
+RESUME_UPLOAD_CHUNK_SIZE = 512 * 1024  # 512 KB
+
+# Background exports (portal.exports): finished files are deleted after this long
+EXPORT_RETENTION_DAYS = 7